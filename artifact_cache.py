@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더링 결과물(차트 PNG) 캐시
+
+차트 하나의 결과물은 (입력 데이터 조각, 차트 파라미터, 렌더러 버전)이 같으면 항상 같다.
+세 가지를 해시한 키로 PNG 를 .coil_cache/artifacts 에 보관해 두고, 키가 같으면
+다시 그리지 않고 보관된 파일을 출력 경로로 복사한다.
+    - 데이터 조각: 차트가 실제로 쓰는 컬럼만 pd.util.hash_pandas_object 로 해시
+    - 파라미터: 상위 품질 목록, 차트 명세 등 (JSON 으로 직렬화하여 해시)
+    - 렌더러 버전: 차트 모듈 소스 파일 내용 + matplotlib/seaborn 버전 + 적용된 폰트 + 품질 단계
+
+결과물은 <키>.png 와 <키>.json(출력 파일명, 크기, 해시) 한 쌍으로 저장하며
+둘 다 임시 파일에 쓴 뒤 교체한다. 공유 색인 파일이 없으므로 여러 작업 프로세스가
+동시에 저장해도 안전하다. 저장 후에는 총 크기가 예산(기본 200MB,
+COIL_ARTIFACT_BUDGET_MB 로 변경)을 넘지 않도록 가장 오래 사용하지 않은 결과물부터 지운다.
+
+사용법:
+    uv run artifact_cache.py            # 캐시 현황
+    uv run artifact_cache.py --evict 50 # 50MB 이하로 정리
+    uv run artifact_cache.py --clear    # 전체 삭제
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+# 결과물 저장 폴더 (coil_dataset.CACHE_DIR 하위, pandas import 를 피하려고 따로 정의)
+ARTIFACT_DIR = Path(__file__).resolve().parent / '.coil_cache' / 'artifacts'
+
+# 결과물 캐시 크기 예산
+BUDGET_ENV = 'COIL_ARTIFACT_BUDGET_MB'
+DEFAULT_BUDGET_MB = 200
+
+# 캐시 사용 여부 (--no-cache 로 끔)
+_enabled = True
+
+
+def disable_cache():
+    """이번 실행에서 결과물 캐시를 사용하지 않음 (항상 다시 그림)"""
+    global _enabled
+    _enabled = False
+
+
+def cache_enabled():
+    """결과물 캐시 사용 여부"""
+    return _enabled
+
+
+def budget_mb():
+    """결과물 캐시 크기 예산(MB)"""
+    try:
+        return float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MB))
+    except ValueError:
+        return DEFAULT_BUDGET_MB
+
+
+def _sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_fingerprint(data):
+    """DataFrame 조각의 내용 해시 (컬럼 이름/dtype/값, 행 순서 포함, 인덱스 제외)"""
+    import pandas as pd
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in data.dtypes.items()],
+                             ensure_ascii=False).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def renderer_version(source_files):
+    """렌더러 버전: 소스 파일 내용 + 라이브러리 버전 + 적용된 폰트 설정 + 품질 단계"""
+    import matplotlib
+    import seaborn as sns
+    from render_tier import current_tier
+    digest = hashlib.sha256()
+    for path in source_files:
+        digest.update(str(Path(path).name).encode('utf-8'))
+        digest.update(Path(path).read_bytes())
+    environment = [matplotlib.__version__, sns.__version__,
+                   list(matplotlib.rcParams['font.family']), matplotlib.rcParams['font.size'], current_tier()]
+    digest.update(json.dumps(environment, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def artifact_key(data_hash, params, renderer_hash):
+    """결과물 키 = (데이터 조각 해시, 파라미터, 렌더러 버전) 의 해시"""
+    payload = {'data': data_hash, 'params': params, 'renderer': renderer_hash}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _paths(key):
+    return ARTIFACT_DIR / f"{key}.png", ARTIFACT_DIR / f"{key}.json"
+
+
+def _atomic_copy(source, target):
+    """같은 폴더의 임시 파일로 복사한 뒤 교체"""
+    target = Path(target)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def save_figure(filename, fig=None, **kwargs):
+    """
+    figure 를 임시 파일에 저장한 뒤 교체 (중간에 실패해도 이전 파일이 깨지지 않음)
+    현재 품질 단계(render_tier)에 맞게 dpi 와 파일명을 조정한다.
+    Args:
+        filename: 저장할 파일명 (확장자로 형식 결정)
+        fig: 저장할 figure (None 이면 현재 figure)
+        kwargs: savefig 인자 (dpi, bbox_inches 등)
+    Returns:
+        실제로 저장한 파일명 (preview 단계는 _preview 가 붙음)
+    """
+    import matplotlib.pyplot as plt
+    from render_tier import savefig_kwargs, tier_output
+    filename = tier_output(filename)
+    kwargs = savefig_kwargs(**kwargs)
+    target = Path(filename)
+    tmp_path = target.with_name(f".{target.stem}.{os.getpid()}.tmp{target.suffix}")
+    try:
+        (fig or plt.gcf()).savefig(tmp_path, **kwargs)
+        os.replace(tmp_path, target)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return filename
+
+
+def lookup(key):
+    """보관된 결과물 정보 (없거나 파일이 깨졌으면 None)"""
+    png_path, meta_path = _paths(key)
+    try:
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not png_path.exists() or png_path.stat().st_size != meta.get('size'):
+        return None
+    return meta
+
+
+def restore(key, meta):
+    """
+    보관된 결과물을 출력 경로로 복사 (출력 파일 내용이 이미 같으면 건너뜀)
+    Returns:
+        출력 파일명
+    """
+    png_path, meta_path = _paths(key)
+    output = meta['output']
+    if not (os.path.exists(output) and os.path.getsize(output) == meta['size']
+            and _sha256_file(output) == meta['sha256']):
+        _atomic_copy(png_path, output)
+    # 최근 사용 시각 갱신 (예산 정리 시 LRU 순서)
+    for path in (png_path, meta_path):
+        os.utime(path)
+    return output
+
+
+def store(key, output, name=None):
+    """렌더링한 출력 파일을 결과물 캐시에 보관하고 예산에 맞게 정리"""
+    png_path, meta_path = _paths(key)
+    try:
+        ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+        _atomic_copy(output, png_path)
+        meta = {'name': name, 'output': str(output), 'size': png_path.stat().st_size,
+                'sha256': _sha256_file(png_path)}
+        tmp_meta = meta_path.with_name(f".{meta_path.name}.{os.getpid()}.tmp")
+        tmp_meta.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_meta, meta_path)
+    except OSError as e:
+        print(f"⚠️ 결과물 캐시 저장 실패: {e}")
+        return
+    evict(budget_mb())
+
+
+def cached_render(key, render, name=None):
+    """
+    키가 같은 결과물이 있으면 복사, 없으면 render() 로 그린 뒤 보관
+    Args:
+        key: artifact_key() 결과
+        render: 인자 없이 호출하면 저장한 파일명(실패 시 None)을 반환하는 함수
+        name: 출력에 쓸 차트 이름
+    Returns:
+        (저장 파일명 또는 None, 캐시 사용 여부)
+    """
+    if _enabled:
+        meta = lookup(key)
+        if meta is not None:
+            try:
+                output = restore(key, meta)
+                print(f"♻️ {name or key[:12]}: 변경 없음, 저장된 결과물 사용 → {output}")
+                return output, True
+            except OSError as e:
+                print(f"⚠️ 저장된 결과물 복사 실패, 다시 그립니다: {e}")
+
+    output = render()
+    if _enabled and output is not None and os.path.exists(output):
+        store(key, output, name)
+    return output, False
+
+
+def _entries():
+    """보관된 결과물 목록: [(최근 사용 시각, 크기, 키)] (오래된 순)"""
+    entries = []
+    for png_path in ARTIFACT_DIR.glob('*.png'):
+        meta_path = png_path.with_suffix('.json')
+        try:
+            stat = png_path.stat()
+            size = stat.st_size + (meta_path.stat().st_size if meta_path.exists() else 0)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, size, png_path.stem))
+    return sorted(entries)
+
+
+def evict(limit_mb):
+    """총 크기가 limit_mb 를 넘으면 가장 오래 사용하지 않은 결과물부터 삭제"""
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    limit = limit_mb * 1024**2
+    removed = 0
+    for _, size, key in entries:
+        if total <= limit:
+            break
+        for path in _paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        total -= size
+        removed += 1
+    return removed, total
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='차트 결과물 캐시 관리')
+    parser.add_argument('--evict', type=float, default=None, metavar='MB', help='지정한 크기 이하로 정리')
+    parser.add_argument('--clear', action='store_true', help='전체 삭제')
+    args = parser.parse_args()
+
+    if args.clear:
+        shutil.rmtree(ARTIFACT_DIR, ignore_errors=True)
+        print(f"🗑️ 결과물 캐시 삭제: {ARTIFACT_DIR}")
+        return
+    if args.evict is not None:
+        removed, total = evict(args.evict)
+        print(f"🗑️ {removed}개 삭제, 남은 크기 {total / 1024**2:.1f}MB")
+        return
+
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    print(f"📦 {ARTIFACT_DIR}: 결과물 {len(entries)}개, {total / 1024**2:.1f}MB (예산 {budget_mb():.0f}MB)")
+    for _, size, key in reversed(entries):
+        meta = lookup(key) or {}
+        print(f"   {key[:12]} {size / 1024:.0f}KB {meta.get('name') or '-'} → {meta.get('output') or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+차트 명세(TOML) 기반 범용 stripplot 렌더러
+
+품질별 stripplot 스크립트들은 y 축 컬럼, 파생 계산식(ys2_stress - i_ys 등), y 축 범위,
+기준선(359/360/530 MPa), 제목만 다르고 그리는 코드는 같다. 이 차이를 chart_specs.toml 의
+[[chart]] 항목으로 선언하고, 그리는 코드는 render_chart() 하나로 통일한다.
+
+여러 차트를 그릴 때는 같은 데이터셋과 필터를 쓰는 명세끼리 묶어서
+데이터 로드, 필터링, 파생 컬럼 계산, 상위 품질 선정을 그룹당 한 번만 하고 함께 그린다.
+명세, 차트가 쓰는 데이터 조각, 렌더러 소스가 지난 실행과 같으면 artifact_cache 에
+저장된 PNG 를 그대로 사용한다 (--no-cache 로 끔).
+
+사용법:
+    uv run chart_spec.py                          # 전체 차트 생성
+    uv run chart_spec.py ys2_stress_stripplot     # 지정한 차트만
+    uv run chart_spec.py --list                   # 명세 목록
+    uv run chart_spec.py --spec 다른_명세.toml
+    uv run chart_spec.py --no-cache
+    uv run chart_spec.py --preview                # 저해상도 미리보기 (*_preview.png)
+"""
+
+import argparse
+import ast
+import time
+import tomllib
+import warnings
+from pathlib import Path
+
+from coil_columns import validate_columns
+from coil_dataset import load_dataset
+from coil_schema import drop_unused_categories
+
+warnings.filterwarnings('ignore')
+
+# 기본 명세 파일 (프로젝트 루트 기준)
+SPEC_FILE = Path(__file__).resolve().parent / 'chart_specs.toml'
+
+# 명세 항목 (필수 / 선택)
+REQUIRED_KEYS = {'name', 'metric', 'title', 'ylabel', 'output'}
+OPTIONAL_KEYS = {
+    'dataset', 'filter', 'expression', 'label', 'quality_column', 'top_n', 'unit', 'xlabel',
+    'ylim', 'mean_line_style', 'show_median', 'info_title', 'info_note', 'info_box',
+    'reference_lines', 'figsize', 'dpi', 'strip',
+}
+FILTER_KEYS = {'description', 'between', 'contains'}
+
+# 기준선 / 정보 상자 기본 스타일
+REFERENCE_LINE_DEFAULTS = {'color': 'black', 'style': '-', 'width': 1, 'alpha': 0.8, 'label': None}
+INFO_BOX_DEFAULTS = {'facecolor': 'white', 'edgecolor': 'gray', 'alpha': 0.8}
+
+
+def expression_columns(expression):
+    """파생 계산식에 쓰인 컬럼 이름 (등장 순서)"""
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"계산식 오류: {expression} ({e.msg})") from None
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id not in names:
+            names.append(node.id)
+    return names
+
+
+def _validate_spec(spec, filters):
+    """명세 항목 검증 (없으면 ValueError)"""
+    name = spec.get('name', '?')
+    missing = REQUIRED_KEYS - set(spec)
+    if missing:
+        raise ValueError(f"'{name}' 명세에 필수 항목이 없습니다: {sorted(missing)}")
+    unknown = set(spec) - REQUIRED_KEYS - OPTIONAL_KEYS
+    if unknown:
+        raise ValueError(f"'{name}' 명세에 알 수 없는 항목이 있습니다: {sorted(unknown)}")
+    if spec.get('filter') is not None and spec['filter'] not in filters:
+        raise ValueError(f"'{name}' 명세의 필터가 없습니다: {spec['filter']} (가능: {list(filters)})")
+    try:
+        validate_columns(spec_columns(spec, filters))
+    except ValueError as e:
+        raise ValueError(f"'{name}' 명세 오류: {e}") from None
+
+
+def load_specs(spec_file=SPEC_FILE):
+    """
+    명세 파일 로드 ([defaults] 를 각 차트에 적용하고 검증)
+    Returns:
+        ({차트 이름: 명세 dict}, {필터 이름: 필터 dict})
+    """
+    with open(spec_file, 'rb') as f:
+        document = tomllib.load(f)
+
+    defaults = document.get('defaults', {})
+    filters = document.get('filters', {})
+    for filter_name, definition in filters.items():
+        unknown = set(definition) - FILTER_KEYS
+        if unknown:
+            raise ValueError(f"필터 '{filter_name}' 에 알 수 없는 항목이 있습니다: {sorted(unknown)}")
+
+    specs = {}
+    for entry in document.get('chart', []):
+        spec = {**defaults, **entry}
+        spec.setdefault('label', spec.get('metric'))
+        spec.setdefault('strip', 'auto')
+        spec['reference_lines'] = [{**REFERENCE_LINE_DEFAULTS, **line} for line in spec.get('reference_lines', [])]
+        spec['info_box'] = {**INFO_BOX_DEFAULTS, **spec.get('info_box', {})}
+        _validate_spec(spec, filters)
+        if spec['name'] in specs:
+            raise ValueError(f"차트 이름이 중복되었습니다: {spec['name']}")
+        specs[spec['name']] = spec
+    return specs, filters
+
+
+def chart_spec(name, spec_file=SPEC_FILE):
+    """차트 이름으로 명세 조회"""
+    specs, _ = load_specs(spec_file)
+    if name not in specs:
+        raise KeyError(f"등록되지 않은 차트 명세입니다: {name} (가능: {list(specs)})")
+    return specs[name]
+
+
+def spec_columns(spec, filters):
+    """명세 하나를 그리는 데 필요한 원본 컬럼"""
+    columns = [spec['quality_column']]
+    columns += expression_columns(spec['expression']) if spec.get('expression') else [spec['metric']]
+    definition = filters.get(spec.get('filter')) or {}
+    columns += list(definition.get('between', {})) + list(definition.get('contains', {}))
+    return list(dict.fromkeys(columns))
+
+
+def apply_filter(data, definition):
+    """이름 붙은 행 필터 적용 (between: 양 끝 포함, contains: 대소문자 무관 부분 문자열)"""
+    mask = None
+    for col, (low, high) in definition.get('between', {}).items():
+        condition = (data[col] >= low) & (data[col] <= high)
+        mask = condition if mask is None else mask & condition
+    for col, text in definition.get('contains', {}).items():
+        condition = data[col].astype('string').str.contains(text, case=False, regex=False).fillna(False)
+        mask = condition if mask is None else mask & condition
+    if mask is None:
+        return data
+    return drop_unused_categories(data[mask].copy())
+
+
+def add_derived_columns(data, specs):
+    """명세의 파생 컬럼 계산 (이미 있는 컬럼은 건너뜀)"""
+    for spec in specs:
+        if spec.get('expression') and spec['metric'] not in data.columns:
+            data[spec['metric']] = data.eval(spec['expression'])
+    return data
+
+
+def group_specs(specs):
+    """(데이터셋, 필터)가 같은 명세끼리 묶기 (명세 순서 유지)"""
+    groups = {}
+    for spec in specs:
+        groups.setdefault((spec['dataset'], spec.get('filter')), []).append(spec)
+    return groups
+
+
+def prepare_group(dataset, filter_name, specs, filters):
+    """
+    그룹 공통 데이터 준비: 필요한 컬럼만 한 번 로드 → 필터 → 파생 컬럼 계산
+    Returns:
+        (데이터, {(품질 컬럼, 상위 개수): 상위 품질 개수 Series})
+    """
+    columns = list(dict.fromkeys(col for spec in specs for col in spec_columns(spec, filters)))
+    data = load_dataset(dataset, columns=columns, verbose=False)
+    if filter_name is not None:
+        data = apply_filter(data, filters[filter_name])
+    data = add_derived_columns(data, specs)
+
+    top = {}
+    for spec in specs:
+        key = (spec['quality_column'], spec['top_n'])
+        if key not in top:
+            top[key] = data[spec['quality_column']].value_counts().head(spec['top_n'])
+    return data, top
+
+
+def _info_text(spec, stats, top_qualities):
+    """오른쪽 위 통계 상자 문구"""
+    unit = spec['unit']
+    means, medians = stats.series('mean'), stats.series('median')
+    info_text = f"{spec.get('info_title') or spec['label'] + ' 정보'}:\n"
+    if spec.get('info_note'):
+        info_text += f"{spec['info_note']}\n\n"
+
+    for quality, count in top_qualities.items():
+        if spec['show_median']:
+            info_text += f"{quality}: {count:,}개\n"
+            info_text += f"  평균: {means[quality]:.1f}, 중앙값: {medians[quality]:.1f}\n"
+        else:
+            info_text += f"{quality}: {count:,}개 (평균: {means[quality]:.1f})\n"
+
+    info_text += f"\n총계: {sum(top_qualities.values):,}개\n"
+    info_text += f"전체 평균: {stats.overall('mean'):.1f} {unit}"
+    if spec['show_median']:
+        info_text += f"\n전체 중앙값: {stats.overall('median'):.1f} {unit}"
+    return info_text
+
+
+def print_metric_stats(spec, stats):
+    """품질별 상세 통계 출력 (render_chart 에서 계산한 GroupStats 사용)"""
+    aggregations = ['count', 'mean', 'std', 'min', 'max']
+    names = ['개수', '평균', '표준편차', '최소값', '최대값']
+    if spec['show_median']:
+        aggregations.append('median')
+        names.append('중앙값')
+    aggregations += [0.25, 0.75]
+    names += ['25%', '75%']
+
+    print(f"\n📊 품질별 {spec['label']} 상세 통계:")
+    print(stats.table(aggregations, names=names, decimals=2))
+
+
+def render_chart(spec, data, top_qualities=None):
+    """
+    명세 하나로 품질별 stripplot 생성
+    Args:
+        spec: 차트 명세 (chart_spec() 결과)
+        data: 필터가 적용된 데이터 (파생 컬럼이 없으면 계산)
+        top_qualities: 상위 품질 개수 Series (None 이면 data 에서 계산)
+    Returns:
+        저장한 파일명 (실패 시 None)
+    """
+    import matplotlib.pyplot as plt
+    from artifact_cache import save_figure
+    from group_stats import group_stats
+    from headless import finish_figure
+    from render_tier import marker_edges
+    from strip_render import draw_mean_lines, draw_strip
+
+    if data is None or len(data) == 0:
+        print("❌ 데이터가 없습니다.")
+        return None
+
+    print(f"\n🎨 {spec['label']} stripplot 생성 중...")
+    quality_col, metric, unit = spec['quality_column'], spec['metric'], spec['unit']
+
+    if metric not in data.columns:
+        if not spec.get('expression'):
+            print(f"❌ {metric} 컬럼을 찾을 수 없습니다.")
+            print(f"사용 가능한 컬럼: {list(data.columns)}")
+            return None
+        data = add_derived_columns(data, [spec])
+
+    # 상위 품질 선정 (일괄 렌더링 시에는 그룹에서 미리 계산한 값 사용)
+    if top_qualities is None:
+        top_qualities = data[quality_col].value_counts().head(spec['top_n'])
+    if len(top_qualities) == 0:
+        print("❌ 표시할 품질이 없습니다.")
+        return None
+    filtered_data = data[data[quality_col].isin(top_qualities.index)]
+
+    # 품질별 통계 한 번 계산 (콘솔 출력, 평균선, 정보 상자, 상세 통계에서 함께 사용)
+    stats = group_stats(filtered_data, quality_col, metric, order=top_qualities.index)
+    means, stds, medians = stats.series('mean'), stats.series('std'), stats.series('median')
+
+    print(f"\n📋 상위 {len(top_qualities)}개 품질별 {spec['label']} 분포:")
+    for i, (quality, count) in enumerate(top_qualities.items(), 1):
+        if spec['show_median']:
+            print(f"   {i}. {quality}: {count:,}개")
+            print(f"      평균: {means[quality]:.2f}±{stds[quality]:.2f} {unit}, 중앙값: {medians[quality]:.2f} {unit}")
+        else:
+            print(f"   {i}. {quality}: {count:,}개 (평균: {means[quality]:.2f}±{stds[quality]:.2f} {unit})")
+
+    # 그래프 생성
+    plt.figure(figsize=tuple(spec['figsize']))
+    ax = draw_strip(
+        plt.gca(),
+        filtered_data,
+        quality_col,
+        metric,
+        top_qualities.index,
+        method=spec['strip'],
+        size=8,
+        alpha=0.7,
+        stats=stats,
+        **marker_edges(linewidth=0.5, edgecolor='black')
+    )
+
+    # 기준선
+    for line in spec['reference_lines']:
+        ax.axhline(y=line['y'], color=line['color'], linestyle=line['style'], linewidth=line['width'],
+                   alpha=line['alpha'], label=line['label'])
+
+    # 각 품질별 평균선(LineCollection 하나)과 평균값 텍스트
+    mean_values = stats.mean
+    draw_mean_lines(ax, mean_values, linestyle=spec['mean_line_style'])
+    text_offset = (ax.get_ylim()[1] - ax.get_ylim()[0]) * 0.02
+    for i, mean_value in enumerate(mean_values):
+        ax.text(
+            i, mean_value + text_offset,
+            f'평균: {mean_value:.1f}',
+            ha='center', va='bottom', fontsize=9, fontweight='bold', color='red'
+        )
+
+    # 제목 및 레이블
+    plt.title(spec['title'], fontsize=16, fontweight='bold', pad=20)
+    plt.xlabel(spec['xlabel'], fontsize=12, fontweight='bold')
+    plt.ylabel(spec['ylabel'], fontsize=12, fontweight='bold')
+    plt.xticks(rotation=45, ha='right')
+    if spec.get('ylim'):
+        plt.ylim(*spec['ylim'])
+    plt.grid(True, alpha=0.3, axis='y')
+
+    # 품질별 통계 정보 상자 (오른쪽 위)
+    box = spec['info_box']
+    plt.text(
+        0.98, 0.98,
+        _info_text(spec, stats, top_qualities),
+        transform=ax.transAxes,
+        fontsize=9,
+        verticalalignment='top',
+        horizontalalignment='right',
+        bbox=dict(boxstyle="round,pad=0.5", facecolor=box['facecolor'], alpha=box['alpha'],
+                  edgecolor=box['edgecolor'], linewidth=1),
+        fontweight='bold'
+    )
+
+    if any(line['label'] for line in spec['reference_lines']):
+        plt.legend(loc='upper left', fontsize=10)
+
+    plt.tight_layout()
+
+    filename = spec['output']
+    filename = save_figure(filename, dpi=spec['dpi'], bbox_inches='tight', facecolor='white')
+    print(f"💾 그래프 저장 완료: {filename}")
+    finish_figure()
+
+    print_metric_stats(spec, stats)
+    return filename
+
+
+def spec_artifact_key(spec, data, top_qualities):
+    """명세 + 차트가 쓰는 데이터 조각 + 렌더러 소스로 결과물 키 계산"""
+    import artifact_cache
+    import group_stats
+    import strip_render
+    columns = list(dict.fromkeys([spec['quality_column'], spec['metric']]))
+    params = {'spec': spec, 'top_qualities': [[str(q), int(n)] for q, n in top_qualities.items()]}
+    return artifact_cache.artifact_key(artifact_cache.data_fingerprint(data[columns]), params,
+                                       artifact_cache.renderer_version([__file__, strip_render.__file__, group_stats.__file__]))
+
+
+def render_specs(names=None, spec_file=SPEC_FILE):
+    """
+    명세의 차트를 (데이터셋, 필터) 그룹별로 묶어서 생성
+    Args:
+        names: 생성할 차트 이름 목록 (None 이면 전체)
+        spec_file: 명세 파일
+    Returns:
+        {차트 이름: 저장한 파일명 또는 None}
+    """
+    from artifact_cache import cached_render
+    from headless import measure_chart
+    from korean_font import setup_korean_font
+
+    specs, filters = load_specs(spec_file)
+    names = list(names or specs)
+    unknown = [name for name in names if name not in specs]
+    if unknown:
+        raise ValueError(f"알 수 없는 차트: {unknown} (가능: {list(specs)})")
+
+    setup_korean_font(font_size=10)
+    results = {}
+    for (dataset, filter_name), group in group_specs([specs[name] for name in names]).items():
+        start = time.perf_counter()
+        print(f"\n📦 {dataset}" + (f" [{filter_name}]" if filter_name else '') +
+              f" → {', '.join(spec['name'] for spec in group)}")
+        try:
+            data, top = prepare_group(dataset, filter_name, group, filters)
+        except Exception as e:
+            print(f"❌ 데이터 준비 실패: {e}")
+            results.update({spec['name']: None for spec in group})
+            continue
+        print(f"⏱️ 데이터 준비 {time.perf_counter() - start:.2f}초: {data.shape}")
+
+        for spec in group:
+            with measure_chart(spec['name']):
+                try:
+                    top_qualities = top[(spec['quality_column'], spec['top_n'])]
+                    results[spec['name']], _ = cached_render(
+                        spec_artifact_key(spec, data, top_qualities),
+                        lambda: render_chart(spec, data, top_qualities), spec['name'])
+                except Exception as e:
+                    print(f"❌ {spec['name']} 생성 실패: {e}")
+                    results[spec['name']] = None
+    return results
+
+
+def main():
+    """메인 실행 함수"""
+    from headless import configure_headless
+    configure_headless()
+    print("🚀 차트 명세 기반 stripplot 생성")
+    print("=" * 80)
+
+    parser = argparse.ArgumentParser(description='차트 명세(TOML) 기반 stripplot 생성')
+    parser.add_argument('charts', nargs='*', help='생성할 차트 이름 (기본: 전체)')
+    parser.add_argument('--spec', default=SPEC_FILE, help='명세 파일')
+    parser.add_argument('--list', action='store_true', help='명세 목록만 출력')
+    parser.add_argument('--headless', action='store_true', help='화면 표시 없이 저장만')
+    parser.add_argument('--no-cache', action='store_true', help='저장된 결과물을 쓰지 않고 모두 다시 그림')
+    parser.add_argument('--preview', action='store_true', help='저해상도 미리보기 단계로 생성 (*_preview.png)')
+    args = parser.parse_args()
+    if args.no_cache:
+        from artifact_cache import disable_cache
+        disable_cache()
+    if args.preview:
+        from render_tier import set_render_tier
+        set_render_tier('preview')
+
+    try:
+        if args.list:
+            specs, _ = load_specs(args.spec)
+            print(f"📋 {args.spec}:")
+            for (dataset, filter_name), group in group_specs(specs.values()).items():
+                print(f"   {dataset}" + (f" [{filter_name}]" if filter_name else ''))
+                for spec in group:
+                    print(f"      {spec['name']}: {spec['metric']} → {spec['output']}")
+            return
+        results = render_specs(args.charts, args.spec)
+    except Exception as e:
+        print(f"❌ 차트 생성 실패: {e}")
+        return
+
+    print(f"\n📊 생성 결과:")
+    for name, filename in results.items():
+        print(f"   {'✅' if filename else '❌'} {name}: {filename}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코일 데이터 컬럼 목록 및 분석별 필요 컬럼 등록부
+
+각 분석 스크립트는 여기에 필요한 컬럼을 선언하고, 로더는 선언된 컬럼만 읽는다.
+선언은 모듈 로드 시점에 전체 컬럼 목록과 대조하여 검증한다.
+"""
+
+# 원본 export 의 전체 컬럼 (65개)
+TRACE_COLUMNS = [
+    'm_heat_no', 'm_coil_no', 'in_comp', 'ms_date', 'cr_date',
+]
+CHEMISTRY_COLUMNS = [
+    'pcm', 'ceq', 'c', 'si', 'mn', 'p', 's', 's_al', 't_al', 'cr', 'ni', 'b',
+    'ca', 'cu', 'fe', 'h', 'mg', 'mo', 'n', 'nb', 'o', 'sn', 'ti', 'v', 'co', 'sb',
+]
+MILL_COLUMNS = [
+    'zinc_coating', 'hardness', 'm_ys', 'm_ts', 'm_el', 'sur_thk', 'sur_wdt', 'sur_len',
+]
+PIPE_COLUMNS = [
+    'sp_no_dt', 'wo_no', 'wc_id', 'wc_desc', 'factory_id', 'factory_desc',
+    'batch_no', 'p_spec', 'p_od_c', 'p_thick_mm', 'i_heat_no', 'i_coil_no',
+    'pipe_no', 'sp_vec', 'quality', 'vendor_desc',
+]
+PIPE_TEST_COLUMNS = [
+    'i_ys', 'i_ts', 'i_el', 'ys1_load', 'ys1_stress', 'ys2_load', 'ys2_stress',
+    'ts_stress', 'elongation', 'create_date',
+]
+ALL_COLUMNS = TRACE_COLUMNS + CHEMISTRY_COLUMNS + MILL_COLUMNS + PIPE_COLUMNS + PIPE_TEST_COLUMNS
+
+# 분석별 필요 컬럼 선언
+ANALYSIS_COLUMNS = {
+    'ys2_stress_stripplot': ['p_spec', 'ys2_stress'],
+    'ys2_minus_iys_stripplot': ['p_spec', 'ys2_stress', 'i_ys'],
+    'ts_stress_minus_its_stripplot': ['p_spec', 'ts_stress', 'i_ts'],
+    'x52_ys2_stress_filtered_stripplot': ['p_spec', 'ys2_stress'],
+    'quality_thickness_stripplot': ['p_spec', 'p_thick_mm'],
+    'ys2_stress_vs_i_ys_plot': ['p_spec', 'ys2_stress', 'i_ys'],
+}
+
+
+def validate_columns(columns, available=None):
+    """컬럼 목록이 모두 존재하는지 검증 (없으면 ValueError)"""
+    available = ALL_COLUMNS if available is None else list(available)
+    missing = [col for col in columns if col not in available]
+    if missing:
+        raise ValueError(f"존재하지 않는 컬럼: {missing}")
+    return list(columns)
+
+
+def validate_registry():
+    """등록된 모든 분석의 컬럼 선언 검증"""
+    for analysis, columns in ANALYSIS_COLUMNS.items():
+        try:
+            validate_columns(columns)
+        except ValueError as e:
+            raise ValueError(f"'{analysis}' 컬럼 선언 오류: {e}") from None
+        if len(set(columns)) != len(columns):
+            raise ValueError(f"'{analysis}' 컬럼 선언에 중복이 있습니다: {columns}")
+
+
+def required_columns(analysis):
+    """분석 이름으로 필요 컬럼 목록 조회"""
+    if analysis not in ANALYSIS_COLUMNS:
+        raise KeyError(f"등록되지 않은 분석입니다: {analysis}")
+    return list(ANALYSIS_COLUMNS[analysis])
+
+
+validate_registry()
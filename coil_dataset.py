@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중경공장 코일 데이터 공용 로더 (Parquet 캐시)
+
+원본 xlsx 파일의 내용 해시를 키로 Parquet 사본을 만들어 두고,
+이후 로드는 Parquet 에서 바로 읽는다. xlsx 내용이 바뀌면 해시가 달라지므로
+캐시는 자동으로 다시 만들어진다.
+
+파이프라인이 xlsx 옆에 같은 이름의 .parquet 결과를 저장해 두었으면 xlsx 대신 그 파일을
+바로 읽는다. Parquet 이 원본이고 xlsx 는 그 파생본이므로, xlsx 가 더 최신이어도 그 Parquet 에서
+export(coil_export)된 그대로라면 Parquet 을 읽는다. xlsx 를 따로 고쳤거나 Parquet 이 바뀌었으면
+export 기록과 내용 해시가 맞지 않으므로 더 최신인 xlsx 를 읽는다.
+
+캐시가 없을 때의 xlsx 파싱은 xlsx_fast_reader 의 고속 리더를 사용한다.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from coil_columns import validate_columns
+from coil_schema import SCHEMA_VERSION, apply_schema, normalize_column_names
+from xlsx_fast_reader import read_inline_xlsx
+
+# 기본 데이터 파일 (0값 필터링 완료본)
+DEFAULT_DATA_FILE = '중경1공장_데이터_필터링완료.xlsx'
+
+# 캐시 저장 폴더 (프로젝트 루트 기준)
+CACHE_DIR = Path(__file__).resolve().parent / '.coil_cache'
+
+
+def file_content_hash(file_path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(file_path, content_hash=None):
+    """원본 파일에 대응하는 Parquet 캐시 경로 (스키마 버전 포함)"""
+    if content_hash is None:
+        content_hash = file_content_hash(file_path)
+    stem = Path(file_path).stem
+    return CACHE_DIR / f"{stem}-{content_hash[:16]}-s{SCHEMA_VERSION}.parquet"
+
+
+def _remove_stale_caches(file_path, keep_path):
+    """같은 원본에서 만들어진 이전 버전 캐시 삭제"""
+    stem = Path(file_path).stem
+    for old_path in CACHE_DIR.glob(f"{stem}-*.parquet"):
+        if old_path != keep_path:
+            try:
+                old_path.unlink()
+            except OSError:
+                pass
+
+
+def normalize_object_columns(data):
+    """숫자/문자가 섞인 object 컬럼(m_coil_no 등)을 문자열로 통일"""
+    for col in data.select_dtypes(include=['object']).columns:
+        values = data[col].dropna()
+        if values.map(type).nunique() > 1:
+            data[col] = data[col].where(data[col].isna(), data[col].astype(str))
+    return data
+
+
+def _write_cache(data, cache_path):
+    """임시 파일에 쓴 뒤 교체하여 캐시를 원자적으로 저장"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    tmp_path = cache_path.with_suffix('.parquet.tmp')
+    normalize_object_columns(data).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+
+
+def _project(data, columns):
+    """필요 컬럼만 남김 (선언된 컬럼이 없으면 ValueError)"""
+    if columns is None:
+        return data
+    validate_columns(columns, data.columns)
+    return data[list(columns)]
+
+
+def export_record_path(content_hash):
+    """export 된 xlsx(내용 해시)의 원본 Parquet 기록 경로"""
+    return CACHE_DIR / f"export-{content_hash[:16]}.json"
+
+
+def record_export(export_path, source_path):
+    """xlsx 가 source_path(Parquet)에서 export 되었음을 기록 (xlsx/Parquet 내용 해시로 확인)"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    record = {
+        'source': str(Path(source_path).resolve()),
+        'source_hash': file_content_hash(source_path),
+    }
+    record_path = export_record_path(file_content_hash(export_path))
+    tmp_path = record_path.with_suffix('.json.tmp')
+    tmp_path.write_text(json.dumps(record, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, record_path)
+    return record_path
+
+
+def exported_from(file_path, source_path):
+    """xlsx 가 현재 내용 그대로 source_path(Parquet)의 현재 내용에서 export 된 것인지 확인"""
+    record_path = export_record_path(file_content_hash(file_path))
+    try:
+        record = json.loads(record_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return False
+    return (record.get('source') == str(Path(source_path).resolve())
+            and record.get('source_hash') == file_content_hash(source_path))
+
+
+def fast_format_path(file_path):
+    """
+    xlsx 옆의 .parquet 결과 경로 (없으면 None)
+    xlsx 가 더 최신이면 그 Parquet 에서 export 된 그대로일 때만 Parquet 경로를 반환한다.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix == '.parquet':
+        return file_path if file_path.exists() else None
+
+    parquet_path = file_path.with_suffix('.parquet')
+    if not parquet_path.exists():
+        return None
+    if (file_path.exists() and os.path.getmtime(file_path) > os.path.getmtime(parquet_path)
+            and not exported_from(file_path, parquet_path)):
+        return None
+    return parquet_path
+
+
+def read_excel(file_path, columns=None):
+    """엑셀 파싱 (xlsx 는 고속 리더, 그 외 형식은 pd.read_excel), coil_schema 타입 적용"""
+    if Path(file_path).suffix.lower() == '.xlsx':
+        return read_inline_xlsx(file_path, columns)
+    data = normalize_column_names(pd.read_excel(file_path))
+    return apply_schema(normalize_object_columns(_project(data, columns)))
+
+
+def _read_parquet(parquet_path, columns):
+    """Parquet 로드 (컬럼 선언은 파일 스키마로 먼저 검증)"""
+    if columns is not None:
+        validate_columns(columns, pq.read_schema(parquet_path).names)
+    return pd.read_parquet(parquet_path, columns=columns)
+
+
+def load_dataset(file_path=DEFAULT_DATA_FILE, columns=None, use_cache=True, verbose=True):
+    """
+    코일 데이터 로드 (Parquet 캐시 우선, coil_schema 타입 적용)
+    Args:
+        file_path: 원본 xlsx 파일 경로
+        columns: 읽을 컬럼 목록 (None 이면 전체, coil_columns.required_columns 참고)
+        use_cache: False 면 캐시를 무시하고 xlsx 를 직접 읽음
+        verbose: 진행 상황 출력 여부
+    """
+    if columns is not None:
+        columns = list(columns)
+
+    parquet_path = fast_format_path(file_path)
+    if parquet_path is not None:
+        if verbose:
+            print(f"⚡ Parquet 결과 파일에서 로드: {parquet_path}")
+        return _read_parquet(parquet_path, columns)
+
+    if not use_cache:
+        return read_excel(file_path, columns)
+
+    content_hash = file_content_hash(file_path)
+    cache_path = cache_path_for(file_path, content_hash)
+
+    if cache_path.exists():
+        if verbose:
+            print(f"⚡ Parquet 캐시에서 로드: {cache_path.name}")
+        return _read_parquet(cache_path, columns)
+
+    if verbose:
+        print(f"📂 xlsx 파싱 후 캐시 생성: {file_path}")
+    data = read_excel(file_path)
+
+    try:
+        _write_cache(data, cache_path)
+        _remove_stale_caches(file_path, cache_path)
+        if verbose:
+            print(f"💾 캐시 저장 완료: {cache_path.name}")
+    except Exception as e:
+        # 캐시 저장 실패는 치명적이지 않으므로 원본 데이터를 그대로 반환
+        print(f"⚠️ 캐시 저장 실패 (원본 데이터 사용): {e}")
+
+    return _project(data, columns)
+
+
+def ensure_cache(file_path=DEFAULT_DATA_FILE, verbose=False):
+    """원본 파일의 Parquet 캐시가 없으면 만들고 캐시 경로 반환 (최신 .parquet 결과가 있으면 그 경로)"""
+    parquet_path = fast_format_path(file_path)
+    if parquet_path is not None:
+        return parquet_path
+
+    cache_path = cache_path_for(file_path)
+    if not cache_path.exists():
+        load_dataset(file_path, verbose=verbose)
+    if not cache_path.exists():
+        raise RuntimeError(f"Parquet 캐시를 만들 수 없습니다: {file_path}")
+    return cache_path
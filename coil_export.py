@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중간 결과 저장 유틸리티
+
+기본 저장 형식은 Parquet 이고, Excel 은 필요할 때만 openpyxl write-only 모드로
+행 단위 스트리밍 저장한다. Excel 저장은 백그라운드 스레드에서 실행할 수 있어
+저장하는 동안 분석을 계속할 수 있다.
+
+Parquet 에서 만든 Excel 은 원본 Parquet 을 기록해 두어(coil_dataset.record_export),
+로더가 나중에 저장된 xlsx 때문에 원본 Parquet 을 건너뛰지 않게 한다.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from coil_dataset import normalize_object_columns, record_export
+
+# Excel 저장용 백그라운드 스레드 (저장 순서 보장을 위해 1개)
+_excel_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='excel-export')
+
+# 아직 끝나지 않았을 수 있는 Excel 저장 작업
+_pending_exports = []
+
+
+def write_parquet(data, output_file):
+    """DataFrame 을 Parquet 으로 저장 (임시 파일에 쓴 뒤 교체)"""
+    output_file = Path(output_file)
+    tmp_file = output_file.with_suffix(output_file.suffix + '.tmp')
+    normalize_object_columns(data).to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, output_file)
+    return output_file
+
+
+def stream_to_excel(data, output_file, chunk_size=2000, source=None):
+    """
+    write-only 워크북에 행을 나눠 기록 (워크북 전체를 메모리에 만들지 않음)
+    Args:
+        data: 저장할 DataFrame
+        output_file: xlsx 경로
+        chunk_size: 한 번에 Python 객체로 변환하는 행 수
+        source: data 를 저장한 원본 Parquet 경로 (있으면 export 기록을 남김)
+    """
+    output_file = Path(output_file)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(col) for col in data.columns])
+
+    for start in range(0, len(data), chunk_size):
+        chunk = data.iloc[start:start + chunk_size].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+
+    tmp_file = output_file.with_suffix('.tmp.xlsx')
+    workbook.save(tmp_file)
+    os.replace(tmp_file, output_file)
+    if source is not None:
+        record_export(output_file, source)
+    return output_file
+
+
+def export_excel_async(data, output_file, source=None):
+    """백그라운드 스레드에서 Excel 저장 시작 (Future 반환, .result() 로 완료 대기, source 는 stream_to_excel 참고)"""
+    future = _excel_executor.submit(stream_to_excel, data.copy(), output_file, source=source)
+    _pending_exports.append(future)
+    return future
+
+
+def wait_for_exports():
+    """백그라운드 Excel 저장이 모두 끝날 때까지 대기하고 저장된 경로 목록 반환"""
+    saved = []
+    while _pending_exports:
+        future = _pending_exports.pop(0)
+        try:
+            saved.append(future.result())
+        except Exception as e:
+            print(f"❌ Excel 저장 실패: {e}")
+    return saved
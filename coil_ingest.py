@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+월별 export 증분 수집 스크립트
+
+이미 수집된 행(pipe_no, batch_no, create_date + 식별/시험값 해시 키)은 건너뛰고 새 행만 저장소에 추가한다.
+새 행에 대해서만 0값 필터링을 수행하고, 새 행의 누적 통계(online_stats)만 계산하여
+저장된 누적값과 합친 뒤 품질별 집계 테이블을 갱신한다.
+
+한 번의 수집은 raw/filtered part 파일과 누적 통계에 같은 batch id 를 쓴다. 이전 수집이 중간에
+중단되어 누적 통계에 반영되지 않은 raw batch 가 있으면, 다음 수집이 시작할 때 그 batch 의
+filtered 행을 raw 에서 다시 만들고 누적 통계를 저장된 행으로 다시 계산한다.
+
+여러 workbook 을 한 번에 받을 때는 프로세스 풀에서 동시에 파싱하여 Parquet 캐시를
+만든 뒤, 캐시에서 읽어 순서대로 저장소에 반영한다.
+
+사용법:
+    uv run coil_ingest.py 새_export.xlsx [추가_export.xlsx ...]
+    uv run coil_ingest.py --workers 8 ./첫시도 ./월별_export
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from coil_dataset import ensure_cache, load_dataset
+from coil_schema import apply_schema, drop_unused_categories
+from coil_store import (
+    ROW_KEY_COLUMN, STORE_DIR, append_part, new_batch_id, part_files, partition_values,
+    read_table, row_keys, stored_batches, stored_keys, write_table,
+)
+from filter_jg1_data import analyze_store, drop_zero_rows
+from grade_stats import grade_stats_from_moments
+from online_stats import applied_batches, rebuild_stats, update_stats
+
+
+def write_grade_stats(moments, store_dir=STORE_DIR):
+    """누적 통계로 품질별 집계 테이블 저장"""
+    if moments is None:
+        return read_table('grade_stats', store_dir)
+    updated = grade_stats_from_moments(moments)
+    write_table(updated, 'grade_stats', store_dir)
+    return updated
+
+
+def refresh_grade_stats(filtered_delta, store_dir=STORE_DIR, batch_id=None):
+    """새 행의 누적 통계만 병합한 뒤 품질별 집계 테이블 갱신 (filtered 데이터셋을 다시 읽지 않음)"""
+    moments, _ = update_stats(filtered_delta, store_dir, batch_id=batch_id)
+    return write_grade_stats(moments, store_dir)
+
+
+def recover_interrupted(store_dir=STORE_DIR):
+    """
+    누적 통계에 반영되지 않은 raw batch (이전 수집이 중간에 중단됨) 복구
+    그 batch 의 filtered part 파일을 raw 행으로 다시 만들고 누적 통계를 저장된 행으로 다시 계산한다.
+    Returns:
+        복구한 batch id 목록
+    """
+    applied = applied_batches(store_dir)
+    if applied is None:
+        # 아직 누적 통계가 없으면 다음 갱신이 filtered 전체로 만든다
+        return []
+    pending = sorted(stored_batches('raw', store_dir) - applied)
+    if not pending:
+        return []
+
+    print(f"⚠️ 중단된 수집 {len(pending)}개 복구: {pending}")
+    for batch_id in pending:
+        for path in part_files('filtered', store_dir, batches=[batch_id]):
+            path.unlink()
+        # raw 에 저장된 행 키를 그대로 사용 (batch 만 따로 다시 계산하면 재시험 순번이 달라질 수 있음)
+        raw = apply_schema(pd.concat([pd.read_parquet(path) for path in part_files('raw', store_dir, batches=[batch_id])],
+                                     ignore_index=True))
+        filtered = drop_zero_rows(raw)
+        if len(filtered) > 0:
+            append_part(filtered, 'filtered', store_dir, batch_id=batch_id)
+    moments, _ = rebuild_stats(store_dir)
+    write_grade_stats(moments, store_dir)
+    return pending
+
+
+def ingest_incremental(input_file, store_dir=STORE_DIR):
+    """
+    export 파일의 새 행만 저장소에 추가
+    Args:
+        input_file: 월별 export xlsx 파일 경로
+        store_dir: 저장소 위치
+    Returns:
+        새로 추가된 행 DataFrame
+    """
+    print(f"\n📥 증분 수집 시작: {input_file}")
+    return ingest_frame(load_dataset(input_file), store_dir)
+
+
+def ingest_frame(data, store_dir=STORE_DIR):
+    """스키마가 적용된 DataFrame 의 새 행만 저장소에 추가"""
+    recover_interrupted(store_dir)
+
+    keys = row_keys(data)
+    data[ROW_KEY_COLUMN] = keys
+
+    # 저장소에 이미 있는 키(새 행이 들어갈 파티션만 조회) 및 파일 내 중복 키 제외
+    existing_keys = stored_keys('raw', store_dir, partitions=partition_values(data))
+    is_new = ~keys.isin(existing_keys) & ~keys.duplicated()
+    delta = drop_unused_categories(data[is_new.to_numpy()].copy())
+
+    print(f"   파일 행 수: {len(data):,}개")
+    print(f"   기존 수집 행: {len(data) - len(delta):,}개 (건너뜀)")
+    print(f"   새 행: {len(delta):,}개")
+
+    if len(delta) == 0:
+        print("✅ 새로 추가할 행이 없습니다.")
+        return delta
+
+    # 1. 원본 행 추가 (raw/filtered/누적 통계에 같은 batch id)
+    batch_id = new_batch_id()
+    raw_paths = append_part(delta, 'raw', store_dir, batch_id=batch_id)
+    print(f"💾 raw 추가: {len(raw_paths)}개 파티션")
+
+    # 2. 새 행에 대해서만 0값 필터링
+    filtered_delta = drop_zero_rows(delta)
+    if len(filtered_delta) > 0:
+        filtered_paths = append_part(filtered_delta, 'filtered', store_dir, batch_id=batch_id)
+        print(f"💾 filtered 추가: {len(filtered_paths)}개 파티션 ({len(filtered_delta):,}개)")
+
+    # 3. 새 행의 누적 통계만 병합하여 집계 갱신
+    start = time.perf_counter()
+    touched_grades = sorted(filtered_delta['p_spec'].dropna().astype(str).unique())
+    refresh_grade_stats(filtered_delta, store_dir, batch_id=batch_id)
+    print(f"📊 집계 갱신 품질: {touched_grades if touched_grades else '없음'} ({time.perf_counter() - start:.2f}초)")
+
+    return delta
+
+
+def find_workbooks(inputs):
+    """입력 경로 목록에서 xlsx 파일 수집 (폴더는 하위까지 탐색)"""
+    workbooks = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            workbooks.extend(sorted(p for p in path.rglob('*.xlsx') if not p.name.startswith('~$')))
+        else:
+            workbooks.append(path)
+    return workbooks
+
+
+def _parse_workbook(path):
+    """(작업 프로세스) workbook 파싱 후 Parquet 캐시 생성"""
+    start = time.perf_counter()
+    cache_path = ensure_cache(path)
+    return {
+        'path': path,
+        'cache_path': cache_path,
+        'seconds': time.perf_counter() - start,
+        'size_mb': os.path.getsize(path) / 1024**2,
+    }
+
+
+def bulk_ingest(inputs, workers=None, store_dir=STORE_DIR):
+    """
+    여러 workbook 을 프로세스 풀에서 동시에 파싱한 뒤 저장소에 반영
+    Args:
+        inputs: xlsx 파일 또는 폴더 경로 목록
+        workers: 작업 프로세스 수 (None 이면 CPU 코어 수)
+        store_dir: 저장소 위치
+    Returns:
+        새로 추가된 행 합계
+    """
+    workbooks = find_workbooks(inputs)
+    if not workbooks:
+        print("❌ 수집할 xlsx 파일이 없습니다.")
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(workbooks))
+    print(f"\n⚙️ {len(workbooks)}개 workbook 병렬 파싱 (프로세스 {workers}개)")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_parse_workbook, path): path for path in workbooks}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"❌ {path} 파싱 실패: {e}")
+    parse_seconds = time.perf_counter() - start
+
+    # 파일별 처리량
+    print(f"\n📊 파일별 파싱 처리량:")
+    for result in sorted(results, key=lambda r: str(r['path'])):
+        rows = pq_row_count(result['cache_path'])
+        seconds = max(result['seconds'], 1e-9)
+        print(f"   {result['path']}: {rows:,}행, {result['size_mb']:.1f} MB, {seconds:.2f}초 "
+              f"({rows / seconds:,.0f}행/초, {result['size_mb'] / seconds:.1f} MB/초)")
+
+    total_mb = sum(result['size_mb'] for result in results)
+    print(f"   전체: {total_mb:.1f} MB, {parse_seconds:.2f}초 ({total_mb / max(parse_seconds, 1e-9):.1f} MB/초)")
+
+    # 키 중복 판별이 순서에 의존하므로 저장소 반영은 순차 처리
+    total_new = 0
+    for result in sorted(results, key=lambda r: str(r['path'])):
+        print(f"\n📥 저장소 반영: {result['path']}")
+        total_new += len(ingest_frame(pd.read_parquet(result['cache_path']), store_dir))
+    return total_new
+
+
+def pq_row_count(parquet_path):
+    """Parquet 메타데이터에서 행 수 조회"""
+    return pq.ParquetFile(parquet_path).metadata.num_rows
+
+
+def main(argv=None):
+    """메인 실행 함수"""
+    print("🚀 코일 데이터 증분 수집")
+    print("=" * 80)
+
+    parser = argparse.ArgumentParser(description='코일 데이터 증분 수집')
+    parser.add_argument('inputs', nargs='*', help='export xlsx 파일 또는 폴더')
+    parser.add_argument('--workers', type=int, default=None, help='병렬 파싱 프로세스 수 (기본: CPU 코어 수)')
+    args = parser.parse_args(argv)
+
+    if not args.inputs:
+        print("❌ 수집할 export 파일을 지정하세요. 예) uv run coil_ingest.py 새_export.xlsx")
+        return
+
+    try:
+        total_new = bulk_ingest(args.inputs, workers=args.workers)
+    except Exception as e:
+        print(f"❌ 수집 실패: {e}")
+        return
+
+    # 누적 통계에서 저장소 데이터 분석 출력 (전체 이력을 다시 읽지 않음)
+    analyze_store()
+
+    print(f"\n✅ 증분 수집 완료! 새 행 합계: {total_new:,}개")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
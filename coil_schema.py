@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코일 데이터 컬럼 타입 스키마
+
+read_excel 결과는 반복 문자열이 object, 성분값이 float64 로 들어오므로
+로드 시점에 선언된 타입(범주형, float32, nullable 정수, 날짜)으로 변환한다.
+"""
+
+import pandas as pd
+
+from coil_columns import CHEMISTRY_COLUMNS
+
+# 스키마가 바뀌면 올려서 기존 Parquet 캐시를 무효화
+SCHEMA_VERSION = 2
+
+# 반복되는 라벨 → 범주형
+CATEGORY_COLUMNS = [
+    'in_comp', 'wc_id', 'wc_desc', 'factory_desc', 'p_spec', 'sp_vec',
+    'quality', 'vendor_desc',
+]
+
+# 성분/강도/치수 실측값 → float32
+FLOAT32_COLUMNS = CHEMISTRY_COLUMNS + [
+    'hardness', 'sur_thk', 'p_od_c', 'p_thick_mm',
+    'ys1_load', 'ys1_stress', 'ys2_load', 'ys2_stress', 'ts_stress', 'elongation',
+]
+
+# 정수 ID/시험값 → nullable 정수 (결측 허용)
+NULLABLE_INT_COLUMNS = {
+    'zinc_coating': 'Int32',
+    'm_ys': 'Int16',
+    'm_ts': 'Int16',
+    'm_el': 'Int16',
+    'sur_wdt': 'Int32',
+    'sur_len': 'Int32',
+    'wo_no': 'Int32',
+    'factory_id': 'Int32',
+    'pipe_no': 'Int32',
+    'i_ys': 'Int16',
+    'i_ts': 'Int16',
+    'i_el': 'Int16',
+}
+
+# 날짜 컬럼 (None 이면 형식 자동 인식)
+DATE_COLUMNS = {
+    'ms_date': '%Y%m%d',
+    'cr_date': '%Y%m%d',
+    'create_date': None,
+}
+
+
+def _to_nullable_int(series, dtype):
+    """정수로 표현 가능한 경우에만 nullable 정수로 변환"""
+    values = pd.to_numeric(series, errors='coerce')
+    valid = values.dropna()
+    if (valid != valid.round()).any():
+        # 소수값이 섞여 있으면 정보 손실을 막기 위해 float 유지
+        return values
+    return values.astype(dtype)
+
+
+def _to_datetime(series, date_format):
+    """날짜 컬럼 변환 (yyyymmdd 정수 포함)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if date_format is not None:
+        series = series.astype('string').str.replace(r'\.0$', '', regex=True)
+    return pd.to_datetime(series, format=date_format, errors='coerce')
+
+
+def normalize_column_names(data):
+    """공장/기간별 export 의 컬럼명 표기 차이 통일 (앞뒤 공백 제거, 소문자)"""
+    return data.rename(columns=lambda col: str(col).strip().lower())
+
+
+def apply_schema(data):
+    """선언된 스키마에 따라 컬럼 타입 변환 (없는 컬럼은 건너뜀)"""
+    data = data.copy()
+
+    for col in CATEGORY_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].astype('category')
+
+    for col in FLOAT32_COLUMNS:
+        if col in data.columns:
+            data[col] = pd.to_numeric(data[col], errors='coerce').astype('float32')
+
+    for col, dtype in NULLABLE_INT_COLUMNS.items():
+        if col in data.columns:
+            data[col] = _to_nullable_int(data[col], dtype)
+
+    for col, date_format in DATE_COLUMNS.items():
+        if col in data.columns:
+            data[col] = _to_datetime(data[col], date_format)
+
+    return data
+
+
+def memory_report(before, after):
+    """스키마 적용 전/후 컬럼별 메모리 사용량 비교표"""
+    before_mem = before.memory_usage(deep=True, index=False)
+    after_mem = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        '변환 전 타입': before.dtypes.astype(str),
+        '변환 후 타입': after.dtypes.reindex(before.columns).astype(str),
+        '변환 전 (KB)': before_mem / 1024,
+        '변환 후 (KB)': after_mem.reindex(before.columns) / 1024,
+    })
+    report['절감률 (%)'] = (1 - report['변환 후 (KB)'] / report['변환 전 (KB)']) * 100
+    return report.round(1)
+
+
+def print_memory_report(before, after, top_n=None):
+    """컬럼별 메모리 비교 및 전체 합계 출력"""
+    report = memory_report(before, after)
+    if top_n is not None:
+        report = report.sort_values('변환 전 (KB)', ascending=False).head(top_n)
+
+    total_before = before.memory_usage(deep=True).sum() / 1024**2
+    total_after = after.memory_usage(deep=True).sum() / 1024**2
+
+    print(f"\n🧮 컬럼별 메모리 사용량 (스키마 적용 전/후):")
+    print(report.to_string())
+    print(f"\n   전체: {total_before:.2f} MB → {total_after:.2f} MB "
+          f"({total_before / max(total_after, 1e-9):.1f}배 축소)")
+
+
+def drop_unused_categories(data):
+    """필터링 후 남지 않은 범주 제거 (value_counts 에 0개 항목이 나오지 않도록)"""
+    for col in data.select_dtypes(include=['category']).columns:
+        data[col] = data[col].cat.remove_unused_categories()
+    return data
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코일 데이터 SQL 질의 (DuckDB 내장 엔진)
+
+Parquet 파일 위에 다음 뷰를 만들어 두고 SQL 로 필터링/집계한다.
+    raw            수집된 원본 행
+    zero_filtered  0값 필터링을 통과한 행
+    spec_filtered  zero_filtered 중 YS2_STRESS 360~530 MPa 범위 행
+
+coil_store 저장소에 데이터가 있으면 저장소를, 없으면 xlsx 의 Parquet 캐시를 사용한다.
+모든 뷰에는 create_date 의 연-월인 month 컬럼이 추가된다.
+
+사용법:
+    uv run coil_sql.py "SELECT p_spec, count(*) AS n FROM spec_filtered GROUP BY 1 ORDER BY n DESC"
+"""
+
+import sys
+
+import duckdb
+
+from coil_dataset import ensure_cache
+from coil_store import ROW_KEY_COLUMN, STORE_DIR, part_files
+
+# 저장소가 비어 있을 때 사용하는 원본 파일
+RAW_SOURCE_FILE = '중경1공장_데이터.xlsx'
+FILTERED_SOURCE_FILE = '중경1공장_데이터_필터링완료.xlsx'
+
+# spec_filtered 뷰의 YS2_STRESS 범위 (filter_ys2_stress_range 기본값과 동일)
+YS2_STRESS_RANGE = (360, 530)
+
+
+def _parquet_source(name, store_dir, fallback_file):
+    """뷰가 읽을 Parquet 파일 목록 (저장소 우선, 없으면 xlsx 캐시)"""
+    files = part_files(name, store_dir)
+    if not files:
+        files = [ensure_cache(fallback_file)]
+    return [str(path) for path in files]
+
+
+def _create_view(con, view_name, files):
+    """
+    Parquet 파일 목록 위에 month 컬럼을 더한 뷰 생성
+    파티션 컬럼은 part 파일 안에도 있으므로 Hive 폴더명 자동 인식은 끈다
+    (xlsx 캐시와 같은 컬럼 구성, month 중복 방지).
+    """
+    file_list = ', '.join("'" + path.replace("'", "''") + "'" for path in files)
+    columns = f"* EXCLUDE ({ROW_KEY_COLUMN})" if _has_row_key(con, files) else '*'
+    con.execute(f"""
+        CREATE OR REPLACE VIEW {view_name} AS
+        SELECT {columns}, strftime(create_date, '%Y-%m') AS month
+        FROM read_parquet([{file_list}], union_by_name = true, hive_partitioning = false)
+    """)
+
+
+def _has_row_key(con, files):
+    """Parquet 파일에 행 키 컬럼이 있는지 확인"""
+    path = files[0].replace("'", "''")
+    columns = con.execute(f"SELECT name FROM parquet_schema('{path}')").fetchall()
+    return any(name == ROW_KEY_COLUMN for (name,) in columns)
+
+
+def connect(store_dir=STORE_DIR, threads=None):
+    """
+    뷰가 준비된 DuckDB 연결 생성
+    Args:
+        store_dir: coil_store 저장소 위치
+        threads: 사용할 스레드 수 (None 이면 DuckDB 기본값 = 전체 코어)
+    """
+    con = duckdb.connect()
+    if threads is not None:
+        con.execute(f"SET threads = {int(threads)}")
+
+    _create_view(con, 'raw', _parquet_source('raw', store_dir, RAW_SOURCE_FILE))
+    _create_view(con, 'zero_filtered', _parquet_source('filtered', store_dir, FILTERED_SOURCE_FILE))
+
+    min_ys2, max_ys2 = YS2_STRESS_RANGE
+    con.execute(f"""
+        CREATE OR REPLACE VIEW spec_filtered AS
+        SELECT * FROM zero_filtered
+        WHERE ys2_stress BETWEEN {min_ys2} AND {max_ys2}
+    """)
+    return con
+
+
+def query(sql, params=None, arrow=False, con=None):
+    """
+    SQL 실행 결과 반환
+    Args:
+        sql: 실행할 SQL (뷰: raw, zero_filtered, spec_filtered)
+        params: 바인딩 파라미터 (? 자리표시자)
+        arrow: True 면 pyarrow Table, False 면 pandas DataFrame
+        con: 재사용할 연결 (None 이면 새로 생성)
+    """
+    if con is None:
+        con = connect()
+    result = con.execute(sql, params or [])
+    return result.fetch_arrow_table() if arrow else result.df()
+
+
+def main():
+    """메인 실행 함수"""
+    if len(sys.argv) < 2:
+        print("❌ 실행할 SQL 을 입력하세요.")
+        print('   예) uv run coil_sql.py "SELECT p_spec, count(*) FROM zero_filtered GROUP BY 1"')
+        return
+
+    sql = ' '.join(sys.argv[1:])
+    try:
+        print(query(sql).to_string())
+    except Exception as e:
+        print(f"❌ 질의 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코일 데이터 저장소 (Hive 형식 파티션 + Parquet part 파일 누적 방식)
+
+저장소 구조:
+    coil_store/
+    ├── raw/                                  # 수집된 원본 행
+    │   └── factory_desc=<공장>/wc_desc=<작업장>/month=<YYYY-MM>/part-*.parquet
+    ├── filtered/                             # 0값 필터링을 통과한 행 (같은 파티션 구조)
+    └── aggregates/                           # 품질별 통계, 누적 통계(online_stats) 등 집계 테이블
+
+part 파일 이름은 part-<수집 batch id>.parquet 이다. 한 번의 증분 수집은 raw/filtered 에 같은
+batch id 로 쓰므로, 누적 통계에 반영되지 않은 수집을 파일 이름만 보고 찾을 수 있다.
+
+파티션 값은 폴더명에 쓸 수 없는 문자만 %XX 로 인코딩하여 사용하고, 로드 시 폴더명만 보고
+조건에 맞지 않는 파티션은 파일을 열지 않는다.
+"""
+
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import unquote
+
+import pandas as pd
+
+from coil_dataset import normalize_object_columns
+from coil_schema import apply_schema
+
+# 기본 저장소 위치 (프로젝트 루트 기준)
+STORE_DIR = Path(__file__).resolve().parent / 'coil_store'
+
+# 이미 수집된 행을 판별하는 안정 키
+KEY_COLUMNS = ['pipe_no', 'batch_no', 'create_date']
+
+# 같은 KEY_COLUMNS 의 행(시편/코일)을 구분하는 업무 식별 컬럼 (재시험은 등장 순번으로 구분)
+IDENTITY_COLUMNS = ['sp_no_dt', 'sp_vec', 'm_heat_no', 'm_coil_no', 'i_heat_no', 'i_coil_no']
+
+# part 파일에 함께 저장하는 행 키 컬럼
+ROW_KEY_COLUMN = '_row_key'
+
+# 파티션 컬럼 (month 는 create_date 의 연-월)
+PARTITION_COLUMNS = ['factory_desc', 'wc_desc', 'month']
+
+# 파티션 값이 결측일 때 쓰는 폴더명
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# 파티션 폴더명에서 인코딩할 문자
+_UNSAFE_PATH_CHARS = set('%/\\:*?"<>|=')
+
+
+def _canonical_text(series):
+    """키 계산용 문자열 표현 (dtype 과 무관하게 같은 값은 같은 문자열)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime('%Y-%m-%d')
+    elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        text = series.astype('Float64').astype('string').str.replace(r'\.0$', '', regex=True)
+    else:
+        text = series.astype('string').str.strip().str.replace(r'\.0$', '', regex=True)
+    return text.astype('string').fillna('')
+
+
+def row_keys(data):
+    """
+    행 키 생성: KEY_COLUMNS 값 + 업무 식별 컬럼과 재시험 순번의 정규화 해시
+    같은 pipe_no/batch_no/create_date 에 시편(sp_no_dt, sp_vec)·코일별 행이 여러 개 있고
+    pipe_no 가 비어 있는 행도 있으므로, 고정된 컬럼을 고정된 문자열 형식으로 바꿔 해시한다.
+    나머지 컬럼이나 dtype(coil_schema 압축, 범주형/문자열, float/int)이 바뀌어도 키는 같다.
+
+    시험값(i_ys, ys2_stress 등)은 키에 넣지 않는다. 식별 컬럼까지 같은 행(재시험)은
+    data 안에서의 등장 순서(0, 1, ...)로 구분하므로, 월별 export 에 재시험 행이 함께 들어 있으면
+    다시 수집해도 같은 키가 된다. 시험값만 정정된 행을 다시 export 하면 같은 키로 보고 건너뛴다
+    (upsert 하지 않음, 처음 저장된 값 유지). 정정값을 반영하려면 저장소를 다시 만든다.
+    """
+    def column_text(col):
+        if col not in data.columns:
+            return pd.Series('', index=data.index, dtype='string')
+        return _canonical_text(data[col])
+
+    keys = None
+    for col in KEY_COLUMNS:
+        part = column_text(col)
+        keys = part if keys is None else keys + '|' + part
+
+    identity = keys
+    for col in IDENTITY_COLUMNS:
+        identity = identity + '|' + column_text(col)
+    retest = identity.groupby(identity, sort=False).cumcount().astype('string')
+
+    content_hash = pd.util.hash_pandas_object(identity + '|' + retest, index=False)
+    return keys + '|' + content_hash.map('{:016x}'.format).astype('string')
+
+
+def dataset_dir(name, store_dir=STORE_DIR):
+    """데이터셋(raw/filtered) 폴더 경로"""
+    return Path(store_dir) / name
+
+
+def partition_values(data):
+    """행별 파티션 값 (factory_desc, wc_desc, month) DataFrame"""
+    month = pd.to_datetime(data['create_date'], errors='coerce').dt.strftime('%Y-%m')
+    values = pd.DataFrame({
+        'factory_desc': data['factory_desc'].astype('string'),
+        'wc_desc': data['wc_desc'].astype('string'),
+        'month': month.astype('string'),
+    }, index=data.index)
+    return values.fillna(NULL_PARTITION)
+
+
+def _escape_partition_value(value):
+    """폴더명에 쓸 수 없는 문자만 %XX 로 인코딩 (한글은 그대로 유지)"""
+    return ''.join(f"%{ord(ch):02X}" if ch in _UNSAFE_PATH_CHARS else ch for ch in str(value))
+
+
+def partition_path(values):
+    """파티션 값 → 'col=value/...' 상대 경로"""
+    return Path(*[f"{col}={_escape_partition_value(values[col])}" for col in PARTITION_COLUMNS])
+
+
+def parse_partition(path, root):
+    """part 파일 경로에서 파티션 값 dict 추출"""
+    values = {}
+    for part in Path(path).relative_to(root).parent.parts:
+        if '=' in part:
+            col, value = part.split('=', 1)
+            value = unquote(value)
+            values[col] = None if value == NULL_PARTITION else value
+    return values
+
+
+def _partition_matches(values, filters):
+    """파티션 값이 조건에 맞는지 확인 (경로에 없는 컬럼은 걸러내지 않음)"""
+    for col, condition in filters.items():
+        if col not in values:
+            continue
+        value = values[col]
+        if callable(condition):
+            if not condition(value):
+                return False
+        elif isinstance(condition, (list, tuple, set)):
+            if value not in condition:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def new_batch_id():
+    """수집 batch id (시각 + 임의값, part 파일 이름에 사용)"""
+    return f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def part_batch_id(path):
+    """part 파일 경로 → 수집 batch id"""
+    return Path(path).stem[len('part-'):]
+
+
+def part_files(name, store_dir=STORE_DIR, filters=None, batches=None):
+    """
+    데이터셋의 part 파일 목록 (파티션 조건으로 가지치기)
+    Args:
+        name: 데이터셋 이름 (raw/filtered)
+        store_dir: 저장소 위치
+        filters: {파티션 컬럼: 값 | 값 목록 | 판별 함수}
+        batches: 수집 batch id 목록 (None 이면 전체)
+    """
+    root = dataset_dir(name, store_dir)
+    files = sorted(root.rglob('part-*.parquet'))
+    if batches is not None:
+        batches = set(batches)
+        files = [path for path in files if part_batch_id(path) in batches]
+    if not filters:
+        return files
+
+    unknown = [col for col in filters if col not in PARTITION_COLUMNS]
+    if unknown:
+        raise ValueError(f"파티션 컬럼이 아닙니다: {unknown} (가능: {PARTITION_COLUMNS})")
+    return [path for path in files if _partition_matches(parse_partition(path, root), filters)]
+
+
+def quarter_months(year, quarter):
+    """분기의 month 파티션 값 목록 (예: 2025, 2 → ['2025-04', '2025-05', '2025-06'])"""
+    first = (quarter - 1) * 3 + 1
+    return [f"{year}-{month:02d}" for month in range(first, first + 3)]
+
+
+def _atomic_to_parquet(data, path):
+    """임시 파일에 쓴 뒤 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.parquet.tmp')
+    normalize_object_columns(data).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def stored_batches(name, store_dir=STORE_DIR):
+    """데이터셋에 저장된 수집 batch id 집합 (파일 이름만 봄)"""
+    return {part_batch_id(path) for path in part_files(name, store_dir)}
+
+
+def append_part(data, name, store_dir=STORE_DIR, batch_id=None):
+    """
+    새 행들을 파티션별 part 파일로 추가 (행 키 컬럼 포함), 저장된 경로 목록 반환
+    Args:
+        batch_id: 수집 batch id (None 이면 새로 만듦, 같은 batch id 로 다시 쓰면 파일을 교체)
+    """
+    if ROW_KEY_COLUMN not in data.columns:
+        data = data.assign(**{ROW_KEY_COLUMN: row_keys(data)})
+
+    batch_id = batch_id or new_batch_id()
+    root = dataset_dir(name, store_dir)
+
+    paths = []
+    values = partition_values(data)
+    for key, index in values.groupby(PARTITION_COLUMNS, sort=True).groups.items():
+        part_dir = root / partition_path(dict(zip(PARTITION_COLUMNS, key)))
+        path = part_dir / f"part-{batch_id}.parquet"
+        _atomic_to_parquet(data.loc[index], path)
+        paths.append(path)
+    return paths
+
+
+def read_dataset(name, store_dir=STORE_DIR, columns=None, filters=None, verbose=False, batches=None):
+    """
+    데이터셋의 part 파일을 읽어 하나의 DataFrame 으로 반환
+    Args:
+        name: 데이터셋 이름 (raw/filtered)
+        store_dir: 저장소 위치
+        columns: 읽을 컬럼 목록 (None 이면 전체)
+        filters: 파티션 조건 (part_files 참고)
+        verbose: 열어본 파일 수 출력 여부
+        batches: 읽을 수집 batch id 목록 (None 이면 전체)
+    """
+    files = part_files(name, store_dir, filters, batches)
+    if verbose:
+        total = len(part_files(name, store_dir))
+        print(f"📂 {name}: 전체 {total}개 중 {len(files)}개 part 파일 로드")
+    if not files:
+        return pd.DataFrame(columns=columns)
+    frames = [pd.read_parquet(path, columns=columns) for path in files]
+    data = pd.concat(frames, ignore_index=True)
+    if columns is None:
+        data = data.drop(columns=[ROW_KEY_COLUMN], errors='ignore')
+    # part 마다 범주 목록이 달라 concat 결과가 object 가 되므로 스키마 재적용
+    return apply_schema(data)
+
+
+def stored_keys(name, store_dir=STORE_DIR, partitions=None):
+    """
+    데이터셋에 이미 저장된 행 키 집합
+    Args:
+        partitions: 읽을 파티션 값 DataFrame (partition_values 결과, None 이면 전체)
+                    증분 수집은 새 행이 들어갈 파티션만 읽으므로 비용이 전체 이력과 무관하다.
+    """
+    if partitions is None:
+        files = part_files(name, store_dir)
+    else:
+        root = dataset_dir(name, store_dir)
+        files = []
+        for values in partitions[PARTITION_COLUMNS].drop_duplicates().to_dict('records'):
+            files.extend(sorted((root / partition_path(values)).glob('part-*.parquet')))
+
+    keys = set()
+    for path in files:
+        keys.update(pd.read_parquet(path, columns=[ROW_KEY_COLUMN])[ROW_KEY_COLUMN])
+    return keys
+
+
+def read_table(name, store_dir=STORE_DIR):
+    """집계 테이블 로드 (없으면 None)"""
+    path = Path(store_dir) / 'aggregates' / f"{name}.parquet"
+    if not path.exists():
+        return None
+    return pd.read_parquet(path)
+
+
+def write_table(table, name, store_dir=STORE_DIR):
+    """집계 테이블 저장"""
+    path = Path(store_dir) / 'aggregates' / f"{name}.parquet"
+    _atomic_to_parquet(table, path)
+    return path
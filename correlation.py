@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+결측값을 고려한 상관계수 행렬 (Pearson / Spearman)
+
+DataFrame.corr() 는 컬럼 쌍마다 두 컬럼이 모두 있는 행을 골라 다시 계산하므로
+컬럼과 행이 많으면 느리다. 여기서는 쌍별 완전 관측(pairwise-complete) 결과는 같게 두고
+    - Pearson : 행을 블록 단위로 나눠 결측 마스크 M 과 0 으로 채운 값 Z 로
+                Mᵀ·M(개수), Zᵀ·M(합), (Z²)ᵀ·M(제곱합), Zᵀ·Z(곱의 합)을 누적한 뒤
+                모든 쌍의 상관계수를 행렬 연산으로 한 번에 계산한다.
+    - Spearman: 결측 패턴이 같은 컬럼끼리 묶고, 패턴 쌍마다 공통 행에서 한 번만 순위를 매긴 뒤
+                Pearson 을 계산한다 (패턴 수는 보통 몇 개뿐이다).
+결과는 입력 데이터 해시(artifact_cache.data_fingerprint)를 키로 .coil_cache/correlation 에
+저장해 두고, 같은 데이터로 다시 부르면 계산하지 않는다.
+품질/공장별로 나눠 계산할 수 있고, 전체 히트맵 대신 |r| 이 큰 상위 쌍만 조회할 수 있다.
+
+사용법:
+    uv run correlation.py                                   # 필터링 데이터, 상위 20쌍
+    uv run correlation.py --method spearman --top 30
+    uv run correlation.py --by p_spec --min-rows 50         # 품질별 상위 쌍
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from artifact_cache import data_fingerprint
+from coil_dataset import CACHE_DIR
+
+# 상관계수 결과 캐시 폴더와 보관 개수
+CORRELATION_CACHE_DIR = CACHE_DIR / 'correlation'
+CORRELATION_CACHE_LIMIT = 64
+
+# Pearson 누적 시 한 번에 처리하는 행 수
+BLOCK_ROWS = 65_536
+
+METHODS = ('pearson', 'spearman')
+
+
+def _pearson_from_sums(count, sum_x, sum_xx, sum_xy, min_periods):
+    """누적 합에서 쌍별 상관계수 (sum_x[i, j] = 컬럼 j 도 있는 행에서 컬럼 i 의 합)"""
+    sum_y, sum_yy = sum_x.T, sum_xx.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sum_xy - sum_x * sum_y / count
+        var_x = sum_xx - sum_x ** 2 / count
+        var_y = sum_yy - sum_y ** 2 / count
+        r = cov / np.sqrt(var_x * var_y)
+    r[(count < max(min_periods, 2)) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    return np.clip(r, -1, 1)
+
+
+def pearson_matrix(values, min_periods=1, block_rows=BLOCK_ROWS):
+    """
+    쌍별 완전 관측 Pearson 상관계수 (행 블록 단위 누적)
+    Args:
+        values: (행 수 × 컬럼 수) float 배열 (결측은 NaN)
+    Returns:
+        (상관계수 행렬, 쌍별 관측 수 행렬)
+    """
+    columns = values.shape[1]
+    # 값이 큰 컬럼의 자릿수 손실을 줄이려고 컬럼 평균을 빼고 누적
+    present_count = (~np.isnan(values)).sum(axis=0)
+    shift = np.nansum(values, axis=0) / np.maximum(present_count, 1)
+
+    count = np.zeros((columns, columns))
+    sum_x = np.zeros((columns, columns))
+    sum_xx = np.zeros((columns, columns))
+    sum_xy = np.zeros((columns, columns))
+    for start in range(0, len(values), block_rows):
+        block = values[start:start + block_rows] - shift
+        present = ~np.isnan(block)
+        mask = present.astype('float64')
+        filled = np.where(present, block, 0.0)
+        count += mask.T @ mask
+        sum_x += filled.T @ mask
+        sum_xx += (filled * filled).T @ mask
+        sum_xy += filled.T @ filled
+    return _pearson_from_sums(count, sum_x, sum_xx, sum_xy, min_periods), count.astype('int64')
+
+
+def spearman_matrix(values, min_periods=1):
+    """
+    쌍별 완전 관측 Spearman 상관계수 (결측 패턴 쌍마다 공통 행에서 한 번만 순위 계산)
+    Returns:
+        (상관계수 행렬, 쌍별 관측 수 행렬)
+    """
+    columns = values.shape[1]
+    present = ~np.isnan(values)
+    patterns, pattern_of = np.unique(present.T, axis=0, return_inverse=True)
+    pattern_of = pattern_of.ravel()
+
+    r = np.full((columns, columns), np.nan)
+    count = np.zeros((columns, columns), dtype='int64')
+    for a in range(len(patterns)):
+        cols_a = np.flatnonzero(pattern_of == a)
+        for b in range(a, len(patterns)):
+            cols_b = np.flatnonzero(pattern_of == b)
+            rows = patterns[a] & patterns[b]
+            block_count = int(rows.sum())
+            count[np.ix_(cols_a, cols_b)] = block_count
+            count[np.ix_(cols_b, cols_a)] = block_count
+            if block_count < max(min_periods, 2):
+                continue
+            # 공통 행에서는 두 패턴의 컬럼이 모두 있으므로 결측 없이 순위 → Pearson
+            cols = cols_a if a == b else np.concatenate([cols_a, cols_b])
+            ranks = rankdata(values[rows][:, cols], axis=0)
+            block_r, _ = pearson_matrix(ranks, min_periods)
+            cross = block_r[:len(cols_a), len(cols_a):] if a != b else block_r
+            r[np.ix_(cols_a, cols_b)] = cross
+            r[np.ix_(cols_b, cols_a)] = cross.T
+    return r, count
+
+
+def correlation_matrix(data, columns=None, method='pearson', min_periods=1):
+    """
+    쌍별 완전 관측 상관계수 행렬
+    Args:
+        data: DataFrame
+        columns: 대상 컬럼 (None 이면 숫자형 컬럼 전체)
+        method: 'pearson' 또는 'spearman'
+        min_periods: 쌍별 최소 관측 수 (미만이면 NaN)
+    Returns:
+        (상관계수 DataFrame, 쌍별 관측 수 DataFrame)
+    """
+    if method not in METHODS:
+        raise ValueError(f"알 수 없는 상관계수 방식: {method} (가능: {list(METHODS)})")
+    if columns is None:
+        columns = list(data.select_dtypes(include=[np.number]).columns)
+    values = np.column_stack([data[col].to_numpy(dtype='float64', na_value=np.nan) for col in columns]) \
+        if columns else np.empty((len(data), 0))
+    compute = pearson_matrix if method == 'pearson' else spearman_matrix
+    r, count = compute(values, min_periods)
+    return pd.DataFrame(r, index=columns, columns=columns), pd.DataFrame(count, index=columns, columns=columns)
+
+
+def _group_frames(data, by, min_rows):
+    """그룹 이름 → 행 묶음 (by 가 None 이면 전체 하나)"""
+    if by is None:
+        return {'전체': data}
+    return {str(key): frame for key, frame in data.groupby(by, observed=True, sort=True) if len(frame) >= min_rows}
+
+
+def _to_long(matrices):
+    """{그룹: (r, n)} → 긴 형식 (group, a, b, r, n)"""
+    frames = []
+    for group, (r, count) in matrices.items():
+        columns = list(r.columns)
+        frames.append(pd.DataFrame({
+            'group': group,
+            'a': np.repeat(columns, len(columns)),
+            'b': np.tile(columns, len(columns)),
+            'r': r.to_numpy().ravel(),
+            'n': count.to_numpy().ravel(),
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['group', 'a', 'b', 'r', 'n'])
+
+
+def _from_long(long):
+    """긴 형식 → {그룹: (r, n)} (컬럼 순서 유지)"""
+    matrices = {}
+    for group, frame in long.groupby('group', sort=False):
+        columns = list(dict.fromkeys(frame['a']))
+        size = len(columns)
+        r = pd.DataFrame(frame['r'].to_numpy().reshape(size, size), index=columns, columns=columns)
+        count = pd.DataFrame(frame['n'].to_numpy().reshape(size, size), index=columns, columns=columns)
+        matrices[group] = (r, count)
+    return matrices
+
+
+def _prune_cache(limit=CORRELATION_CACHE_LIMIT):
+    """오래 사용하지 않은 결과부터 limit 개만 남기고 삭제"""
+    files = sorted(CORRELATION_CACHE_DIR.glob('*.parquet'), key=lambda path: path.stat().st_mtime)
+    for path in files[:-limit] if len(files) > limit else []:
+        path.unlink(missing_ok=True)
+
+
+def cached_correlation(data, columns=None, method='pearson', by=None, min_periods=1, min_rows=3, use_cache=True):
+    """
+    (그룹별) 상관계수 행렬, 데이터 해시를 키로 캐시
+    Args:
+        data: DataFrame
+        columns: 대상 컬럼 (None 이면 숫자형 컬럼 전체, by 컬럼 제외)
+        method: 'pearson' 또는 'spearman'
+        by: 그룹 컬럼 (예: 'p_spec', 'factory_desc', None 이면 전체)
+        min_periods: 쌍별 최소 관측 수
+        min_rows: 그룹별 계산 시 최소 행 수
+        use_cache: False 면 항상 다시 계산
+    Returns:
+        {그룹 이름: (상관계수 DataFrame, 쌍별 관측 수 DataFrame)}
+    """
+    if columns is None:
+        columns = [col for col in data.select_dtypes(include=[np.number]).columns if col != by]
+    selected = data[list(columns) + ([by] if by else [])]
+
+    key_source = {'data': data_fingerprint(selected), 'method': method, 'by': by,
+                  'min_periods': min_periods, 'min_rows': min_rows}
+    key = data_fingerprint(pd.DataFrame({'key': [json.dumps(key_source, sort_keys=True, ensure_ascii=False)]}))
+    cache_path = CORRELATION_CACHE_DIR / f"{key[:32]}.parquet"
+    if use_cache and cache_path.exists():
+        try:
+            matrices = _from_long(pd.read_parquet(cache_path))
+            cache_path.touch()
+            return matrices
+        except Exception as e:
+            print(f"⚠️ 상관계수 캐시 읽기 실패, 다시 계산합니다: {e}")
+
+    matrices = {group: correlation_matrix(frame, columns, method, min_periods)
+                for group, frame in _group_frames(selected, by, min_rows).items()}
+    if use_cache:
+        try:
+            CORRELATION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.parquet.tmp')
+            _to_long(matrices).to_parquet(tmp_path, index=False)
+            tmp_path.replace(cache_path)
+            _prune_cache()
+        except OSError as e:
+            print(f"⚠️ 상관계수 캐시 저장 실패: {e}")
+    return matrices
+
+
+def top_pairs(r, count=None, k=20, min_count=3, min_abs=0.0):
+    """
+    |r| 이 큰 상위 컬럼 쌍 (대각선과 중복 쌍 제외)
+    Args:
+        r: 상관계수 DataFrame
+        count: 쌍별 관측 수 DataFrame (있으면 min_count 미만 쌍 제외)
+        k: 최대 개수 (None 이면 전체)
+        min_abs: |r| 최소값
+    Returns:
+        DataFrame (a, b, r, n)
+    """
+    columns = list(r.columns)
+    upper_a, upper_b = np.triu_indices(len(columns), k=1)
+    values = r.to_numpy()[upper_a, upper_b]
+    counts = count.to_numpy()[upper_a, upper_b] if count is not None else np.full(len(values), -1)
+    pairs = pd.DataFrame({
+        'a': np.asarray(columns, dtype=object)[upper_a],
+        'b': np.asarray(columns, dtype=object)[upper_b],
+        'r': values,
+        'n': counts,
+    })
+    keep = pairs['r'].notna() & (pairs['r'].abs() >= min_abs)
+    if count is not None:
+        keep &= pairs['n'] >= min_count
+    pairs = pairs[keep]
+    order = np.argsort(-pairs['r'].abs().to_numpy(), kind='stable')
+    pairs = pairs.iloc[order].reset_index(drop=True)
+    return pairs if k is None else pairs.head(k)
+
+
+def main():
+    """메인 실행 함수"""
+    from coil_dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description='결측값을 고려한 상관계수 행렬')
+    parser.add_argument('--file', default='중경1공장_데이터_필터링완료.xlsx', help='데이터 파일')
+    parser.add_argument('--method', default='pearson', choices=list(METHODS), help='상관계수 방식')
+    parser.add_argument('--by', default=None, help='그룹 컬럼 (예: p_spec, factory_desc)')
+    parser.add_argument('--top', type=int, default=20, help='출력할 상위 쌍 개수')
+    parser.add_argument('--min-rows', type=int, default=3, help='그룹별 최소 행 수')
+    parser.add_argument('--no-cache', action='store_true', help='캐시를 쓰지 않고 다시 계산')
+    args = parser.parse_args()
+
+    try:
+        data = load_dataset(args.file, verbose=False)
+    except Exception as e:
+        print(f"❌ 데이터 로드 실패: {e}")
+        return
+
+    start = time.perf_counter()
+    matrices = cached_correlation(data, method=args.method, by=args.by, min_rows=args.min_rows,
+                                  use_cache=not args.no_cache)
+    print(f"📈 {args.method} 상관계수: {len(matrices)}개 그룹, {time.perf_counter() - start:.2f}초")
+    for group, (r, count) in matrices.items():
+        print(f"\n📋 {group}: 상위 {args.top}개 쌍 (|r| 순)")
+        print(top_pairs(r, count, k=args.top).to_string(float_format='{:.4f}'.format))
+
+
+if __name__ == "__main__":
+    main()
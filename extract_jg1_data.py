@@ -6,9 +6,94 @@
 
 import pandas as pd
 import os
+import re
+import sys
+from collections import Counter
+from pathlib import Path
 
-def extract_jg1_data():
-    """중경1공장 데이터를 원본 파일에서 추출하여 별도 파일로 저장"""
+from openpyxl import load_workbook
+
+from coil_export import export_excel_async, wait_for_exports, write_parquet
+from coil_schema import apply_schema, print_memory_report
+
+# 중경1공장 식별 키워드
+JG1_KEYWORDS = ['중경1공장', '중경1', 'JG1']
+
+def find_factory_column(columns):
+    """공장 구분 컬럼 선택 (wc_desc 우선)"""
+    factory_cols = [col for col in columns if col and any(word in col.lower() for word in ['wc', 'factory', '공장', 'plant'])]
+    print(f"\n🏭 공장 관련 컬럼: {factory_cols}")
+    
+    if not factory_cols:
+        return None
+    
+    return 'wc_desc' if 'wc_desc' in factory_cols else factory_cols[0]
+
+def stream_factory_partitions(input_file, predicate=None, factory_col=None, chunk_size=5000):
+    """
+    워크시트를 read-only 모드로 한 행씩 읽으며 공장별 파티션 생성
+    Args:
+        input_file: 원본 xlsx 파일 경로
+        predicate: 공장명을 받아 유지 여부를 반환하는 함수 (None 이면 전체 유지)
+        factory_col: 공장 구분 컬럼명 (None 이면 자동 선택)
+        chunk_size: 공장별 행 버퍼를 DataFrame 으로 변환하는 단위
+    Returns:
+        (공장별 DataFrame dict, 전체 공장별 행 개수 Counter, 공장 구분 컬럼명)
+    """
+    workbook = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = list(next(rows))
+        
+        if factory_col is None:
+            factory_col = find_factory_column(header)
+        if factory_col is None or factory_col not in header:
+            return None, Counter(), factory_col
+        factory_idx = header.index(factory_col)
+        
+        factory_counts = Counter()
+        buffers = {}
+        chunks = {}
+        
+        for row in rows:
+            factory = row[factory_idx]
+            factory_counts[factory] += 1
+            
+            # 제외 대상 행은 버퍼에 담지 않음
+            if predicate is not None and not predicate(factory):
+                continue
+            
+            buffer = buffers.setdefault(factory, [])
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                chunks.setdefault(factory, []).append(pd.DataFrame(buffer, columns=header))
+                buffer.clear()
+        
+        for factory, buffer in buffers.items():
+            if buffer:
+                chunks.setdefault(factory, []).append(pd.DataFrame(buffer, columns=header))
+    finally:
+        workbook.close()
+    
+    partitions = {
+        factory: pd.concat(frames, ignore_index=True)
+        for factory, frames in chunks.items()
+    }
+    return partitions, factory_counts, factory_col
+
+def is_jg1_factory(factory):
+    """공장명이 중경1공장 키워드를 포함하는지 확인"""
+    if not isinstance(factory, str):
+        return False
+    factory = factory.lower()
+    return any(keyword.lower() in factory for keyword in JG1_KEYWORDS)
+
+def extract_jg1_data(export_excel=False):
+    """
+    중경1공장 데이터를 원본 파일에서 추출하여 별도 파일로 저장
+    Args:
+        export_excel: True 면 Parquet 과 함께 xlsx 도 백그라운드로 저장
+    """
     
     print("📊 중경1공장 데이터 추출 시작...")
     
@@ -20,51 +105,44 @@ def extract_jg1_data():
         return None
     
     try:
-        # 원본 데이터 로드
-        print("📂 원본 데이터 로드 중...")
-        data = pd.read_excel(input_file)
-        print(f"✅ 원본 데이터 로드 완료: {data.shape}")
-        
-        # 컬럼 정보 확인
-        print(f"\n📋 전체 컬럼 목록 ({len(data.columns)}개):")
-        for i, col in enumerate(data.columns, 1):
-            print(f"{i:2d}. {col}")
-        
-        # 공장 관련 컬럼 찾기
-        factory_cols = [col for col in data.columns if any(word in col.lower() for word in ['wc', 'factory', '공장', 'plant'])]
-        print(f"\n🏭 공장 관련 컬럼: {factory_cols}")
+        # 원본 데이터를 스트리밍으로 읽으며 중경1공장 행만 유지
+        print("📂 원본 데이터 스트리밍 추출 중...")
+        partitions, factory_counts, factory_col = stream_factory_partitions(input_file, predicate=is_jg1_factory)
         
-        if not factory_cols:
+        if partitions is None:
             print("❌ 공장을 구분할 수 있는 컬럼을 찾을 수 없습니다.")
             return None
-        
-        # 주요 공장 컬럼 선택 (wc_desc 우선)
-        factory_col = 'wc_desc' if 'wc_desc' in factory_cols else factory_cols[0]
         print(f"✅ 공장 구분 컬럼으로 '{factory_col}' 사용")
         
         # 공장별 데이터 분포 확인
+        total_count = sum(factory_counts.values())
         print(f"\n📊 {factory_col} 분포:")
-        factory_counts = data[factory_col].value_counts()
-        for factory, count in factory_counts.items():
+        for factory, count in factory_counts.most_common():
             print(f"   {factory}: {count:,}개")
         
-        # 중경1공장 데이터 추출
-        jg1_keywords = ['중경1공장', '중경1', 'JG1']
-        jg1_mask = data[factory_col].str.contains('|'.join(jg1_keywords), case=False, na=False)
-        jg1_data = data[jg1_mask].copy()
+        if not partitions:
+            print("❌ 중경1공장 데이터가 없습니다.")
+            return None
+        
+        raw_data = pd.concat(partitions.values(), ignore_index=True)
+        
+        # 스키마 적용 (범주형, float32, nullable 정수, 날짜)
+        jg1_data = apply_schema(raw_data)
         
         print(f"\n✅ 중경1공장 데이터 추출 완료:")
-        print(f"   전체 데이터: {len(data):,}개")
-        print(f"   중경1공장: {len(jg1_data):,}개 ({len(jg1_data)/len(data)*100:.1f}%)")
+        print(f"   전체 데이터: {total_count:,}개")
+        print(f"   중경1공장: {len(jg1_data):,}개 ({len(jg1_data)/total_count*100:.1f}%)")
         
-        if len(jg1_data) == 0:
-            print("❌ 중경1공장 데이터가 없습니다.")
-            return None
+        # 컬럼 정보 확인
+        print(f"\n📋 전체 컬럼 목록 ({len(jg1_data.columns)}개):")
+        for i, col in enumerate(jg1_data.columns, 1):
+            print(f"{i:2d}. {col}")
         
         # 중경1공장 데이터의 기본 정보
         print(f"\n📈 중경1공장 데이터 기본 정보:")
         print(f"   데이터 크기: {jg1_data.shape}")
         print(f"   메모리 사용량: {jg1_data.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+        print_memory_report(raw_data, jg1_data)
         
         # 주요 컬럼 통계 (숫자형 컬럼만)
         numeric_cols = jg1_data.select_dtypes(include=['number']).columns
@@ -73,22 +151,54 @@ def extract_jg1_data():
             print(jg1_data[numeric_cols].describe().round(2))
         
         # 저장할 파일명 생성
-        output_file = '중경1공장_데이터.xlsx'
+        output_file = '중경1공장_데이터.parquet'
         
         # 데이터 저장
         print(f"\n💾 중경1공장 데이터 저장 중: {output_file}")
-        jg1_data.to_excel(output_file, index=False)
+        write_parquet(jg1_data, output_file)
         
         # 저장된 파일 크기 확인
         file_size = os.path.getsize(output_file) / 1024**2
         print(f"✅ 저장 완료! 파일 크기: {file_size:.1f} MB")
         
+        # Excel 은 요청 시에만 백그라운드로 저장
+        if export_excel:
+            print("📤 Excel 저장을 백그라운드에서 시작합니다: 중경1공장_데이터.xlsx")
+            export_excel_async(jg1_data, '중경1공장_데이터.xlsx', source=output_file)
+        
         return jg1_data
         
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
         return None
 
+def extract_all_factories(input_file='./첫시도/joined_coil_jiwoong.xlsx', output_dir='공장별_데이터'):
+    """원본 파일을 한 번만 읽어 모든 공장의 파티션을 각각 저장"""
+    
+    print("📊 공장별 데이터 일괄 추출 시작...")
+    
+    partitions, factory_counts, factory_col = stream_factory_partitions(input_file)
+    if partitions is None:
+        print("❌ 공장을 구분할 수 있는 컬럼을 찾을 수 없습니다.")
+        return None
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+    
+    saved_files = {}
+    for factory, factory_data in partitions.items():
+        # 파일명에 쓸 수 없는 문자 치환
+        safe_name = re.sub(r'[\\/:*?"<>|\s]+', '_', str(factory)).strip('_') or 'unknown'
+        output_file = output_dir / f"{safe_name}.parquet"
+        # 중경1공장 출력, 저장소와 같은 스키마 적용 (범주형, float32, nullable 정수, 날짜)
+        factory_data = apply_schema(factory_data)
+        write_parquet(factory_data, output_file)
+        saved_files[factory] = output_file
+        print(f"   💾 {factory}: {len(factory_data):,}개 → {output_file}")
+    
+    print(f"✅ {len(saved_files)}개 공장 파티션 저장 완료")
+    return saved_files
+
 def analyze_jg1_data(jg1_data):
     """추출된 중경1공장 데이터의 상세 분석"""
     
@@ -136,7 +246,7 @@ def analyze_jg1_data(jg1_data):
     if measurement_cols:
         print(f"\n4️⃣ 주요 측정값 통계:")
         for col in measurement_cols[:5]:  # 상위 5개만
-            if jg1_data[col].dtype in ['float64', 'int64']:
+            if pd.api.types.is_numeric_dtype(jg1_data[col]):
                 stats = jg1_data[col].describe()
                 print(f"   - {col}: 평균 {stats['mean']:.1f}, 표준편차 {stats['std']:.1f}")
 
@@ -145,13 +255,24 @@ def main():
     print("🚀 중경1공장 데이터 추출 및 분석 시작")
     print("=" * 80)
     
+    # 전체 공장 일괄 추출 모드
+    if '--all-factories' in sys.argv:
+        extract_all_factories()
+        print("\n✅ 작업 완료!")
+        print("=" * 80)
+        return
+    
     # 1. 중경1공장 데이터 추출
-    jg1_data = extract_jg1_data()
+    jg1_data = extract_jg1_data(export_excel='--excel' in sys.argv)
     
     # 2. 추출된 데이터 분석
     if jg1_data is not None:
         analyze_jg1_data(jg1_data)
     
+    # 3. 백그라운드 Excel 저장 완료 대기
+    for saved_file in wait_for_exports():
+        print(f"💾 Excel 저장 완료: {saved_file}")
+    
     print("\n✅ 작업 완료!")
     print("=" * 80)
 
@@ -6,9 +6,43 @@
 
 import pandas as pd
 import numpy as np
+import sys
 
-def filter_zero_values():
-    """지정된 컬럼들에서 0값을 제거하여 필터링"""
+from coil_dataset import load_dataset
+from coil_export import export_excel_async, wait_for_exports, write_parquet
+from coil_schema import drop_unused_categories
+
+# 0값을 제거할 컬럼들 (대소문자 구분 없이 매칭)
+ZERO_FILTER_COLUMNS = ['PCM', 'CEQ', 'Hardness', 'i_YS', 'YS2_STRESS', 'i_TS', 'TS_STRESS']
+
+# 분석 출력에서 분포를 보여줄 측정값
+MEASUREMENT_COLUMNS = ['pcm', 'ceq', 'hardness', 'i_ys', 'ys2_stress', 'i_ts', 'ts_stress']
+
+def match_columns(data, target_columns):
+    """대상 컬럼명을 실제 데이터 컬럼명에 매칭 (정확히 일치 우선, 이후 대소문자 무시)"""
+    lower_map = {col.lower(): col for col in data.columns}
+    matched = []
+    for target_col in target_columns:
+        if target_col in data.columns:
+            matched.append(target_col)
+        elif target_col.lower() in lower_map:
+            matched.append(lower_map[target_col.lower()])
+    return matched
+
+def drop_zero_rows(data, target_columns=ZERO_FILTER_COLUMNS):
+    """지정 컬럼 중 하나라도 0인 행 제거 (출력 없이, 증분 처리용)"""
+    keep = pd.Series(True, index=data.index)
+    for col in match_columns(data, target_columns):
+        # 결측값(NA)은 0이 아닌 값으로 취급하여 유지
+        keep &= (data[col] != 0).fillna(True)
+    return drop_unused_categories(data[keep].copy())
+
+def filter_zero_values(export_excel=False):
+    """
+    지정된 컬럼들에서 0값을 제거하여 필터링
+    Args:
+        export_excel: True 면 Parquet 과 함께 xlsx 도 백그라운드로 저장
+    """
     
     print("🔍 중경1공장 데이터 0값 필터링 시작...")
     
@@ -18,36 +52,19 @@ def filter_zero_values():
     try:
         # 데이터 로드
         print("📂 중경1공장 데이터 로드 중...")
-        data = pd.read_excel(input_file)
+        data = load_dataset(input_file)
         print(f"✅ 데이터 로드 완료: {data.shape}")
         
-        # 필터링할 컬럼들 (대소문자 구분 없이 찾기)
-        target_columns = ['PCM', 'CEQ', 'Hardness', 'i_YS', 'YS2_STRESS', 'i_TS', 'TS_STRESS']
-        
-        # 실제 데이터에서 컬럼명 매칭
-        actual_columns = []
-        column_mapping = {}
+        # 실제 데이터에서 컬럼명 매칭 (대소문자 구분 없이, drop_zero_rows 와 같은 규칙)
+        actual_columns = match_columns(data, ZERO_FILTER_COLUMNS)
+        matched_lower = {col.lower() for col in actual_columns}
         
         print(f"\n🎯 필터링 대상 컬럼 매칭:")
-        for target_col in target_columns:
-            # 정확한 매칭 먼저 시도
-            if target_col in data.columns:
-                actual_columns.append(target_col)
-                column_mapping[target_col] = target_col
-                print(f"   ✅ {target_col} → {target_col}")
+        for target_col in ZERO_FILTER_COLUMNS:
+            if target_col.lower() in matched_lower:
+                print(f"   ✅ {target_col} → {match_columns(data, [target_col])[0]}")
             else:
-                # 대소문자 무시하고 매칭
-                found = False
-                for col in data.columns:
-                    if col.lower() == target_col.lower():
-                        actual_columns.append(col)
-                        column_mapping[target_col] = col
-                        print(f"   ✅ {target_col} → {col}")
-                        found = True
-                        break
-                
-                if not found:
-                    print(f"   ❌ {target_col} 컬럼을 찾을 수 없습니다.")
+                print(f"   ❌ {target_col} 컬럼을 찾을 수 없습니다.")
         
         if not actual_columns:
             print("❌ 필터링할 컬럼이 없습니다.")
@@ -65,16 +82,17 @@ def filter_zero_values():
             zero_counts[col] = zero_count
             print(f"   {col}: 0값 {zero_count:,}개 ({zero_percentage:.1f}%)")
         
-        # 필터링 적용 (모든 지정 컬럼에서 0이 아닌 값만 유지)
+        # 필터링 적용 (증분 수집과 같은 drop_zero_rows 규칙)
         print(f"\n🔧 필터링 적용 중...")
-        filtered_data = data.copy()
-        
+        remaining = pd.Series(True, index=data.index)
         for col in actual_columns:
-            before_count = len(filtered_data)
-            filtered_data = filtered_data[filtered_data[col] != 0]
-            after_count = len(filtered_data)
-            removed_count = before_count - after_count
-            print(f"   {col} 필터링: {removed_count:,}개 제거 → {after_count:,}개 남음")
+            # 컬럼을 순서대로 적용했을 때 각 단계에서 제거되는 행 수 (출력용)
+            is_zero = (data[col] == 0).fillna(False)
+            removed_count = int((remaining & is_zero).sum())
+            remaining &= ~is_zero
+            print(f"   {col} 필터링: {removed_count:,}개 제거 → {int(remaining.sum()):,}개 남음")
+        
+        filtered_data = drop_zero_rows(data)
         
         print(f"\n✅ 필터링 완료:")
         print(f"   필터링 전: {len(data):,}개")
@@ -85,26 +103,44 @@ def filter_zero_values():
         # 필터링 후 각 컬럼의 기본 통계
         print(f"\n📈 필터링 후 주요 컬럼 통계:")
         for col in actual_columns:
-            if filtered_data[col].dtype in ['float64', 'int64']:
+            if pd.api.types.is_numeric_dtype(filtered_data[col]):
                 stats = filtered_data[col].describe()
                 print(f"   {col}: 평균 {stats['mean']:.2f}, 최소 {stats['min']:.2f}, 최대 {stats['max']:.2f}")
         
         # 결과 저장
-        output_file = '중경1공장_데이터_필터링완료.xlsx'
+        output_file = '중경1공장_데이터_필터링완료.parquet'
         print(f"\n💾 필터링된 데이터 저장 중: {output_file}")
-        filtered_data.to_excel(output_file, index=False)
+        write_parquet(filtered_data, output_file)
         
         # 파일 크기 확인
         import os
         file_size = os.path.getsize(output_file) / 1024**2
         print(f"✅ 저장 완료! 파일 크기: {file_size:.1f} MB")
         
+        # Excel 은 요청 시에만 백그라운드로 저장
+        if export_excel:
+            print("📤 Excel 저장을 백그라운드에서 시작합니다: 중경1공장_데이터_필터링완료.xlsx")
+            export_excel_async(filtered_data, '중경1공장_데이터_필터링완료.xlsx', source=output_file)
+        
         return filtered_data
         
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
         return None
 
+def print_measurement_stats(stats):
+    """
+    측정값별 분포 출력
+    Args:
+        stats: 측정값 컬럼을 index 로 하는 mean/std/min/max/25%/75% 표
+               (describe().T 또는 online_stats.summary() 의 누적 통계)
+    """
+    for col, row in stats.iterrows():
+        print(f"   - {col.upper()}:")
+        print(f"     평균: {row['mean']:.3f}, 표준편차: {row['std']:.3f}")
+        print(f"     최소: {row['min']:.3f}, 최대: {row['max']:.3f}")
+        print(f"     25%: {row['25%']:.3f}, 75%: {row['75%']:.3f}")
+
 def analyze_filtered_data(filtered_data):
     """필터링된 데이터의 상세 분석"""
     
@@ -125,18 +161,12 @@ def analyze_filtered_data(filtered_data):
             print(f"   - {quality}: {count:,}개 ({percentage:.1f}%)")
     
     # 2. 주요 측정값 분포
-    measurement_cols = ['pcm', 'ceq', 'hardness', 'i_ys', 'ys2_stress', 'i_ts', 'ts_stress']
-    available_cols = [col for col in measurement_cols if col in filtered_data.columns]
+    available_cols = [col for col in MEASUREMENT_COLUMNS if col in filtered_data.columns]
     
-    if available_cols:
+    numeric_cols = [col for col in available_cols if pd.api.types.is_numeric_dtype(filtered_data[col])]
+    if numeric_cols:
         print(f"\n2️⃣ 주요 측정값 분포:")
-        for col in available_cols:
-            if filtered_data[col].dtype in ['float64', 'int64']:
-                stats = filtered_data[col].describe()
-                print(f"   - {col.upper()}:")
-                print(f"     평균: {stats['mean']:.3f}, 표준편차: {stats['std']:.3f}")
-                print(f"     최소: {stats['min']:.3f}, 최대: {stats['max']:.3f}")
-                print(f"     25%: {stats['25%']:.3f}, 75%: {stats['75%']:.3f}")
+        print_measurement_stats(filtered_data[numeric_cols].describe().T)
     
     # 3. 데이터 품질 확인
     print(f"\n3️⃣ 데이터 품질 확인:")
@@ -152,18 +182,65 @@ def analyze_filtered_data(filtered_data):
             null_percentage = (null_count / len(filtered_data)) * 100
             print(f"     {col}: {null_count:,}개 ({null_percentage:.1f}%)")
 
-def main():
+def analyze_store(store_dir=None):
+    """
+    저장소 filtered 데이터셋 분석 (analyze_filtered_data 의 저장소 버전)
+    online_stats 누적 통계 테이블만 읽으므로 비용이 누적 행 수와 무관하다.
+    Returns:
+        누적 통계가 없으면 False
+    """
+    from coil_store import STORE_DIR
+    from online_stats import summary
+
+    store_dir = STORE_DIR if store_dir is None else store_dir
+    overall = summary('all', store_dir, columns=MEASUREMENT_COLUMNS)
+    if overall is None or len(overall) == 0:
+        return False
+    overall = overall.loc['all']
+    total = int(overall['count'].max())
+
+    print("\n" + "="*60)
+    print("📊 저장소 filtered 데이터 분석 (누적 통계)")
+    print("="*60)
+
+    # 1. 품질별 분포 (측정값 개수가 가장 많은 컬럼 기준)
+    grade_counts = summary('grade', store_dir, columns=MEASUREMENT_COLUMNS)['count']
+    grade_counts = grade_counts.groupby(level='key').max().sort_values(ascending=False)
+    print(f"\n1️⃣ 품질 분포:")
+    for quality, count in grade_counts.head(10).items():
+        print(f"   - {quality}: {count:,}개 ({count / total * 100:.1f}%)")
+
+    # 2. 주요 측정값 분포 (분위수는 스케치 추정값)
+    print(f"\n2️⃣ 주요 측정값 분포:")
+    print_measurement_stats(overall)
+
+    # 3. 측정값 결측
+    print(f"\n3️⃣ 데이터 품질 확인:")
+    print(f"   - 총 레코드 수: {total:,}개")
+    missing = total - overall['count']
+    missing = missing[missing > 0]
+    print(f"   - 결측값 있는 측정값: {len(missing)}개")
+    for col, null_count in missing.items():
+        print(f"     {col}: {null_count:,}개 ({null_count / total * 100:.1f}%)")
+    return True
+
+def main(argv=None):
     """메인 실행 함수"""
+    argv = sys.argv[1:] if argv is None else argv
     print("🚀 중경1공장 데이터 0값 필터링 시작")
     print("=" * 80)
     
     # 1. 0값 필터링
-    filtered_data = filter_zero_values()
+    filtered_data = filter_zero_values(export_excel='--excel' in argv)
     
     # 2. 필터링된 데이터 분석
     if filtered_data is not None:
         analyze_filtered_data(filtered_data)
     
+    # 3. 백그라운드 Excel 저장 완료 대기
+    for saved_file in wait_for_exports():
+        print(f"💾 Excel 저장 완료: {saved_file}")
+    
     print("\n✅ 필터링 작업 완료!")
     print("=" * 80)
 
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+품질(p_spec)별 측정값 집계표
+
+main.py stats metrics 와 증분 수집(coil_ingest)이 함께 쓰는 집계 형식이다.
+stats 명령이 바로 시작하도록 numpy 외에는 import 하지 않는다
+(저장소, Excel, 그래프 모듈을 불러오지 않음).
+"""
+
+import numpy as np
+
+# 품질별 집계 대상 측정값
+GRADE_STATS_COLUMNS = ['i_ys', 'ys2_stress', 'i_ts', 'ts_stress', 'p_thick_mm']
+
+
+def compute_grade_stats(data, grades=None):
+    """품질(p_spec)별 측정값 개수/평균/표준편차 집계"""
+    if grades is not None:
+        data = data[data['p_spec'].isin(grades)]
+    columns = [col for col in GRADE_STATS_COLUMNS if col in data.columns]
+    stats = data.groupby('p_spec', observed=True)[columns].agg(['count', 'mean', 'std'])
+    stats.columns = [f"{col}_{stat}" for col, stat in stats.columns]
+    stats = stats.reset_index()
+    stats['p_spec'] = stats['p_spec'].astype(str)
+    return stats
+
+
+def grade_stats_from_moments(moments):
+    """누적 통계(stats_moments)의 grade 범위에서 compute_grade_stats 와 같은 형식의 집계 생성"""
+    grades = moments[(moments['scope'] == 'grade') & moments['column'].isin(GRADE_STATS_COLUMNS)]
+    grades = grades.assign(std=np.sqrt(grades['m2'] / (grades['count'] - 1)).where(grades['count'] > 1))
+    stats = grades.pivot(index='key', columns='column', values=['count', 'mean', 'std']).swaplevel(axis=1)
+    columns = [col for col in GRADE_STATS_COLUMNS if col in stats.columns.get_level_values(0)]
+    stats = stats[[(col, stat) for col in columns for stat in ['count', 'mean', 'std']]]
+    stats.columns = [f"{col}_{stat}" for col, stat in stats.columns]
+    for col in columns:
+        stats[f"{col}_count"] = stats[f"{col}_count"].fillna(0).astype('int64')
+    stats = stats.rename_axis('p_spec').reset_index()
+    return stats.sort_values('p_spec').reset_index(drop=True)
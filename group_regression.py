@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+그룹별 단순 선형회귀 (OLS) 한 번에 계산
+
+ys2_stress_vs_i_ys_plot 은 전체 데이터에 scipy.stats.linregress 를 한 번 돌리고
+품질마다 Series.corr 를 다시 계산했으며, "95% 신뢰구간" 띠는 전체 RMSE 하나로 그린
+고정 폭 띠라서 실제 예측구간이 아니었다.
+
+group_regression() 은 그룹 컬럼을 한 번 factorize 하고 np.bincount 로 그룹별 충분통계량
+(n, x̄, ȳ, Sxx, Syy, Sxy)을 모은 뒤 모든 그룹의
+    기울기, 절편, 상관계수, R², 기울기/절편 표준오차, 잔차 표준편차, p-value(기울기 = 0 검정)
+를 배열 연산으로 계산한다. 결과(GroupRegression)에서 x 값마다
+    - 평균 반응의 신뢰구간: ŷ ± t·s·√(1/n + (x - x̄)²/Sxx)
+    - 새 관측값의 예측구간: ŷ ± t·s·√(1 + 1/n + (x - x̄)²/Sxx)
+를 구할 수 있다. x/y 컬럼과 그룹(품질, 공장, 두께 구간 등)은 자유롭게 지정한다.
+
+사용법:
+    uv run group_regression.py                                  # I_YS → YS2_STRESS, 품질별
+    uv run group_regression.py --x m_ys --y i_ys --by p_spec --top 10
+    uv run group_regression.py --x i_ts --y ts_stress --by thickness
+    uv run group_regression.py --benchmark                      # 그룹 수별 계산 시간
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# 두께 구간 경계 (mm) 와 이름
+THICKNESS_BIN_EDGES = [0, 6, 8, 10, 12, np.inf]
+THICKNESS_BIN_LABELS = ['~6mm', '6~8mm', '8~10mm', '10~12mm', '12mm~']
+
+# 그룹 없이 전체를 하나로 맞출 때의 그룹 이름
+POOLED_LABEL = '전체'
+
+
+def thickness_bins(values, edges=THICKNESS_BIN_EDGES, labels=THICKNESS_BIN_LABELS):
+    """두께 값 → 두께 구간 이름 (왼쪽 경계 제외, 오른쪽 경계 포함)"""
+    return pd.cut(values, bins=edges, labels=labels)
+
+
+class GroupRegression:
+    """그룹별 OLS 결과 (그룹 순서 배열)"""
+
+    def __init__(self, labels, n, x_mean, y_mean, sxx, syy, sxy, name=None, x_name=None, y_name=None):
+        self.labels = list(labels)
+        self.name = name
+        self.x_name = x_name
+        self.y_name = y_name
+        self.n = np.asarray(n, dtype='int64')
+        self.x_mean, self.y_mean = x_mean, y_mean
+        self.sxx, self.syy, self.sxy = sxx, syy, sxy
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            defined = (self.n >= 2) & (sxx > 0)
+            self.slope = np.where(defined, sxy / sxx, np.nan)
+            self.intercept = y_mean - self.slope * x_mean
+            self.r = np.where(defined & (syy > 0), sxy / np.sqrt(sxx * syy), np.nan)
+            self.r_squared = self.r ** 2
+
+            # 잔차 자유도 n - 2, 잔차제곱합 SSE = Syy - slope·Sxy
+            self.dof = self.n - 2
+            sse = np.clip(syy - self.slope * sxy, 0, None)
+            self.residual_std = np.where(self.dof > 0, np.sqrt(sse / self.dof), np.nan)
+            self.slope_stderr = self.residual_std / np.sqrt(sxx)
+            self.intercept_stderr = self.residual_std * np.sqrt(1 / self.n + x_mean ** 2 / sxx)
+
+            t_value = self.slope / self.slope_stderr
+            # 잔차가 0 이면 (완전한 직선) p-value 0
+            t_value = np.where(self.slope_stderr == 0, np.inf, t_value)
+            self.p_value = np.where(self.dof > 0, 2 * stats.t.sf(np.abs(t_value), np.maximum(self.dof, 1)), np.nan)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def index(self, label):
+        """그룹 이름 → 결과 배열 위치"""
+        return self.labels.index(label)
+
+    def _select(self, group):
+        """group 이 None 이면 모든 그룹(열 벡터), 아니면 그룹 하나의 위치"""
+        if group is None:
+            return (slice(None), None)
+        return self.index(group)
+
+    def predict(self, x, group=None):
+        """
+        회귀선 값
+        Args:
+            x: x 값 배열
+            group: 그룹 이름 (None 이면 모든 그룹 → (그룹 수, len(x)) 배열)
+        """
+        i = self._select(group)
+        return self.intercept[i] + self.slope[i] * np.asarray(x, dtype='float64')
+
+    def _interval(self, x, group, level, extra):
+        i = self._select(group)
+        x = np.asarray(x, dtype='float64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t_crit = stats.t.ppf((1 + level) / 2, np.where(self.dof > 0, self.dof, np.nan))[i]
+            spread = np.sqrt(extra + 1 / self.n[i] + (x - self.x_mean[i]) ** 2 / self.sxx[i])
+            half_width = t_crit * self.residual_std[i] * spread
+        fitted = self.predict(x, group)
+        return fitted - half_width, fitted + half_width
+
+    def confidence_interval(self, x, group=None, level=0.95):
+        """평균 반응(회귀선)의 신뢰구간 (하한, 상한)"""
+        return self._interval(x, group, level, extra=0.0)
+
+    def prediction_interval(self, x, group=None, level=0.95):
+        """새 관측값의 예측구간 (하한, 상한)"""
+        return self._interval(x, group, level, extra=1.0)
+
+    def table(self, min_n=3):
+        """출력용 결과표 (n 이 min_n 미만인 그룹 제외)"""
+        table = pd.DataFrame({
+            'n': self.n,
+            'slope': self.slope,
+            'intercept': self.intercept,
+            'r': self.r,
+            'r_squared': self.r_squared,
+            'p_value': self.p_value,
+            'slope_stderr': self.slope_stderr,
+            'residual_std': self.residual_std,
+        }, index=pd.Index(self.labels, name=self.name))
+        return table[table['n'] >= min_n]
+
+
+def group_regression(data, x_col, y_col, by=None, order=None):
+    """
+    그룹별 y = slope·x + intercept 최소제곱 회귀를 한 번에 계산
+    Args:
+        data: DataFrame
+        x_col, y_col: 설명/반응 변수 컬럼
+        by: 그룹 컬럼 이름 또는 행별 그룹 값 (None 이면 전체를 하나로)
+        order: 결과 그룹 순서 (None 이면 정렬 순서, 목록에 없는 그룹은 제외)
+    Returns:
+        GroupRegression (x 또는 y 가 결측인 행은 제외)
+    """
+    if by is None:
+        keys = pd.Series(POOLED_LABEL, index=data.index)
+        name = None
+    elif isinstance(by, str):
+        keys = data[by]
+        name = by
+    else:
+        keys = pd.Series(by, index=data.index)
+        name = getattr(by, 'name', None)
+
+    if order is None:
+        codes, labels = pd.factorize(keys, sort=True)
+        labels = list(labels)
+    else:
+        labels = list(order)
+        codes = pd.Index(labels).get_indexer(keys)
+
+    x = data[x_col].to_numpy(dtype='float64', na_value=np.nan)
+    y = data[y_col].to_numpy(dtype='float64', na_value=np.nan)
+    keep = (codes >= 0) & ~np.isnan(x) & ~np.isnan(y)
+    codes, x, y = codes[keep], x[keep], y[keep]
+
+    # 그룹별 충분통계량 (평균을 먼저 구한 뒤 중심화한 곱의 합)
+    size = len(labels)
+    n = np.bincount(codes, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.bincount(codes, weights=x, minlength=size) / n
+        y_mean = np.bincount(codes, weights=y, minlength=size) / n
+    dx, dy = x - x_mean[codes], y - y_mean[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=size)
+    syy = np.bincount(codes, weights=dy * dy, minlength=size)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=size)
+    return GroupRegression(labels, n, x_mean, y_mean, sxx, syy, sxy, name=name, x_name=x_col, y_name=y_col)
+
+
+def benchmark(group_counts=(10, 100, 500), rows=100_000, repeat=5):
+    """그룹 수별 계산 시간 (합성 데이터)"""
+    rng = np.random.default_rng(0)
+    print(f"⏱️ 그룹별 회귀 계산 시간 ({rows:,}행, {repeat}회 중 최소):")
+    for groups in group_counts:
+        codes = rng.integers(0, groups, rows)
+        x = rng.normal(450, 30, rows)
+        data = pd.DataFrame({'group': codes.astype(str), 'x': x,
+                             'y': 200 + (0.5 + codes / groups) * x + rng.normal(0, 20, rows)})
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            group_regression(data, 'x', 'y', by='group')
+            timings.append(time.perf_counter() - start)
+        print(f"   그룹 {groups:>4}개: {min(timings) * 1000:.1f}ms")
+
+
+def main():
+    """메인 실행 함수"""
+    from coil_dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description='그룹별 선형회귀')
+    parser.add_argument('--file', default='중경1공장_데이터_필터링완료.xlsx', help='데이터 파일')
+    parser.add_argument('--x', default='i_ys', help='설명 변수 컬럼')
+    parser.add_argument('--y', default='ys2_stress', help='반응 변수 컬럼')
+    parser.add_argument('--by', default='p_spec', help="그룹 컬럼 ('thickness' 는 p_thick_mm 두께 구간, 'none' 은 전체)")
+    parser.add_argument('--top', type=int, default=None, help='행 수가 많은 상위 그룹만 출력')
+    parser.add_argument('--benchmark', action='store_true', help='그룹 수별 계산 시간 측정')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+
+    by_col = {'thickness': 'p_thick_mm', 'none': None}.get(args.by, args.by)
+    columns = list(dict.fromkeys([args.x, args.y] + ([by_col] if by_col else [])))
+    try:
+        data = load_dataset(args.file, columns=columns, verbose=False)
+    except Exception as e:
+        print(f"❌ 데이터 로드 실패: {e}")
+        return
+
+    if args.by == 'thickness':
+        by = thickness_bins(data['p_thick_mm']).rename('thickness')
+        order = THICKNESS_BIN_LABELS
+    else:
+        by = by_col
+        order = data[by_col].value_counts().head(args.top).index if by_col and args.top else None
+
+    start = time.perf_counter()
+    fit = group_regression(data, args.x, args.y, by=by, order=order)
+    elapsed = time.perf_counter() - start
+
+    print(f"📈 {args.y} = slope × {args.x} + intercept ({args.by}별, {len(fit)}개 그룹, {elapsed * 1000:.1f}ms)")
+    print(fit.table().to_string(float_format='{:.4f}'.format))
+
+
+if __name__ == "__main__":
+    main()
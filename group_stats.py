@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+품질별 통계 한 번에 계산 (GroupStats)
+
+차트 함수들은 콘솔 요약, 평균선, 정보 상자를 만들 때마다 data[data[quality_col] == quality] 로
+품질별 행을 다시 골라내고(품질 수 × 행 수 비교를 여러 번), 마지막 통계표는
+groupby().agg([..., lambda x: x.quantile(0.25), ...]) 로 품질마다 Python 함수를 호출한다.
+
+group_stats() 는 품질 컬럼을 한 번 factorize 하고 한 번의 안정 정렬로 품질별 값을 모은 뒤
+    - 개수/합/편차제곱합: np.bincount (평균, 표준편차)
+    - 최소/최대: np.minimum.reduceat / np.maximum.reduceat
+    - 중앙값/임의 분위수: 품질 안에서 값을 한 번 정렬해 두고 모든 품질을 벡터로 보간
+으로 계산하여 GroupStats 로 돌려준다. 출력(table)과 그래프(arrays, series)가 같은 결과를 쓴다.
+
+사용 예:
+    stats = group_stats(data, 'p_spec', 'ys2_stress', order=top_qualities.index)
+    stats.mean                   # 품질 순서대로의 평균 배열
+    stats.series('median')       # 품질 이름 → 중앙값 Series
+    stats.table(['count', 'mean', 'std', 0.25, 0.75])
+"""
+
+import numpy as np
+import pandas as pd
+
+# table() 에서 쓸 수 있는 통계 이름 (숫자는 분위수)
+STAT_NAMES = ('count', 'mean', 'std', 'min', 'max', 'median')
+
+
+class GroupStats:
+    """품질별 통계 결과 (한 번 계산해서 출력과 그래프에서 함께 사용)"""
+
+    def __init__(self, labels, values, counts, name=None, value_name=None):
+        """
+        Args:
+            labels: 품질 이름 목록 (결과 순서)
+            values: 품질별로 모은 값 배열 (품질 안에서는 원래 행 순서)
+            counts: 품질별 개수
+        """
+        self.labels = list(labels)
+        self.name = name
+        self.value_name = value_name
+        self.count = np.asarray(counts, dtype='int64')
+        self._values = values
+        self._starts = np.concatenate([[0], np.cumsum(self.count)[:-1]]).astype('int64')
+        self._sorted = None
+
+        codes = np.repeat(np.arange(len(self.labels)), self.count)
+        nonzero = self.count > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sums = np.bincount(codes, weights=values, minlength=len(self.labels))
+            self.mean = np.where(nonzero, sums / np.maximum(self.count, 1), np.nan)
+            # 두 번째 패스로 편차제곱합 (pandas 와 같은 ddof=1)
+            squares = np.bincount(codes, weights=(values - self.mean[codes]) ** 2, minlength=len(self.labels))
+            self.std = np.where(self.count > 1, np.sqrt(squares / np.maximum(self.count - 1, 1)), np.nan)
+
+        self.min = np.full(len(self.labels), np.nan)
+        self.max = np.full(len(self.labels), np.nan)
+        if nonzero.any():
+            starts = self._starts[nonzero]
+            self.min[nonzero] = np.minimum.reduceat(values, starts)
+            self.max[nonzero] = np.maximum.reduceat(values, starts)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def total(self):
+        """전체 개수"""
+        return int(self.count.sum())
+
+    def _sorted_values(self):
+        """품질 안에서 정렬된 값 (분위수 계산용, 처음 한 번만 정렬)"""
+        if self._sorted is None:
+            codes = np.repeat(np.arange(len(self.labels)), self.count)
+            self._sorted = self._values[np.lexsort((self._values, codes))]
+        return self._sorted
+
+    def quantile(self, q):
+        """
+        품질별 분위수 (pandas 기본과 같은 선형 보간, 값이 없는 품질은 NaN)
+        Args:
+            q: 0~1 사이 분위
+        """
+        result = np.full(len(self.labels), np.nan)
+        nonzero = self.count > 0
+        if not nonzero.any():
+            return result
+        values = self._sorted_values()
+        counts, starts = self.count[nonzero], self._starts[nonzero]
+        position = q * (counts - 1)
+        lower = np.floor(position).astype('int64')
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        low_values, high_values = values[starts + lower], values[starts + upper]
+        result[nonzero] = low_values + (high_values - low_values) * fraction
+        return result
+
+    @property
+    def median(self):
+        """품질별 중앙값"""
+        return self.quantile(0.5)
+
+    def stat(self, name):
+        """이름(STAT_NAMES) 또는 분위수(숫자)로 품질별 통계 배열 조회"""
+        if isinstance(name, (int, float)) and not isinstance(name, bool):
+            return self.quantile(name)
+        if name not in STAT_NAMES:
+            raise ValueError(f"알 수 없는 통계: {name} (가능: {list(STAT_NAMES)} 또는 0~1 분위수)")
+        return getattr(self, name)
+
+    def series(self, name):
+        """품질 이름 → 통계값 Series"""
+        return pd.Series(self.stat(name), index=pd.Index(self.labels, name=self.name), name=name)
+
+    def table(self, stats=('count', 'mean', 'std', 'min', 'max'), names=None, decimals=None):
+        """
+        출력용 통계표
+        Args:
+            stats: 통계 이름 또는 분위수 목록 (분위수 컬럼 이름은 '25%' 형식)
+            names: 컬럼 이름 (None 이면 통계 이름)
+            decimals: 반올림 자릿수 (개수 컬럼은 정수 유지)
+        """
+        columns = {}
+        for stat_name in stats:
+            label = f"{stat_name * 100:g}%" if not isinstance(stat_name, str) else stat_name
+            columns[label] = self.stat(stat_name)
+        table = pd.DataFrame(columns, index=pd.Index(self.labels, name=self.name))
+        if decimals is not None:
+            table = table.round(decimals)
+        if 'count' in table.columns:
+            table['count'] = table['count'].astype(int)
+        if names is not None:
+            table.columns = list(names)
+        return table
+
+    def arrays(self):
+        """품질별 값 배열 목록 (labels 순서, 품질 안에서는 원래 행 순서)"""
+        return np.split(self._values, self._starts[1:])
+
+    def values(self, label):
+        """품질 하나의 값 배열 (원래 행 순서)"""
+        i = self.labels.index(label)
+        return self._values[self._starts[i]:self._starts[i] + self.count[i]]
+
+    def overall(self, name):
+        """전체(모든 품질 합친) 개수/평균/표준편차/최소/최대/중앙값 또는 분위수"""
+        values = self._values
+        if name == 'count':
+            return len(values)
+        if len(values) == 0:
+            return np.nan
+        if isinstance(name, (int, float)) and not isinstance(name, bool):
+            return float(np.quantile(values, name))
+        functions = {'mean': np.mean, 'std': lambda v: np.std(v, ddof=1) if len(v) > 1 else np.nan,
+                     'min': np.min, 'max': np.max, 'median': np.median}
+        if name not in functions:
+            raise ValueError(f"알 수 없는 통계: {name} (가능: {list(STAT_NAMES)} 또는 0~1 분위수)")
+        return float(functions[name](values))
+
+
+def group_stats(data, group_col, value_col, order=None):
+    """
+    품질별 통계를 한 번에 계산
+    Args:
+        data: DataFrame
+        group_col: 그룹(품질) 컬럼
+        value_col: 값 컬럼
+        order: 결과 품질 순서 (None 이면 groupby 와 같은 정렬 순서, 목록에 없는 품질은 제외)
+    Returns:
+        GroupStats (값이 NaN 인 행은 제외)
+    """
+    if order is None:
+        codes, labels = pd.factorize(data[group_col], sort=True)
+        labels = list(labels)
+    else:
+        labels = list(order)
+        codes = pd.Index(labels).get_indexer(data[group_col])
+    values = data[value_col].to_numpy(dtype='float64', na_value=np.nan)
+
+    keep = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[keep], values[keep]
+    grouped = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=len(labels))
+    return GroupStats(labels, values[grouped], counts, name=group_col, value_name=value_col)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+헤드리스(화면 없는) 차트 실행 지원
+
+cron 이나 컨테이너에서 차트를 일괄 생성할 때는 GUI backend 가 plt.show() 에서 멈추고,
+닫지 않은 figure 가 계속 쌓여 메모리가 늘어난다. 헤드리스 모드에서는
+    - 비대화형 Agg backend 를 강제하고
+    - plt.show() 를 건너뛰며
+    - 저장이 끝난 figure 를 바로 닫는다.
+차트별 최대 상주 메모리(peak RSS)는 measure_chart() 로 측정한다.
+
+켜는 방법:
+    COIL_HEADLESS=1 uv run ys2_stress_stripplot.py
+    uv run ys2_stress_stripplot.py --headless
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import matplotlib
+
+# 헤드리스 모드를 켜는 환경변수
+HEADLESS_ENV = 'COIL_HEADLESS'
+
+_headless = False
+
+
+def enable_headless():
+    """Agg backend 를 강제하고 plt.show() 를 건너뛰도록 설정"""
+    global _headless
+    matplotlib.use('Agg', force=True)
+    _headless = True
+
+
+def is_headless():
+    """헤드리스 모드 여부"""
+    return _headless
+
+
+def configure_headless(argv=None):
+    """스크립트 인자(--headless) 또는 환경변수로 헤드리스 모드 설정"""
+    argv = sys.argv if argv is None else argv
+    if '--headless' in argv or os.environ.get(HEADLESS_ENV, '') not in ('', '0'):
+        enable_headless()
+    return _headless
+
+
+def finish_figure(fig=None):
+    """
+    저장이 끝난 figure 마무리
+    헤드리스가 아니면 화면에 표시하고, 항상 닫아서 메모리를 해제한다.
+    Args:
+        fig: 닫을 figure (None 이면 현재 figure)
+    """
+    import matplotlib.pyplot as plt
+    if not _headless:
+        plt.show()
+    if fig is None:
+        plt.close()
+    else:
+        plt.close(fig)
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 상주 메모리(MB), 측정할 수 없으면(Windows) None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def format_rss(mb):
+    """peak RSS 표시 문자열"""
+    return '-' if mb is None else f"{mb:.0f}MB"
+
+
+@contextmanager
+def measure_chart(name=None, verbose=True):
+    """
+    차트 하나의 소요 시간과 peak RSS 측정, 끝나면 남은 figure 를 모두 닫음
+    peak RSS 는 프로세스 전체의 최댓값이므로 이 차트가 최댓값을 얼마나 올렸는지도 함께 기록한다.
+    Yields:
+        {'seconds', 'peak_rss_mb', 'rss_growth_mb'} (블록이 끝난 뒤 채워짐)
+    """
+    import matplotlib.pyplot as plt
+    usage = {'seconds': None, 'peak_rss_mb': None, 'rss_growth_mb': None}
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield usage
+    finally:
+        plt.close('all')
+        usage['seconds'] = time.perf_counter() - start
+        usage['peak_rss_mb'] = peak_rss_mb()
+        if before is not None:
+            usage['rss_growth_mb'] = usage['peak_rss_mb'] - before
+        if verbose and name:
+            growth = '' if usage['rss_growth_mb'] is None else f", 증가 {usage['rss_growth_mb']:.0f}MB"
+            print(f"🧠 {name}: 최대 RSS {format_rss(usage['peak_rss_mb'])}{growth}")
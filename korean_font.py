@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+한글 폰트 설정 (탐색 결과 캐시)
+
+후보 폰트(맑은 고딕, 나눔고딕, 굴림 …)를 한 번만 탐색하여 선택된 폰트 이름과 파일 경로,
+파일의 수정 시각/크기를 .coil_cache/korean_font.json 에 저장해 두고 이후 실행에서는
+그대로 재사용한다. matplotlib 폰트 캐시는 지우지 않는다.
+
+캐시는 선택된 폰트 파일이 바뀌거나(수정 시각/크기) 후보 폰트 파일 구성이 바뀔 때만
+다시 탐색한다.
+
+사용법:
+    uv run korean_font.py            # 선택된 폰트 확인
+    uv run korean_font.py --refresh  # 다시 탐색
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import matplotlib
+import matplotlib.font_manager as fm
+
+# 탐색 결과 캐시 파일 (coil_dataset.CACHE_DIR 와 같은 폴더, pandas import 를 피하려고 따로 정의)
+FONT_CACHE_FILE = Path(__file__).resolve().parent / '.coil_cache' / 'korean_font.json'
+
+# 후보 폰트 (우선순위 순): (폰트명, 알려진 파일 경로)
+FONT_CANDIDATES = [
+    ("Malgun Gothic", ["C:/Windows/Fonts/malgun.ttf"]),
+    ("NanumGothic", [
+        "C:/Windows/Fonts/NanumGothic.ttf",
+        "C:/Windows/Fonts/NanumGothic.otf",
+        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+        "/Library/Fonts/NanumGothic.ttf",
+    ]),
+    ("Gulim", ["C:/Windows/Fonts/gulim.ttc"]),
+    ("Batang", ["C:/Windows/Fonts/batang.ttc"]),
+    ("HCR Dotum", ["C:/Windows/Fonts/HANDotum.ttf"]),
+    ("Apple SD Gothic Neo", ["/System/Library/Fonts/AppleSDGothicNeo.ttc"]),
+    ("AppleGothic", ["/System/Library/Fonts/Supplemental/AppleGothic.ttf"]),
+    ("Noto Sans CJK KR", [
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    ]),
+]
+
+# 한글 지원 확인용 글자
+_HANGUL_PROBE = '한'
+
+# 현재 프로세스에서 이미 적용한 폰트
+_applied_font = None
+
+
+def _file_stamp(path):
+    """폰트 파일의 수정 시각과 크기"""
+    stat = os.stat(path)
+    return {'mtime': stat.st_mtime, 'size': stat.st_size}
+
+
+def _candidate_signature():
+    """존재하는 후보 폰트 파일 목록 (폰트 설치/삭제 감지용)"""
+    return sorted(path for _, paths in FONT_CANDIDATES for path in paths if os.path.exists(path))
+
+
+def has_hangul(path):
+    """폰트 파일에 한글 글리프가 있는지 확인"""
+    from matplotlib.ft2font import FT2Font
+    try:
+        return ord(_HANGUL_PROBE) in FT2Font(str(path)).get_charmap()
+    except Exception:
+        return False
+
+
+def probe_korean_font():
+    """
+    후보 폰트를 순서대로 탐색하여 한글을 지원하는 첫 폰트 반환
+    Returns:
+        {'name', 'path'} 또는 None
+    """
+    # 1. 알려진 파일 경로
+    for name, paths in FONT_CANDIDATES:
+        for path in paths:
+            if os.path.exists(path) and has_hangul(path):
+                return {'name': name, 'path': path}
+
+    # 2. matplotlib 에 등록된 시스템 폰트명
+    for name, _ in FONT_CANDIDATES:
+        try:
+            path = str(fm.findfont(fm.FontProperties(family=name), fallback_to_default=False))
+        except ValueError:
+            continue
+        if has_hangul(path):
+            return {'name': name, 'path': path}
+    return None
+
+
+def _load_cache():
+    """캐시된 탐색 결과 (없거나 무효면 None)"""
+    try:
+        cached = json.loads(FONT_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if cached.get('matplotlib') != matplotlib.__version__:
+        return None
+    if cached.get('candidates') != _candidate_signature():
+        return None
+    font = cached.get('font')
+    if font is not None:
+        if not os.path.exists(font['path']) or _file_stamp(font['path']) != font.get('stamp'):
+            return None
+    return cached
+
+
+def _save_cache(font):
+    """탐색 결과 저장 (임시 파일에 쓴 뒤 교체)"""
+    if font is not None:
+        font = dict(font, stamp=_file_stamp(font['path']))
+    cached = {
+        'matplotlib': matplotlib.__version__,
+        'candidates': _candidate_signature(),
+        'font': font,
+    }
+    try:
+        FONT_CACHE_FILE.parent.mkdir(exist_ok=True)
+        tmp_file = FONT_CACHE_FILE.with_suffix('.json.tmp')
+        tmp_file.write_text(json.dumps(cached, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_file, FONT_CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️ 폰트 캐시 저장 실패: {e}")
+    return cached
+
+
+def resolve_korean_font(refresh=False):
+    """
+    한글 폰트 결정 (캐시 우선)
+    Args:
+        refresh: True 면 캐시를 무시하고 다시 탐색
+    Returns:
+        ({'name', 'path'} 또는 None, 캐시 사용 여부)
+    """
+    cached = None if refresh else _load_cache()
+    if cached is not None:
+        return cached['font'], True
+    return _save_cache(probe_korean_font())['font'], False
+
+
+def setup_korean_font(font_size=None, refresh=False, verbose=True):
+    """
+    matplotlib 에 한글 폰트 적용
+    Args:
+        font_size: 기본 글자 크기 (None 이면 변경하지 않음)
+        refresh: True 면 폰트를 다시 탐색
+        verbose: 설정 결과 출력 여부
+    Returns:
+        적용된 폰트 이름 (실패 시 None)
+    """
+    global _applied_font
+    import matplotlib.pyplot as plt
+
+    if _applied_font is None or refresh:
+        font, from_cache = resolve_korean_font(refresh)
+        if font is not None:
+            # 폰트 파일을 직접 등록하므로 matplotlib 폰트 목록을 다시 만들 필요가 없음
+            fm.fontManager.addfont(font['path'])
+            _applied_font = fm.FontProperties(fname=font['path']).get_name()
+            if verbose:
+                source = '캐시' if from_cache else '탐색'
+                print(f"✅ 한글 폰트 설정: {font['name']} ({font['path']}, {source})")
+        elif verbose:
+            print("⚠️ 한글 폰트를 찾을 수 없습니다. 기본 폰트를 사용합니다.")
+
+    if _applied_font is not None:
+        plt.rcParams['font.family'] = _applied_font
+    plt.rcParams['axes.unicode_minus'] = False
+    if font_size is not None:
+        plt.rcParams['font.size'] = font_size
+    return _applied_font
+
+
+def main():
+    """메인 실행 함수"""
+    font, from_cache = resolve_korean_font(refresh='--refresh' in sys.argv)
+    if font is None:
+        print("⚠️ 한글 폰트를 찾을 수 없습니다.")
+    else:
+        print(f"✅ {font['name']}: {font['path']} ({'캐시' if from_cache else '탐색'})")
+    print(f"   캐시 파일: {FONT_CACHE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,176 @@
-def main():
-    print("Hello from jiwoong-data-study!")
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중경공장 코일 데이터 분석 통합 실행기
+
+하위 명령:
+    ingest   월별 export 증분 수집 (coil_ingest)
+    filter   중경1공장 데이터 0값 필터링 (filter_jg1_data)
+    plot     리포트 차트 하나 생성 (render_report)
+    stats    품질 목록, 행 수, 품질별 측정값 통계 출력
+    report   리포트 차트 일괄 생성 (render_report)
+
+무거운 라이브러리(matplotlib, seaborn, scipy, plotly)는 그것이 필요한 하위 명령 안에서만
+import 한다. stats 는 pandas 만 사용하므로 바로 시작한다.
+--timing 을 주면 실행 시간과 실제로 로드된 무거운 모듈을 출력한다.
+
+사용법:
+    uv run main.py stats grades
+    uv run main.py stats count
+    uv run main.py stats metrics --top 10
+    uv run main.py filter --excel
+    uv run main.py ingest 새_export.xlsx --workers 4
+    uv run main.py plot ys2_stress_stripplot
+    uv run main.py plot ys2_stress_stripplot --preview
+    uv run main.py report --workers 2
+    uv run main.py --timing stats grades
+"""
+
+import argparse
+import sys
+import time
+
+_START = time.perf_counter()
+
+# --timing 에서 로드 여부를 확인하는 무거운 모듈
+HEAVY_MODULES = ['pandas', 'matplotlib', 'seaborn', 'scipy', 'plotly']
+
+# stats 명령의 기본 데이터 파일
+RAW_DATA_FILE = '중경1공장_데이터.xlsx'
+FILTERED_DATA_FILE = '중경1공장_데이터_필터링완료.xlsx'
+
+
+def run_ingest(args):
+    """월별 export 증분 수집"""
+    import coil_ingest
+    coil_ingest.main(args.extra)
+
+
+def run_filter(args):
+    """0값 필터링"""
+    import filter_jg1_data
+    filter_jg1_data.main(['--excel'] if args.excel else [])
+
+
+def run_plot(args):
+    """리포트 차트 하나 생성 (차트를 지정하지 않으면 목록 출력)"""
+    import render_report
+    if args.chart is None:
+        print("📋 생성 가능한 차트:")
+        for chart in render_report.REPORT_CHARTS:
+            print(f"   {chart}")
+        return
+    render_report.main(['--charts', args.chart, '--top-n', str(args.top_n)] + (['--preview'] if args.preview else []))
+
+
+def run_report(args):
+    """리포트 차트 일괄 생성"""
+    import render_report
+    render_report.main(args.extra)
+
+
+def print_grades(file_path, top):
+    """품질(p_spec)별 행 수"""
+    from coil_dataset import load_dataset
+    counts = load_dataset(file_path, columns=['p_spec'], verbose=False)['p_spec'].value_counts()
+    print(f"📋 {file_path}: 품질 {len(counts)}개")
+    for grade, count in counts.head(top).items():
+        print(f"   {grade}: {count:,}개")
+    if len(counts) > top:
+        print(f"   ... 외 {len(counts) - top}개")
+
+
+def print_counts():
+    """데이터 파일과 저장소의 행 수 (Parquet 메타데이터만 읽음)"""
+    import pyarrow.parquet as pq
+    from coil_dataset import ensure_cache
+    from coil_store import part_files
+
+    print("📋 행 수:")
+    for file_path in [RAW_DATA_FILE, FILTERED_DATA_FILE]:
+        try:
+            rows = pq.ParquetFile(ensure_cache(file_path)).metadata.num_rows
+            print(f"   {file_path}: {rows:,}행")
+        except Exception as e:
+            print(f"   ❌ {file_path}: {e}")
+
+    for name in ['raw', 'filtered']:
+        files = part_files(name)
+        if files:
+            rows = sum(pq.ParquetFile(path).metadata.num_rows for path in files)
+            print(f"   저장소 {name}: {rows:,}행 ({len(files)}개 part 파일)")
+
+
+def print_metrics(file_path, top):
+    """상위 품질별 측정값 개수/평균/표준편차"""
+    from coil_dataset import load_dataset
+    from grade_stats import GRADE_STATS_COLUMNS, compute_grade_stats
+
+    data = load_dataset(file_path, columns=['p_spec'] + GRADE_STATS_COLUMNS, verbose=False)
+    grades = data['p_spec'].value_counts().head(top).index
+    stats = compute_grade_stats(data, grades).set_index('p_spec').loc[[str(grade) for grade in grades]]
+    print(f"📊 {file_path}: 상위 {len(grades)}개 품질별 측정값 통계")
+    print(stats.to_string(float_format='{:.2f}'.format))
+
+
+def run_stats(args):
+    """품질 목록, 행 수, 품질별 측정값 통계"""
+    file_path = args.file or FILTERED_DATA_FILE
+    if args.what == 'grades':
+        print_grades(file_path, args.top)
+    elif args.what == 'count':
+        print_counts()
+    else:
+        print_metrics(file_path, args.top)
+
+
+def build_parser():
+    """하위 명령 parser 구성"""
+    parser = argparse.ArgumentParser(prog='main.py', description='중경공장 코일 데이터 분석 통합 실행기')
+    parser.add_argument('--timing', action='store_true', help='실행 시간과 로드된 무거운 모듈 출력')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # 기존 스크립트의 인자를 그대로 넘기는 명령 (--help 도 해당 스크립트가 처리)
+    ingest = commands.add_parser('ingest', help='월별 export 증분 수집', add_help=False)
+    ingest.set_defaults(func=run_ingest, passthrough=True)
+
+    report = commands.add_parser('report', help='리포트 차트 일괄 생성', add_help=False)
+    report.set_defaults(func=run_report, passthrough=True)
+
+    filter_ = commands.add_parser('filter', help='중경1공장 데이터 0값 필터링')
+    filter_.add_argument('--excel', action='store_true', help='Excel 사본도 저장')
+    filter_.set_defaults(func=run_filter)
+
+    plot = commands.add_parser('plot', help='리포트 차트 하나 생성')
+    plot.add_argument('chart', nargs='?', help='차트 이름 (생략하면 목록 출력)')
+    plot.add_argument('--top-n', type=int, default=5, help='상위 품질 개수')
+    plot.add_argument('--preview', action='store_true', help='저해상도 미리보기로 생성')
+    plot.set_defaults(func=run_plot)
+
+    stats = commands.add_parser('stats', help='품질 목록, 행 수, 품질별 측정값 통계')
+    stats.add_argument('what', choices=['grades', 'count', 'metrics'], help='출력할 내용')
+    stats.add_argument('--file', default=None, help=f'데이터 파일 (기본: {FILTERED_DATA_FILE})')
+    stats.add_argument('--top', type=int, default=20, help='출력할 품질 개수')
+    stats.set_defaults(func=run_stats)
+    return parser
+
+
+def main(argv=None):
+    """메인 실행 함수"""
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and not getattr(args, 'passthrough', False):
+        parser.error(f"알 수 없는 인자: {' '.join(extra)}")
+    args.extra = extra
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"❌ {args.command} 실행 실패: {e}")
+
+    if args.timing:
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"\n⏱️ {args.command}: {time.perf_counter() - _START:.2f}초 (인터프리터 시작 제외)")
+        print(f"   로드된 무거운 모듈: {', '.join(loaded) or '없음'}")
 
 
 if __name__ == "__main__":
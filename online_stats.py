@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+누적(온라인) 측정값 통계
+
+새 코일이 들어올 때마다 전체 이력에서 평균/표준편차/분위수를 다시 계산하지 않도록
+병합 가능한 누적값을 저장소 집계 테이블(coil_store/aggregates)에 보관하고,
+증분 수집(coil_ingest.ingest_frame)이 새 행의 누적값만 계산하여 합친다.
+
+범위(scope)별 키:
+    all    전체 ('all')
+    grade  품질 (p_spec)
+    plant  공장 (factory_desc)
+    month  생산 월 (create_date 의 YYYY-MM)
+
+누적값:
+    - stats_moments: (scope, key, column) 별 개수/평균/편차제곱합(m2)/최소/최대
+      Welford 방식의 병렬 병합(Chan 공식)으로 합치므로 새 행 묶음만 계산하면 된다.
+    - stats_sketch : (scope, key, column) 별 로그 구간(상대오차 SKETCH_RELATIVE_ACCURACY) 개수
+      구간 번호가 같으면 개수를 더하기만 하면 되는 병합 가능한 분위수 스케치로
+      중앙값/사분위수를 상대오차 이내로 추정한다 (최소/최대 범위로 잘라냄).
+    - stats_batches: 위 두 테이블에 반영된 수집 batch id (coil_store part 파일 이름)
+      두 테이블을 쓴 뒤 마지막에 교체하므로, 저장소에 있는데 여기에 없는 batch 는
+      반영 도중 중단된 수집이다. 그때는 저장된 filtered 행으로 다시 계산한다.
+
+테이블 크기는 (키 수 × 컬럼 수 × 구간 수)로 정해지고 누적 행 수와는 무관하므로,
+갱신 비용은 새 행 수에 비례하고 조회는 테이블만 읽는다.
+
+사용법:
+    uv run online_stats.py                  # 전체 측정값 분포
+    uv run online_stats.py grade --top 10   # 상위 품질별 통계
+    uv run online_stats.py --rebuild        # filtered 데이터셋 전체로 다시 계산
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from coil_store import STORE_DIR, read_dataset, read_table, stored_batches, write_table
+
+# 누적 통계 대상 측정값
+STATS_COLUMNS = ['pcm', 'ceq', 'hardness', 'i_ys', 'ys2_stress', 'i_ts', 'ts_stress', 'p_thick_mm']
+
+# 범위별 키 컬럼 (month 는 create_date 에서 계산)
+SCOPES = {'all': None, 'grade': 'p_spec', 'plant': 'factory_desc', 'month': 'create_date'}
+
+# 집계 테이블 이름
+MOMENTS_TABLE = 'stats_moments'
+SKETCH_TABLE = 'stats_sketch'
+BATCHES_TABLE = 'stats_batches'
+
+# 분위수 스케치의 상대오차 (0.2% → 항복강도 470MPa 에서 약 ±1MPa)
+SKETCH_RELATIVE_ACCURACY = 0.002
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+
+# 이 값보다 절댓값이 작으면 0 구간으로 취급
+_MIN_ABS_VALUE = 1e-9
+
+_GROUP_KEYS = ['scope', 'key', 'column']
+
+
+def sketch_buckets(values):
+    """값 → (부호, 로그 구간 번호)"""
+    signs = np.sign(values).astype('int8')
+    magnitude = np.abs(values)
+    small = magnitude < _MIN_ABS_VALUE
+    signs[small] = 0
+    buckets = np.zeros(len(values), dtype='int32')
+    buckets[~small] = np.ceil(np.log(magnitude[~small]) / _LOG_GAMMA).astype('int32')
+    return signs, buckets
+
+
+def bucket_values(signs, buckets):
+    """구간 대표값 (구간 안의 어떤 값과도 상대오차 SKETCH_RELATIVE_ACCURACY 이내)"""
+    return signs * 2 * _GAMMA ** buckets.astype('float64') / (_GAMMA + 1)
+
+
+def scope_codes(data, scope):
+    """
+    행별 범위 키를 정수 코드로 변환
+    Returns:
+        (코드 배열(키가 없으면 -1), 키 이름 배열) 또는 컬럼이 없으면 None
+    """
+    if scope == 'all':
+        return np.zeros(len(data), dtype='int64'), np.array(['all'], dtype=object)
+    source = SCOPES[scope]
+    if source not in data.columns:
+        return None
+    if scope == 'month':
+        # 월 문자열은 고유값에만 만든다 (행마다 strftime 하면 느림)
+        dates = pd.to_datetime(data[source], errors='coerce')
+        codes, months = pd.factorize(dates.dt.year * 100 + dates.dt.month)
+        return codes, np.array([f"{int(month) // 100}-{int(month) % 100:02d}" for month in months], dtype=object)
+    codes, uniques = pd.factorize(data[source].astype('string'))
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def scope_accumulate(values, columns, codes, labels, scope):
+    """
+    범위 하나의 누적값: 정수 키 코드로 모든 측정값을 함께 집계
+    Args:
+        values: (행 수 × 측정값 수) float 배열
+        columns: 측정값 컬럼 이름
+        codes, labels: scope_codes() 결과
+    Returns:
+        (moments, sketch)
+    """
+    valid = codes >= 0
+    codes, values = codes[valid], values[valid]
+
+    # 개수/평균/m2/최소/최대 (키 × 측정값)
+    grouped = pd.DataFrame(values, columns=columns).groupby(codes, sort=False)
+    stats = {name: grouped.agg(name) for name in ['count', 'mean', 'min', 'max']}
+    stats['m2'] = grouped.var(ddof=0) * stats['count']
+    moments = pd.DataFrame({name: table.stack() for name, table in stats.items()})
+    moments = moments[moments['count'] > 0].reset_index(names=['key', 'column'])
+    moments['key'] = labels[moments['key'].to_numpy()]
+
+    # 로그 구간별 개수 (키 × 측정값 × 부호 × 구간): 네 값을 정수 하나로 묶어 해시로 집계
+    flat = values.ravel()
+    keep = ~np.isnan(flat)
+    signs, buckets = sketch_buckets(flat[keep])
+    cell_keys = np.repeat(codes.astype('int64'), len(columns))[keep]
+    cell_columns = np.tile(np.arange(len(columns), dtype='int64'), len(codes))[keep]
+    lowest = int(buckets.min()) if len(buckets) else 0
+    span = (int(buckets.max()) - lowest + 1) if len(buckets) else 1
+    cells = ((cell_keys * len(columns) + cell_columns) * 3 + (signs.astype('int64') + 1)) * span + (buckets - lowest)
+    counts = pd.Series(cells).value_counts(sort=False)
+    cell, bucket = np.divmod(counts.index.to_numpy(), span)
+    cell, sign = np.divmod(cell, 3)
+    key, column = np.divmod(cell, len(columns))
+    sketch = pd.DataFrame({
+        'key': labels[key],
+        'column': np.asarray(columns, dtype=object)[column],
+        'sign': (sign - 1).astype('int8'),
+        'bucket': (bucket + lowest).astype('int32'),
+        'count': counts.to_numpy(),
+    })
+
+    moments.insert(0, 'scope', scope)
+    sketch.insert(0, 'scope', scope)
+    return moments[_GROUP_KEYS + ['count', 'mean', 'm2', 'min', 'max']], sketch
+
+
+def accumulate(data):
+    """
+    DataFrame 행 묶음의 누적값 (moments, sketch)
+    새 행 묶음에만 쓰므로 비용은 새 행 수에 비례
+    """
+    columns = [col for col in STATS_COLUMNS if col in data.columns]
+    if not columns or len(data) == 0:
+        return None, None
+    values = np.column_stack([pd.to_numeric(data[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+                              for col in columns])
+
+    moment_frames, sketch_frames = [], []
+    for scope in SCOPES:
+        scope_keys = scope_codes(data, scope)
+        if scope_keys is None:
+            continue
+        moments, sketch = scope_accumulate(values, columns, *scope_keys, scope)
+        moment_frames.append(moments)
+        sketch_frames.append(sketch)
+    moments = pd.concat(moment_frames, ignore_index=True)
+    if len(moments) == 0:
+        return None, None
+    return moments, pd.concat(sketch_frames, ignore_index=True)
+
+
+def combine_moments(frames):
+    """
+    누적값 여러 개를 병합 (Chan 등의 병렬 분산 공식)
+        n = Σnᵢ, mean = Σnᵢ·meanᵢ / n, m2 = Σ(m2ᵢ + nᵢ·(meanᵢ - mean)²)
+    """
+    frames = [frame for frame in frames if frame is not None and len(frame) > 0]
+    if not frames:
+        return None
+    stacked = pd.concat(frames, ignore_index=True)
+    stacked['weighted'] = stacked['count'] * stacked['mean']
+    grouped = stacked.groupby(_GROUP_KEYS, sort=True)
+    combined = grouped.agg(count=('count', 'sum'), weighted=('weighted', 'sum'), min=('min', 'min'), max=('max', 'max'))
+    combined['mean'] = combined['weighted'] / combined['count']
+
+    pooled_mean = combined['mean'].reindex(pd.MultiIndex.from_frame(stacked[_GROUP_KEYS])).to_numpy()
+    stacked['spread'] = stacked['m2'] + stacked['count'] * (stacked['mean'] - pooled_mean) ** 2
+    combined['m2'] = stacked.groupby(_GROUP_KEYS, sort=True)['spread'].sum()
+    return combined.reset_index()[_GROUP_KEYS + ['count', 'mean', 'm2', 'min', 'max']]
+
+
+def combine_sketches(frames):
+    """스케치 여러 개를 병합 (같은 구간의 개수를 더함)"""
+    frames = [frame for frame in frames if frame is not None and len(frame) > 0]
+    if not frames:
+        return None
+    stacked = pd.concat(frames, ignore_index=True)
+    return stacked.groupby(_GROUP_KEYS + ['sign', 'bucket'], sort=True)['count'].sum().reset_index()
+
+
+def _write_stats(moments, sketch, batches, store_dir):
+    """누적값 저장 (반영된 batch 목록을 마지막에 써서 중단되면 다음 갱신이 다시 계산하게 함)"""
+    write_table(moments, MOMENTS_TABLE, store_dir)
+    write_table(sketch, SKETCH_TABLE, store_dir)
+    write_table(pd.DataFrame({'batch_id': sorted(batches)}, dtype='string'), BATCHES_TABLE, store_dir)
+
+
+def applied_batches(store_dir=STORE_DIR):
+    """누적값에 반영된 수집 batch id 집합 (기록이 없으면 None)"""
+    batches = read_table(BATCHES_TABLE, store_dir)
+    if batches is None:
+        return None
+    return set(batches['batch_id'].astype(str))
+
+
+def rebuild_stats(store_dir=STORE_DIR):
+    """filtered 데이터셋 전체로 누적값을 다시 계산 (처음 한 번 또는 복구용)"""
+    # 읽기 전에 batch 목록을 잡아 두어야 읽는 도중 추가된 batch 를 반영된 것으로 기록하지 않는다
+    batches = stored_batches('raw', store_dir) | stored_batches('filtered', store_dir)
+    columns = ['p_spec', 'factory_desc', 'create_date'] + STATS_COLUMNS
+    data = read_dataset('filtered', store_dir, columns=columns)
+    moments, sketch = accumulate(data)
+    if moments is not None:
+        _write_stats(moments, sketch, batches, store_dir)
+    return moments, sketch
+
+
+def update_stats(delta, store_dir=STORE_DIR, batch_id=None):
+    """
+    새 행 묶음의 누적값만 계산하여 저장된 누적값과 병합
+    누적값 테이블이 아직 없거나, 반영되지 않은 batch 가 filtered 에 남아 있으면
+    (이전 수집이 filtered 추가와 누적값 저장 사이에서 중단됨) filtered 데이터셋 전체로 다시 계산한다.
+    새 행을 filtered 에 추가한 뒤 호출해야 하며, 이미 반영된 batch_id 는 다시 더하지 않는다.
+    Args:
+        delta: 새 행 DataFrame
+        batch_id: delta 의 수집 batch id (coil_store.append_part 에 넘긴 값)
+    Returns:
+        (moments, sketch) 병합 결과
+    """
+    moments, sketch = read_table(MOMENTS_TABLE, store_dir), read_table(SKETCH_TABLE, store_dir)
+    applied = applied_batches(store_dir)
+    if moments is None or sketch is None or applied is None:
+        return rebuild_stats(store_dir)
+    if batch_id is not None and batch_id in applied:
+        return moments, sketch
+
+    missing = stored_batches('filtered', store_dir) - applied - {batch_id}
+    if missing:
+        print(f"⚠️ 누적 통계에 반영되지 않은 batch {len(missing)}개 → filtered 데이터셋으로 다시 계산")
+        return rebuild_stats(store_dir)
+
+    delta_moments, delta_sketch = accumulate(delta)
+    if delta_moments is not None:
+        moments = combine_moments([moments, delta_moments])
+        sketch = combine_sketches([sketch, delta_sketch])
+    if batch_id is not None:
+        applied.add(batch_id)
+    _write_stats(moments, sketch, applied, store_dir)
+    return moments, sketch
+
+
+def sketch_quantiles(sketch, quantiles):
+    """
+    스케치에서 (key, column) 별 분위수 추정
+    Returns:
+        DataFrame (index: key, column / 컬럼: '25%' 등)
+    """
+    sketch = sketch.assign(value=bucket_values(sketch['sign'].to_numpy(), sketch['bucket'].to_numpy()))
+    sketch = sketch.sort_values(['key', 'column', 'value'])
+    grouped = sketch.groupby(['key', 'column'], sort=False)['count']
+    cumulative = grouped.cumsum()
+    total = grouped.transform('sum')
+
+    def nth_value(rank):
+        # 정렬된 값에서 rank 번째 값이 들어 있는 구간의 대표값
+        return sketch[cumulative > rank].groupby(['key', 'column'], sort=False)['value'].first()
+
+    result = {}
+    for q in quantiles:
+        # pandas 와 같이 q·(n-1) 위치의 앞뒤 값을 선형 보간
+        position = q * (total - 1)
+        lower, upper = np.floor(position), np.ceil(position)
+        fraction = (position - lower).groupby([sketch['key'], sketch['column']], sort=False).first()
+        low_values, high_values = nth_value(lower), nth_value(upper)
+        result[f"{q * 100:g}%"] = low_values + (high_values - low_values) * fraction
+    return pd.DataFrame(result)
+
+
+def summary(scope='all', store_dir=STORE_DIR, keys=None, columns=None, quantiles=(0.25, 0.5, 0.75)):
+    """
+    누적값에서 통계표 계산 (테이블만 읽음)
+    Args:
+        scope: 'all' / 'grade' / 'plant' / 'month'
+        keys: 조회할 키 목록 (None 이면 전체)
+        columns: 조회할 측정값 목록 (None 이면 전체)
+        quantiles: 스케치로 추정할 분위수
+    Returns:
+        DataFrame (index: key, column / 컬럼: count, mean, std, min, max, 분위수) 또는 None
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"알 수 없는 범위: {scope} (가능: {list(SCOPES)})")
+    moments, sketch = read_table(MOMENTS_TABLE, store_dir), read_table(SKETCH_TABLE, store_dir)
+    if moments is None or sketch is None:
+        return None
+
+    def select(table):
+        mask = table['scope'] == scope
+        if keys is not None:
+            mask &= table['key'].isin([str(key) for key in keys])
+        if columns is not None:
+            mask &= table['column'].isin(columns)
+        return table[mask]
+
+    moments = select(moments).set_index(['key', 'column']).sort_index(level='key', sort_remaining=False)
+    table = moments[['count', 'mean']].copy()
+    table['std'] = np.sqrt(moments['m2'] / (moments['count'] - 1)).where(moments['count'] > 1)
+    table[['min', 'max']] = moments[['min', 'max']]
+
+    estimates = sketch_quantiles(select(sketch), quantiles).reindex(table.index)
+    for name in estimates.columns:
+        table[name] = estimates[name].clip(lower=table['min'], upper=table['max'])
+    table['count'] = table['count'].astype(int)
+    return table
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='누적 측정값 통계 조회')
+    parser.add_argument('scope', nargs='?', default='all', choices=list(SCOPES), help='통계 범위')
+    parser.add_argument('--top', type=int, default=None, help='개수가 많은 상위 키만 출력')
+    parser.add_argument('--column', action='append', default=None, help='측정값 컬럼 (여러 번 지정 가능)')
+    parser.add_argument('--rebuild', action='store_true', help='filtered 데이터셋 전체로 다시 계산')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        start = time.perf_counter()
+        moments, _ = rebuild_stats()
+        if moments is None:
+            print("❌ 저장소에 filtered 데이터가 없습니다.")
+            return
+        print(f"🔄 누적 통계 재계산 완료: {len(moments):,}개 항목, {time.perf_counter() - start:.2f}초")
+
+    table = summary(args.scope, columns=args.column)
+    if table is None or len(table) == 0:
+        print("❌ 누적 통계가 없습니다. 먼저 coil_ingest.py 로 수집하거나 --rebuild 하세요.")
+        return
+    if args.top is not None:
+        sizes = table.groupby(level='key')['count'].max().sort_values(ascending=False)
+        table = table.loc[sizes.head(args.top).index]
+    print(f"📊 누적 측정값 통계 ({args.scope}):")
+    print(table.to_string(float_format='{:.3f}'.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중경1공장 분석 파이프라인 (의존성 그래프 + 단계별 메모이제이션)
+
+각 단계는 입력 파일과 출력 파일을 선언하고, 출력 → 입력 관계로 실행 순서를 정한다.
+단계의 지문(fingerprint)은 다음으로 계산한다.
+    - 단계를 구현하는 함수의 소스 코드 (예: create_ys2_stress_stripplot)와, 그 함수가
+      호출/참조하는 프로젝트 모듈의 최상위 함수·클래스·상수 소스 (모듈 안팎으로 따라감)
+    - 입력 파일들의 내용 해시
+    - 단계 파라미터
+지문이 지난 실행과 같고 출력 파일이 모두 있으면 그 단계는 건너뛴다.
+차트 함수 한 줄을 고치면 그 차트 단계의 지문만 바뀌므로 그 차트만 다시 그린다.
+차트 함수가 쓰는 보조 함수(예: create_ys2_vs_iys_plot → analyze_ys2_vs_iys_correlation)를
+고쳐도 그 함수를 참조하는 단계의 지문이 바뀐다.
+chart_specs.toml 명세로 그리는 차트는 자기 명세 항목을 파라미터로, 렌더러(chart_spec.py)를
+입력으로 가지므로 명세 항목 하나를 고치면 그 차트만 다시 그린다.
+
+단계 사이의 중간 결과(YS2 범위 필터링, X52 추출, 차이값 계산)는 .pipeline_cache/ 에
+Parquet 으로 저장한다.
+
+사용법:
+    uv run pipeline.py                            # 오래된 단계만 실행
+    uv run pipeline.py ys2_minus_iys_stripplot    # 지정 단계와 필요한 상위 단계만
+    uv run pipeline.py --force                    # 모든 단계 강제 실행
+    uv run pipeline.py --list                     # 단계별 상태 확인
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import time
+from datetime import datetime
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+import matplotlib
+
+from coil_columns import required_columns
+from coil_dataset import file_content_hash, load_dataset
+from headless import enable_headless, measure_chart
+from render_tier import set_render_tier
+
+enable_headless()  # 파이프라인은 화면 없이 파일로만 저장
+set_render_tier('final')  # 단계 산출물은 항상 최종 품질 (COIL_RENDER_TIER 무시)
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# 중간 결과와 실행 상태 저장 폴더
+PIPELINE_CACHE_DIR = PROJECT_DIR / '.pipeline_cache'
+STATE_FILE = PIPELINE_CACHE_DIR / 'state.json'
+
+# 단계 간 데이터 파일
+RAW_EXPORT_FILE = './첫시도/joined_coil_jiwoong.xlsx'
+JG1_FILES = ['중경1공장_데이터.xlsx', '중경1공장_데이터.parquet']
+FILTERED_FILE = '중경1공장_데이터_필터링완료.parquet'
+YS2_RANGE_FILE = str(PIPELINE_CACHE_DIR / 'ys2_stress_range.parquet')
+X52_FILE = str(PIPELINE_CACHE_DIR / 'x52_grades.parquet')
+YS2_MINUS_IYS_FILE = str(PIPELINE_CACHE_DIR / 'ys2_minus_iys.parquet')
+TS_MINUS_ITS_FILE = str(PIPELINE_CACHE_DIR / 'ts_minus_its.parquet')
+
+# 명세(chart_specs.toml) 기반 차트의 렌더러 (차트 함수 소스 대신 지문에 포함)
+CHART_SPEC_RENDERER = 'chart_spec.py'
+
+# stripplot 차트가 공통으로 쓰는 점 렌더러 (점/밀도 구간화)
+STRIP_RENDERER = 'strip_render.py'
+
+# stripplot 차트가 공통으로 쓰는 품질별 통계 계산
+GROUP_STATS = 'group_stats.py'
+
+# 회귀 차트가 쓰는 그룹별 회귀 계산
+GROUP_REGRESSION = 'group_regression.py'
+
+
+class Stage:
+    """파이프라인 단계 (입력/출력 파일과 구현 함수 선언)"""
+
+    def __init__(self, name, module, func, inputs, outputs, run, params=None):
+        self.name = name
+        self.module = module      # 구현 함수가 있는 모듈명
+        self.func = func          # 지문에 소스가 포함되는 구현 함수명 (참조하는 함수/상수 포함)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.run = run            # run(stage) 형태로 단계를 실행하는 함수
+        self.params = params or {}
+
+    def load_func(self):
+        """구현 함수 import (실행할 때만 모듈을 불러옴)"""
+        return getattr(importlib.import_module(self.module), self.func)
+
+
+# 모듈별 (소스, 최상위 정의, import 매핑) 파싱 결과
+_definitions_cache = {}
+
+
+def _project_module_exists(module):
+    """프로젝트 폴더에 있는 모듈인지 확인 (외부 패키지는 지문에서 제외)"""
+    return (PROJECT_DIR / f"{module}.py").exists()
+
+
+def _import_aliases(nodes):
+    """
+    import 문에서 프로젝트 모듈 이름 매핑
+    Returns:
+        ({별칭: (모듈, 이름)} from-import, {별칭: 모듈} 모듈 import)
+    """
+    names, modules = {}, {}
+    for node in nodes:
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module and _project_module_exists(node.module):
+            for alias in node.names:
+                names[alias.asname or alias.name] = (node.module, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if _project_module_exists(alias.name):
+                    modules[alias.asname or alias.name] = alias.name
+    return names, modules
+
+
+def _module_definitions(module):
+    """
+    모듈의 최상위 정의 (모듈을 import 하지 않고 소스만 파싱, 소스가 같으면 파싱 결과 재사용)
+    Returns:
+        ({이름: (소스, AST 노드)}, from-import 매핑, 모듈 import 매핑)
+    """
+    source = (PROJECT_DIR / f"{module}.py").read_text(encoding='utf-8')
+    cached = _definitions_cache.get(module)
+    if cached is None or cached[0] != source:
+        tree = ast.parse(source)
+        definitions = {}
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                definitions[node.name] = (ast.get_source_segment(source, node), node)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    for name in ast.walk(target):
+                        if isinstance(name, ast.Name):
+                            definitions[name.id] = (ast.get_source_segment(source, node), node)
+        _definitions_cache[module] = (source, definitions, *_import_aliases(tree.body))
+    return _definitions_cache[module][1:]
+
+
+def function_source(module, func):
+    """모듈 파일에서 함수 소스만 추출 (모듈을 import 하지 않음)"""
+    definitions, _, _ = _module_definitions(module)
+    if func not in definitions or not isinstance(definitions[func][1], (ast.FunctionDef, ast.AsyncFunctionDef)):
+        raise ValueError(f"{module}.py 에 {func} 함수가 없습니다.")
+    return definitions[func][0]
+
+
+def referenced_sources(module, func):
+    """
+    함수와, 그 함수가 전이적으로 참조하는 프로젝트 모듈 최상위 정의의 소스
+    같은 모듈의 함수/상수, from-import 한 프로젝트 함수, 모듈.함수 형태 참조를 따라간다.
+    Returns:
+        {'모듈.이름': 소스}
+    """
+    function_source(module, func)  # 구현 함수가 없으면 ValueError
+    sources = {}
+    pending = [(module, func)]
+    while pending:
+        current_module, name = pending.pop()
+        key = f"{current_module}.{name}"
+        if key in sources:
+            continue
+        definitions, names, modules = _module_definitions(current_module)
+        if name not in definitions:
+            continue
+        source, node = definitions[name]
+        sources[key] = source
+
+        # 함수 안의 지역 import 도 반영
+        local_names, local_modules = _import_aliases(ast.walk(node))
+        names, modules = {**names, **local_names}, {**modules, **local_modules}
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                if child.id in definitions:
+                    pending.append((current_module, child.id))
+                elif child.id in names:
+                    pending.append(names[child.id])
+            elif isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name) and child.value.id in modules:
+                pending.append((modules[child.value.id], child.attr))
+    return dict(sorted(sources.items()))
+
+
+def input_hashes(stage):
+    """입력 파일별 내용 해시 (없는 파일은 None)"""
+    return {path: file_content_hash(path) if os.path.exists(path) else None for path in stage.inputs}
+
+
+def stage_fingerprint(stage):
+    """
+    단계 지문 계산
+    구현 함수와 실행 래퍼(_run_*)가 각각 전이적으로 참조하는 프로젝트 함수/상수 소스
+    (referenced_sources), 파라미터, 입력 내용 해시를 합쳐 해시한다.
+    """
+    payload = {
+        'source': referenced_sources(stage.module, stage.func),
+        'runner': referenced_sources(Path(inspect.getsourcefile(stage.run)).stem, stage.run.__name__),
+        'params': stage.params,
+        'inputs': input_hashes(stage),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def load_state():
+    """지난 실행 상태 로드"""
+    if not STATE_FILE.exists():
+        return {}
+    try:
+        return json.loads(STATE_FILE.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state):
+    """실행 상태 저장 (임시 파일에 쓴 뒤 교체)"""
+    PIPELINE_CACHE_DIR.mkdir(exist_ok=True)
+    tmp_file = STATE_FILE.with_suffix('.json.tmp')
+    tmp_file.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_file, STATE_FILE)
+
+
+# ---------------------------------------------------------------------------
+# 단계 실행 함수
+# ---------------------------------------------------------------------------
+
+_font_ready = False
+
+
+def _setup_font_once():
+    """차트 단계에서 한글 폰트를 한 번만 설정"""
+    global _font_ready
+    if not _font_ready:
+        from korean_font import setup_korean_font
+        matplotlib.rcdefaults()
+        setup_korean_font(font_size=10)
+        _font_ready = True
+
+
+def _save_frame(data, path):
+    """중간 결과 DataFrame 저장"""
+    from coil_export import write_parquet
+    if data is None:
+        raise RuntimeError("단계 결과가 없습니다.")
+    PIPELINE_CACHE_DIR.mkdir(exist_ok=True)
+    write_parquet(data, path)
+
+
+def _render(func, *args):
+    """차트 함수 실행 후 figure 정리, peak RSS 출력"""
+    _setup_font_once()
+    with measure_chart(func.__name__):
+        if func(*args) is None:
+            raise RuntimeError("그래프 생성 실패")
+
+
+def _run_extract(stage):
+    if stage.load_func()() is None:
+        raise RuntimeError("중경1공장 데이터 추출 실패")
+
+
+def _run_filter_zero_values(stage):
+    if stage.load_func()() is None:
+        raise RuntimeError("0값 필터링 실패")
+
+
+def _run_filter_ys2_stress_range(stage):
+    data = load_dataset(stage.inputs[0], columns=required_columns('x52_ys2_stress_filtered_stripplot'), verbose=False)
+    _save_frame(stage.load_func()(data, **stage.params), stage.outputs[0])
+
+
+def _run_frame_step(stage):
+    _save_frame(stage.load_func()(load_dataset(stage.inputs[0], verbose=False)), stage.outputs[0])
+
+
+def _run_difference(stage):
+    data = load_dataset(stage.inputs[0], columns=required_columns(stage.params['columns']), verbose=False)
+    _save_frame(stage.load_func()(data), stage.outputs[0])
+
+
+def _run_chart(stage):
+    columns = required_columns(stage.params['columns']) if 'columns' in stage.params else None
+    _render(stage.load_func(), load_dataset(stage.inputs[0], columns=columns, verbose=False))
+
+
+def _run_thickness_chart(stage):
+    from quality_thickness_stripplot import get_top_qualities, identify_thickness_column
+    data = load_dataset(stage.inputs[0], columns=required_columns('quality_thickness_stripplot'), verbose=False)
+    thickness_col = identify_thickness_column(data)
+    top_qualities = get_top_qualities(data, 'p_spec', top_n=stage.params['top_n'])
+    _render(stage.load_func(), data, 'p_spec', thickness_col, top_qualities)
+
+
+def build_stages():
+    """파이프라인 단계 목록 (순서는 표시용, 실행 순서는 입출력 관계로 결정)"""
+    from chart_spec import load_specs
+    specs, _ = load_specs()
+
+    return [
+        Stage('extract', 'extract_jg1_data', 'extract_jg1_data',
+              inputs=[RAW_EXPORT_FILE], outputs=['중경1공장_데이터.parquet'], run=_run_extract),
+        Stage('filter_zero_values', 'filter_jg1_data', 'filter_zero_values',
+              inputs=JG1_FILES, outputs=[FILTERED_FILE], run=_run_filter_zero_values),
+        Stage('filter_ys2_stress_range', 'x52_ys2_stress_filtered_stripplot', 'filter_ys2_stress_range',
+              inputs=[FILTERED_FILE], outputs=[YS2_RANGE_FILE], run=_run_filter_ys2_stress_range,
+              params={'min_ys2': 360, 'max_ys2': 530}),
+        Stage('filter_x52_grades', 'x52_ys2_stress_filtered_stripplot', 'filter_x52_grades',
+              inputs=[YS2_RANGE_FILE], outputs=[X52_FILE], run=_run_frame_step),
+        Stage('calculate_ys2_minus_iys_difference', 'ys2_minus_iys_stripplot', 'calculate_ys2_minus_iys_difference',
+              inputs=[FILTERED_FILE], outputs=[YS2_MINUS_IYS_FILE], run=_run_difference,
+              params={'columns': 'ys2_minus_iys_stripplot'}),
+        Stage('calculate_ts_minus_its_difference', 'ts_stress_minus_its_stripplot', 'calculate_ts_minus_its_difference',
+              inputs=[FILTERED_FILE], outputs=[TS_MINUS_ITS_FILE], run=_run_difference,
+              params={'columns': 'ts_stress_minus_its_stripplot'}),
+        Stage('ys2_stress_stripplot', 'ys2_stress_stripplot', 'create_ys2_stress_stripplot',
+              inputs=[FILTERED_FILE, CHART_SPEC_RENDERER, STRIP_RENDERER, GROUP_STATS],
+              outputs=['중경1공장_상위5개품질_YS2_STRESS분포_stripplot.png'],
+              run=_run_chart, params={'columns': 'ys2_stress_stripplot', 'spec': specs['ys2_stress_stripplot']}),
+        Stage('ys2_minus_iys_stripplot', 'ys2_minus_iys_stripplot', 'create_ys2_minus_iys_stripplot',
+              inputs=[YS2_MINUS_IYS_FILE, CHART_SPEC_RENDERER, STRIP_RENDERER, GROUP_STATS],
+              outputs=['중경1공장_상위5개품질_YS2_STRESS_minus_I_YS_차이값_stripplot.png'],
+              run=_run_chart, params={'spec': specs['ys2_minus_iys_stripplot']}),
+        Stage('ts_stress_minus_its_stripplot', 'ts_stress_minus_its_stripplot', 'create_ts_minus_its_stripplot',
+              inputs=[TS_MINUS_ITS_FILE, CHART_SPEC_RENDERER, STRIP_RENDERER, GROUP_STATS],
+              outputs=['중경1공장_상위5개품질_TS_STRESS_minus_I_TS_차이값_stripplot.png'],
+              run=_run_chart, params={'spec': specs['ts_stress_minus_its_stripplot']}),
+        Stage('x52_ys2_stress_stripplot', 'x52_ys2_stress_filtered_stripplot', 'create_x52_ys2_stress_stripplot',
+              inputs=[X52_FILE, CHART_SPEC_RENDERER, STRIP_RENDERER, GROUP_STATS],
+              outputs=['중경1공장_X52계열_YS2_STRESS_360-530MPa_필터링_stripplot.png'],
+              run=_run_chart, params={'spec': specs['x52_ys2_stress_stripplot']}),
+        Stage('quality_thickness_stripplot', 'quality_thickness_stripplot', 'create_thickness_stripplot',
+              inputs=[FILTERED_FILE, STRIP_RENDERER, GROUP_STATS], outputs=['중경1공장_상위5개품질_두께분포_stripplot.png'],
+              run=_run_thickness_chart, params={'top_n': 5}),
+        Stage('quality_thickness_stripplot_fixed', 'create_stripplot_fixed', 'create_quality_thickness_stripplot',
+              inputs=[FILTERED_FILE, STRIP_RENDERER, GROUP_STATS], outputs=['중경1공장_상위5개품질_두께분포_stripplot_한글수정.png'],
+              run=_run_chart, params={'columns': 'quality_thickness_stripplot'}),
+        Stage('ys2_stress_vs_i_ys_plot', 'ys2_stress_vs_i_ys_plot', 'create_ys2_vs_iys_plot',
+              inputs=[FILTERED_FILE, GROUP_REGRESSION], outputs=['중경1공장_YS2_STRESS_vs_I_YS_관계분석.png'],
+              run=_run_chart, params={'columns': 'ys2_stress_vs_i_ys_plot'}),
+    ]
+
+
+def dependency_graph(stages):
+    """단계별 상위 단계 집합 (다른 단계의 출력을 입력으로 쓰면 의존)"""
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            producers[path] = stage.name
+    return {
+        stage.name: {producers[path] for path in stage.inputs if path in producers and producers[path] != stage.name}
+        for stage in stages
+    }
+
+
+def select_stages(stages, targets=None):
+    """실행할 단계 (지정 단계와 모든 상위 단계), 의존 순서로 정렬"""
+    graph = dependency_graph(stages)
+    by_name = {stage.name: stage for stage in stages}
+
+    if targets:
+        unknown = [name for name in targets if name not in by_name]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {unknown} (가능: {list(by_name)})")
+        wanted = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(graph[name])
+    else:
+        wanted = set(by_name)
+
+    # 동시에 실행 가능한 단계는 선언 순서대로
+    position = {stage.name: i for i, stage in enumerate(stages)}
+    sorter = TopologicalSorter({name: graph[name] & wanted for name in wanted})
+    sorter.prepare()
+    order = []
+    while sorter.is_active():
+        ready = sorted(sorter.get_ready(), key=position.get)
+        order.extend(ready)
+        sorter.done(*ready)
+    return [by_name[name] for name in order]
+
+
+def missing_data_inputs(stage):
+    """
+    없는 데이터 입력 (소스 파일 .py 는 제외)
+    한 단계에 이름이 같고 확장자만 다른 입력(JG1_FILES 의 xlsx/Parquet)은 같은 데이터의 다른 형식이므로
+    하나라도 있으면 있는 것으로 본다.
+    """
+    formats = {}
+    for path in stage.inputs:
+        if Path(path).suffix != '.py':
+            formats.setdefault(str(Path(path).with_suffix('')), []).append(path)
+    return [path for paths in formats.values() if not any(os.path.exists(p) for p in paths) for path in paths]
+
+
+def stage_status(stage, state):
+    """단계 상태: ('최신'|'오래됨'|'입력 없음', 지문) (데이터 입력이 하나라도 없으면 '입력 없음')"""
+    if missing_data_inputs(stage):
+        return '입력 없음', None
+    fingerprint = stage_fingerprint(stage)
+    previous = state.get(stage.name, {})
+    if previous.get('fingerprint') == fingerprint and all(os.path.exists(path) for path in stage.outputs):
+        return '최신', fingerprint
+    return '오래됨', fingerprint
+
+
+def run_pipeline(targets=None, force=False):
+    """
+    오래된 단계만 의존 순서대로 실행
+    Args:
+        targets: 실행할 단계 이름 목록 (None 이면 전체)
+        force: True 면 지문과 관계없이 모두 실행
+    Returns:
+        {단계 이름: 결과('실행'|'건너뜀'|'입력 없음'|'실패')}
+    """
+    state = load_state()
+    results = {}
+
+    for stage in select_stages(build_stages(), targets):
+        # 상위 단계가 방금 출력을 바꿨을 수 있으므로 실행 직전에 지문 계산
+        status, fingerprint = stage_status(stage, state)
+
+        if status == '입력 없음':
+            print(f"⏭️ {stage.name}: 입력 파일 없음 ({', '.join(missing_data_inputs(stage))}), 건너뜀")
+            results[stage.name] = '입력 없음'
+            continue
+        if status == '최신' and not force:
+            print(f"✅ {stage.name}: 최신 상태, 건너뜀")
+            results[stage.name] = '건너뜀'
+            continue
+
+        print(f"\n▶️ {stage.name} 실행 중...")
+        start = time.perf_counter()
+        try:
+            stage.run(stage)
+            missing = [path for path in stage.outputs if not os.path.exists(path)]
+            if missing:
+                raise RuntimeError(f"출력 파일이 만들어지지 않았습니다: {missing}")
+        except Exception as e:
+            print(f"❌ {stage.name} 실패: {e}")
+            results[stage.name] = '실패'
+            state.pop(stage.name, None)
+            save_state(state)
+            continue
+
+        seconds = time.perf_counter() - start
+        state[stage.name] = {
+            'fingerprint': fingerprint,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(seconds, 3),
+        }
+        save_state(state)
+        results[stage.name] = '실행'
+        print(f"⏱️ {stage.name}: {seconds:.2f}초")
+
+    return results
+
+
+def print_status(targets=None):
+    """단계별 상태 출력"""
+    state = load_state()
+    graph = dependency_graph(build_stages())
+    print(f"\n📋 파이프라인 단계 상태:")
+    for stage in select_stages(build_stages(), targets):
+        status, _ = stage_status(stage, state)
+        upstream = ', '.join(sorted(graph[stage.name])) or '-'
+        print(f"   [{status}] {stage.name} ← {upstream}")
+
+
+def main():
+    """메인 실행 함수"""
+    print("🚀 중경1공장 분석 파이프라인")
+    print("=" * 80)
+
+    parser = argparse.ArgumentParser(description='중경1공장 분석 파이프라인')
+    parser.add_argument('targets', nargs='*', help='실행할 단계 (기본: 전체)')
+    parser.add_argument('--force', action='store_true', help='지문과 관계없이 모두 실행')
+    parser.add_argument('--list', action='store_true', help='단계별 상태만 출력')
+    args = parser.parse_args()
+
+    try:
+        if args.list:
+            print_status(args.targets)
+            return
+        results = run_pipeline(args.targets, force=args.force)
+    except Exception as e:
+        print(f"❌ 파이프라인 실행 실패: {e}")
+        return
+
+    print(f"\n📊 실행 결과:")
+    for name, result in results.items():
+        print(f"   {name}: {result}")
+    failed = [name for name, result in results.items() if result == '실패']
+    print(f"\n{'❌ 실패한 단계가 있습니다: ' + ', '.join(failed) if failed else '✅ 파이프라인 완료!'}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,94 +4,27 @@
 중경1공장 필터링된 데이터: 상위 5개 품질별 두께 stripplot 생성
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
-# 한글 폰트 설정 (확실한 방법)
-import matplotlib.font_manager as fm
-import matplotlib.pyplot as plt
-import matplotlib
-import os
-
-def setup_korean_font():
-    """한글 폰트 설정 - 더 확실한 방법"""
-    
-    # matplotlib 폰트 캐시 초기화
-    try:
-        fm._rebuild()
-        print("📝 matplotlib 폰트 캐시 초기화 완료")
-    except:
-        pass
-    
-    # 시도할 한글 폰트들 (영문명 사용)
-    korean_fonts = [
-        'Malgun Gothic',  # 맑은 고딕
-        'NanumGothic',    # 나눔고딕
-        'Gulim',          # 굴림
-        'Batang',         # 바탕
-        'HCR Dotum'       # HCR 돋움
-    ]
-    
-    font_set = False
-    for font_name in korean_fonts:
-        try:
-            # 폰트 설정 시도
-            plt.rcParams['font.family'] = font_name
-            plt.rcParams['axes.unicode_minus'] = False
-            
-            # 한글 테스트
-            fig, ax = plt.subplots(figsize=(1, 1))
-            ax.text(0.5, 0.5, '테스트', fontsize=10)
-            fig.canvas.draw()
-            plt.close(fig)
-            
-            print(f"✅ 한글 폰트 설정 성공: {font_name}")
-            font_set = True
-            break
-            
-        except Exception as e:
-            print(f"❌ {font_name} 설정 실패: {str(e)}")
-            continue
-    
-    if not font_set:
-        # 직접 폰트 파일 경로 지정
-        font_paths = [
-            "C:/Windows/Fonts/malgun.ttf",
-            "C:/Windows/Fonts/NanumGothic.otf", 
-            "C:/Windows/Fonts/gulim.ttc",
-            "C:/Windows/Fonts/batang.ttc"
-        ]
-        
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    font_prop = fm.FontProperties(fname=font_path)
-                    plt.rcParams['font.family'] = font_prop.get_name()
-                    plt.rcParams['axes.unicode_minus'] = False
-                    print(f"✅ 직접 경로로 폰트 설정 성공: {font_path}")
-                    font_set = True
-                    break
-                except Exception as e:
-                    print(f"❌ {font_path} 직접 설정 실패: {str(e)}")
-                    continue
-    
-    if not font_set:
-        print("⚠️ 모든 한글 폰트 설정 실패. 기본 설정을 사용합니다.")
-        plt.rcParams['axes.unicode_minus'] = False
-    
-    return font_set
-
-# 한글 폰트 설정 실행
-setup_korean_font()
+from artifact_cache import save_figure
+from coil_columns import required_columns
+from coil_dataset import load_dataset
+from group_stats import group_stats
+from headless import configure_headless, finish_figure
+from korean_font import setup_korean_font
+from render_tier import marker_edges
+from strip_render import draw_mean_lines, draw_strip
 
-# 시각화 스타일 설정
+# 시각화 스타일 설정 (style.use 가 폰트 설정을 초기화하므로 폰트보다 먼저)
 plt.style.use('default')
 sns.set_palette("husl")
 
+# 한글 폰트 설정
+setup_korean_font()
+
 def load_filtered_data():
     """필터링된 중경1공장 데이터 로드"""
     print("📂 필터링된 중경1공장 데이터 로드 중...")
@@ -99,7 +32,7 @@ def load_filtered_data():
     input_file = '중경1공장_데이터_필터링완료.xlsx'
     
     try:
-        data = pd.read_excel(input_file)
+        data = load_dataset(input_file, columns=required_columns('quality_thickness_stripplot'))
         print(f"✅ 데이터 로드 완료: {data.shape}")
         return data
     except FileNotFoundError:
@@ -164,42 +97,32 @@ def create_thickness_stripplot(data, quality_col, thickness_col, top_qualities):
     # 품질 순서를 데이터 개수 순으로 정렬
     quality_order = top_quality_names
     
+    # 품질별 통계 한 번 계산 (평균선과 통계 출력에서 함께 사용)
+    stats = group_stats(filtered_data, quality_col, thickness_col, order=quality_order)
+    
     # 그래프 크기 설정
     plt.figure(figsize=(14, 8))
     
     # stripplot 생성
-    ax = sns.stripplot(
-        data=filtered_data,
-        x=quality_col,
-        y=thickness_col,
-        order=quality_order,
+    ax = draw_strip(
+        plt.gca(),
+        filtered_data,
+        quality_col,
+        thickness_col,
+        quality_order,
         size=8,
         alpha=0.7,
-        jitter=True,
-        linewidth=0.5,
-        edgecolor='black'
+        stats=stats,
+        **marker_edges(linewidth=0.5, edgecolor='black')
     )
     
-    # 각 품질별 평균선 추가
-    for i, quality in enumerate(quality_order):
-        quality_data = filtered_data[filtered_data[quality_col] == quality]
-        mean_thickness = quality_data[thickness_col].mean()
-        
-        # 평균선 그리기
-        ax.hlines(
-            y=mean_thickness,
-            xmin=i-0.4,
-            xmax=i+0.4,
-            colors='red',
-            linestyles='--',
-            linewidth=2,
-            alpha=0.8
-        )
-        
-        # 평균값 텍스트 표시
+    # 각 품질별 평균선(LineCollection 하나)과 평균값 텍스트
+    draw_mean_lines(ax, stats.mean)
+    text_offset = (ax.get_ylim()[1] - ax.get_ylim()[0]) * 0.02
+    for i, mean_value in enumerate(stats.mean):
         ax.text(
-            i, mean_thickness + (ax.get_ylim()[1] - ax.get_ylim()[0]) * 0.02,
-            f'평균: {mean_thickness:.2f}',
+            i, mean_value + text_offset,
+            f'평균: {mean_value:.2f}',
             ha='center',
             va='bottom',
             fontsize=9,
@@ -258,17 +181,14 @@ def create_thickness_stripplot(data, quality_col, thickness_col, top_qualities):
     
     # 저장
     filename = '중경1공장_상위5개품질_두께분포_stripplot.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = save_figure(filename, dpi=300, bbox_inches='tight')
     print(f"💾 그래프를 '{filename}'로 저장했습니다.")
     
-    plt.show()
+    finish_figure()
     
     # 통계 정보 출력
     print(f"\n📊 품질별 두께 통계:")
-    thickness_stats = filtered_data.groupby(quality_col)[thickness_col].agg([
-        'count', 'mean', 'std', 'min', 'max'
-    ]).round(3)
-    print(thickness_stats)
+    print(stats.table(['count', 'mean', 'std', 'min', 'max'], decimals=3))
     
     return filename
 
@@ -279,27 +199,30 @@ def analyze_thickness_distribution(data, quality_col, thickness_col, top_qualiti
     top_quality_names = top_qualities.index.tolist()
     filtered_data = data[data[quality_col].isin(top_quality_names)].copy()
     
+    # 품질별 통계 한 번 계산 (품질마다 다시 걸러내지 않음)
+    stats = group_stats(filtered_data, quality_col, thickness_col, order=top_quality_names)
+    
     print(f"\n1️⃣ 전체 두께 분포:")
-    overall_stats = filtered_data[thickness_col].describe()
-    print(f"   평균: {overall_stats['mean']:.3f} mm")
-    print(f"   표준편차: {overall_stats['std']:.3f} mm")
-    print(f"   최소값: {overall_stats['min']:.3f} mm")
-    print(f"   최대값: {overall_stats['max']:.3f} mm")
-    print(f"   범위: {overall_stats['max'] - overall_stats['min']:.3f} mm")
+    overall_min, overall_max = stats.overall('min'), stats.overall('max')
+    print(f"   평균: {stats.overall('mean'):.3f} mm")
+    print(f"   표준편차: {stats.overall('std'):.3f} mm")
+    print(f"   최소값: {overall_min:.3f} mm")
+    print(f"   최대값: {overall_max:.3f} mm")
+    print(f"   범위: {overall_max - overall_min:.3f} mm")
     
     print(f"\n2️⃣ 품질별 두께 특성:")
-    for quality in top_quality_names:
-        quality_data = filtered_data[filtered_data[quality_col] == quality]
-        stats = quality_data[thickness_col].describe()
+    for i, quality in enumerate(stats.labels):
+        mean, std = stats.mean[i], stats.std[i]
         
-        print(f"\n   📋 {quality} ({len(quality_data)}개):")
-        print(f"      평균: {stats['mean']:.3f} mm")
-        print(f"      표준편차: {stats['std']:.3f} mm")
-        print(f"      범위: {stats['min']:.3f} ~ {stats['max']:.3f} mm")
-        print(f"      변동계수: {(stats['std']/stats['mean']*100):.1f}%")
+        print(f"\n   📋 {quality} ({top_qualities[quality]}개):")
+        print(f"      평균: {mean:.3f} mm")
+        print(f"      표준편차: {std:.3f} mm")
+        print(f"      범위: {stats.min[i]:.3f} ~ {stats.max[i]:.3f} mm")
+        print(f"      변동계수: {(std/mean*100):.1f}%")
 
 def main():
     """메인 실행 함수"""
+    configure_headless()
     print("🚀 중경1공장 상위 5개 품질별 두께 stripplot 생성 시작")
     print("=" * 80)
     
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중경1공장 표준 리포트 차트 일괄 생성
+
+차트 스크립트를 하나씩 실행하면 폰트 설정, 필터링 완료 데이터 로드, 상위 5개 품질 선정을
+매번 반복한다. 이 스크립트는 폰트 설정과 데이터 로드를 한 번만 하고, 상위 품질과
+차이값 컬럼, YS2 범위/X52 필터링 결과 같은 공유 집계도 한 번만 계산한 뒤
+같은 메모리 내 DataFrame 으로 모든 차트를 그린다. 화면 없이(headless) 실행하며
+차트마다 figure 를 닫고 소요 시간과 최대 RSS 를 출력한다.
+
+차트 결과물은 artifact_cache 에 (차트가 쓰는 데이터 조각, 상위 품질, 렌더러 소스) 해시로
+보관하므로, 바뀐 것이 없으면 다시 그리지 않고 저장된 PNG 를 복사한다 (--no-cache 로 끔).
+
+--workers 를 주면 차트를 작업 프로세스 풀에서 나눠 그린다. 공유 DataFrame 은
+프로세스마다 pickle 로 보내지 않고 비압축 Arrow IPC(feather) 파일로 한 번 저장한다.
+작업 프로세스는 그 파일을 memory-map 으로 연 Arrow 테이블로만 들고 있고(페이지 캐시 공유),
+차트를 그릴 때마다 그 차트가 쓰는 컬럼만 pandas 로 변환한 뒤 차트가 끝나면 버린다.
+따라서 작업 프로세스별 메모리는 전체 DataFrame 이 아니라 차트 하나의 컬럼 조각만큼 늘어난다.
+
+사용법:
+    uv run render_report.py
+    uv run render_report.py --top-n 5 --charts ys2_stress_stripplot ys2_stress_vs_i_ys_plot
+    uv run render_report.py --workers 4
+    uv run render_report.py --no-cache
+    uv run render_report.py --preview    # 저해상도 미리보기 (*_preview.png)
+"""
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+from headless import enable_headless, format_rss, measure_chart
+enable_headless()  # 리포트는 화면 없이 파일로만 저장
+import matplotlib
+import pandas as pd
+import pyarrow.feather as feather
+import seaborn as sns
+
+import artifact_cache
+from coil_columns import required_columns
+from coil_dataset import CACHE_DIR, DEFAULT_DATA_FILE, load_dataset, normalize_object_columns
+from render_tier import current_tier, set_render_tier
+
+# 리포트 차트 (이름 → 필요한 컬럼 정의 키)
+REPORT_CHARTS = {
+    'ys2_stress_stripplot': 'ys2_stress_stripplot',
+    'ys2_minus_iys_stripplot': 'ys2_minus_iys_stripplot',
+    'ts_stress_minus_its_stripplot': 'ts_stress_minus_its_stripplot',
+    'x52_ys2_stress_stripplot': 'x52_ys2_stress_filtered_stripplot',
+    'quality_thickness_stripplot': 'quality_thickness_stripplot',
+    'quality_thickness_stripplot_fixed': 'quality_thickness_stripplot',
+    'ys2_stress_vs_i_ys_plot': 'ys2_stress_vs_i_ys_plot',
+}
+
+# 차트별 렌더러 소스 파일 (결과물 캐시의 렌더러 버전)
+_SPEC_SOURCES = ['chart_spec.py', 'chart_specs.toml', 'strip_render.py', 'group_stats.py']
+CHART_SOURCES = {
+    'ys2_stress_stripplot': ['ys2_stress_stripplot.py'] + _SPEC_SOURCES,
+    'ys2_minus_iys_stripplot': ['ys2_minus_iys_stripplot.py'] + _SPEC_SOURCES,
+    'ts_stress_minus_its_stripplot': ['ts_stress_minus_its_stripplot.py'] + _SPEC_SOURCES,
+    'x52_ys2_stress_stripplot': ['x52_ys2_stress_filtered_stripplot.py'] + _SPEC_SOURCES,
+    'quality_thickness_stripplot': ['quality_thickness_stripplot.py', 'strip_render.py', 'group_stats.py'],
+    'quality_thickness_stripplot_fixed': ['create_stripplot_fixed.py', 'strip_render.py', 'group_stats.py'],
+    'ys2_stress_vs_i_ys_plot': ['ys2_stress_vs_i_ys_plot.py', 'group_regression.py'],
+}
+
+# 차트가 공유 집계에서 쓰는 DataFrame 과 그 DataFrame 에 prepare_shared 가 추가한 파생 컬럼
+CHART_FRAMES = {'x52_ys2_stress_stripplot': 'x52_data'}
+DERIVED_COLUMNS = {
+    'ys2_minus_iys_stripplot': ['ys2_minus_iys'],
+    'ts_stress_minus_its_stripplot': ['ts_minus_its'],
+}
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def report_columns(charts):
+    """선택한 차트들이 필요로 하는 컬럼의 합집합 (순서 유지)"""
+    columns = []
+    for chart in charts:
+        for col in required_columns(REPORT_CHARTS[chart]):
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def prepare_shared(data, charts, top_n=5):
+    """
+    모든 차트가 함께 쓰는 집계를 한 번만 계산
+    Returns:
+        dict: data(차이값 컬럼 추가), top_qualities, x52_data, x52_top_qualities
+    """
+    from ts_stress_minus_its_stripplot import calculate_ts_minus_its_difference
+    from ys2_minus_iys_stripplot import calculate_ys2_minus_iys_difference
+
+    shared = {'data': data, 'top_qualities': data['p_spec'].value_counts().head(top_n)}
+
+    if 'ys2_minus_iys_stripplot' in charts:
+        calculate_ys2_minus_iys_difference(data)
+    if 'ts_stress_minus_its_stripplot' in charts:
+        calculate_ts_minus_its_difference(data)
+
+    if 'x52_ys2_stress_stripplot' in charts:
+        from x52_ys2_stress_filtered_stripplot import filter_x52_grades, filter_ys2_stress_range
+        x52_data = filter_x52_grades(filter_ys2_stress_range(data, min_ys2=360, max_ys2=530))
+        shared['x52_data'] = x52_data
+        shared['x52_top_qualities'] = x52_data['p_spec'].value_counts().head(top_n)
+
+    return shared
+
+
+def _chart_renderers():
+    """차트 이름 → 공유 집계를 받아 차트를 그리는 함수"""
+    from create_stripplot_fixed import create_quality_thickness_stripplot
+    from quality_thickness_stripplot import create_thickness_stripplot
+    from ts_stress_minus_its_stripplot import create_ts_minus_its_stripplot
+    from x52_ys2_stress_filtered_stripplot import create_x52_ys2_stress_stripplot
+    from ys2_minus_iys_stripplot import create_ys2_minus_iys_stripplot
+    from ys2_stress_stripplot import create_ys2_stress_stripplot
+    from ys2_stress_vs_i_ys_plot import create_ys2_vs_iys_plot
+
+    def thickness_chart(shared):
+        # 단독 실행 시와 같은 팔레트 (quality_thickness_stripplot 모듈 설정)
+        with sns.color_palette('husl'):
+            return create_thickness_stripplot(shared['data'], 'p_spec', 'p_thick_mm', shared['top_qualities'])
+
+    return {
+        'ys2_stress_stripplot': lambda shared: create_ys2_stress_stripplot(shared['data'], shared['top_qualities']),
+        'ys2_minus_iys_stripplot': lambda shared: create_ys2_minus_iys_stripplot(shared['data'], shared['top_qualities']),
+        'ts_stress_minus_its_stripplot': lambda shared: create_ts_minus_its_stripplot(shared['data'], shared['top_qualities']),
+        'x52_ys2_stress_stripplot': lambda shared: create_x52_ys2_stress_stripplot(shared['x52_data'], shared['x52_top_qualities']),
+        'quality_thickness_stripplot': thickness_chart,
+        'quality_thickness_stripplot_fixed': lambda shared: create_quality_thickness_stripplot(shared['data'], shared['top_qualities']),
+        'ys2_stress_vs_i_ys_plot': lambda shared: create_ys2_vs_iys_plot(shared['data'], shared['top_qualities']),
+    }
+
+
+def _setup_renderers():
+    """차트 모듈 import 후 폰트 설정 (모듈 import 시의 스타일 설정을 덮어씀)"""
+    renderers = _chart_renderers()
+    from korean_font import setup_korean_font
+    matplotlib.rcdefaults()
+    setup_korean_font(font_size=10)
+    return renderers
+
+
+def _load_shared(charts, top_n, input_file):
+    """데이터 로드 및 공유 집계 (소요 시간 출력)"""
+    start = time.perf_counter()
+    data = load_dataset(input_file, columns=report_columns(charts))
+    shared = prepare_shared(data, charts, top_n)
+    print(f"\n⏱️ 데이터 로드 및 공유 집계: {time.perf_counter() - start:.2f}초")
+    return shared
+
+
+def chart_artifact_key(chart, shared):
+    """차트가 실제로 쓰는 데이터 조각 + 상위 품질 + 렌더러 소스로 결과물 키 계산"""
+    if chart == 'x52_ys2_stress_stripplot':
+        data, top_qualities = shared['x52_data'], shared['x52_top_qualities']
+    else:
+        data, top_qualities = shared['data'], shared['top_qualities']
+    columns = [col for col in required_columns(REPORT_CHARTS[chart]) if col in data.columns]
+    params = {'chart': chart, 'top_qualities': [[str(q), int(n)] for q, n in top_qualities.items()]}
+    sources = [os.path.join(PROJECT_DIR, path) for path in CHART_SOURCES[chart] + ['render_report.py']]
+    return artifact_cache.artifact_key(artifact_cache.data_fingerprint(data[columns]), params,
+                                       artifact_cache.renderer_version(sources))
+
+
+def _render_chart(renderers, chart, shared):
+    """차트 하나 생성 → (저장 파일명 또는 None, 소요 시간, peak RSS MB)"""
+    filename = None
+    with measure_chart(chart) as usage:
+        try:
+            filename, _ = artifact_cache.cached_render(chart_artifact_key(chart, shared),
+                                                       lambda: renderers[chart](shared), chart)
+        except Exception as e:
+            print(f"❌ {chart} 생성 실패: {e}")
+    return filename, usage['seconds'], usage['peak_rss_mb']
+
+
+def _check_charts(charts):
+    charts = list(charts or REPORT_CHARTS)
+    unknown = [chart for chart in charts if chart not in REPORT_CHARTS]
+    if unknown:
+        raise ValueError(f"알 수 없는 차트: {unknown} (가능: {list(REPORT_CHARTS)})")
+    return charts
+
+
+def render_report(charts=None, top_n=5, input_file=DEFAULT_DATA_FILE):
+    """
+    데이터를 한 번 로드하여 리포트 차트를 모두 생성
+    Args:
+        charts: 생성할 차트 이름 목록 (None 이면 전체)
+        top_n: 상위 품질 개수
+        input_file: 필터링 완료 데이터 파일
+    Returns:
+        {차트 이름: (저장 파일명 또는 None, 소요 시간, peak RSS MB)}
+    """
+    charts = _check_charts(charts)
+    renderers = _setup_renderers()
+    shared = _load_shared(charts, top_n, input_file)
+    return {chart: _render_chart(renderers, chart, shared) for chart in charts}
+
+
+# ---------------------------------------------------------------------------
+# 프로세스 풀 렌더링
+# ---------------------------------------------------------------------------
+
+# 작업 프로세스별 상태 (초기화 시 한 번 설정, _worker_shared 는 (Arrow 테이블 dict, 작은 값 dict))
+_worker_renderers = None
+_worker_shared = None
+
+
+def write_shared_frames(shared, directory):
+    """
+    공유 집계 중 DataFrame 은 비압축 feather 파일로 저장하고 경로로 대체
+    Returns:
+        (DataFrame 이름 → 파일 경로, 그 외 작은 값 dict)
+    """
+    frame_files, values = {}, {}
+    for name, value in shared.items():
+        if isinstance(value, pd.DataFrame):
+            path = os.path.join(directory, f"{name}.arrow")
+            feather.write_feather(normalize_object_columns(value.reset_index(drop=True)), path,
+                                  compression='uncompressed')
+            frame_files[name] = path
+        else:
+            values[name] = value
+    return frame_files, values
+
+
+def read_shared_table(path):
+    """feather 파일을 memory-map 으로 열기 (비압축이므로 컬럼 버퍼가 매핑된 파일을 그대로 가리킴)"""
+    return feather.read_table(path, memory_map=True)
+
+
+def chart_columns(chart, available):
+    """차트 하나가 쓰는 컬럼 (필요 컬럼 + 파생 컬럼 중 공유 DataFrame 에 있는 것)"""
+    wanted = required_columns(REPORT_CHARTS[chart]) + DERIVED_COLUMNS.get(chart, [])
+    return [col for col in dict.fromkeys(wanted) if col in available]
+
+
+def chart_shared(chart, tables, values):
+    """memory-map 된 Arrow 테이블에서 차트 하나가 쓰는 DataFrame 의 필요 컬럼만 pandas 로 변환"""
+    name = CHART_FRAMES.get(chart, 'data')
+    table = tables[name]
+    projected = table.select(chart_columns(chart, table.column_names))
+    return {**values, name: projected.to_pandas(split_blocks=True, self_destruct=True)}
+
+
+def _init_worker(frame_files, values, use_cache=True, tier='final'):
+    """작업 프로세스 초기화: 폰트 설정 한 번, 공유 데이터 memory-map (pandas 변환은 차트마다)"""
+    global _worker_renderers, _worker_shared
+    if not use_cache:
+        artifact_cache.disable_cache()
+    set_render_tier(tier)
+    with redirect_stdout(io.StringIO()):
+        _worker_renderers = _setup_renderers()
+    tables = {name: read_shared_table(path) for name, path in frame_files.items()}
+    _worker_shared = (tables, dict(values))
+
+
+def _render_task(chart):
+    """(작업 프로세스) 차트 하나 생성, 출력은 모아서 반환"""
+    log = io.StringIO()
+    with redirect_stdout(log):
+        shared = chart_shared(chart, *_worker_shared)
+        filename, seconds, peak_rss = _render_chart(_worker_renderers, chart, shared)
+        del shared
+    return chart, filename, seconds, peak_rss, os.getpid(), log.getvalue()
+
+
+def render_report_parallel(charts=None, top_n=5, input_file=DEFAULT_DATA_FILE, workers=None):
+    """
+    공유 데이터를 memory-map 파일로 넘겨 작업 프로세스 풀에서 차트 생성
+    Args:
+        charts: 생성할 차트 이름 목록 (None 이면 전체)
+        top_n: 상위 품질 개수
+        input_file: 필터링 완료 데이터 파일
+        workers: 작업 프로세스 수 (None 이면 CPU 코어 수)
+    Returns:
+        {차트 이름: (저장 파일명 또는 None, 소요 시간, peak RSS MB)} (차트 순서 유지)
+        peak RSS 는 차트를 그린 작업 프로세스 기준
+    """
+    charts = _check_charts(charts)
+    workers = min(workers or os.cpu_count() or 1, len(charts))
+    shared = _load_shared(charts, top_n, input_file)
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    shared_dir = tempfile.mkdtemp(prefix='render-', dir=CACHE_DIR)
+    try:
+        frame_files, values = write_shared_frames(shared, shared_dir)
+        print(f"🗂️ 공유 데이터 memory-map 파일: {', '.join(sorted(frame_files))} (작업 프로세스 {workers}개)")
+
+        outcomes = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(frame_files, values, artifact_cache.cache_enabled(), current_tier())) as executor:
+            futures = {executor.submit(_render_task, chart): chart for chart in charts}
+            for future in as_completed(futures):
+                chart = futures[future]
+                try:
+                    outcomes[chart] = future.result()
+                except Exception as e:
+                    print(f"❌ {chart} 작업 실패: {e}")
+                    outcomes[chart] = (chart, None, 0.0, None, None, '')
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    # 차트별 출력은 차트 순서대로 표시
+    results = {}
+    for chart in charts:
+        _, filename, seconds, peak_rss, pid, log = outcomes[chart]
+        print(log, end='')
+        if pid is not None:
+            print(f"   ⏱️ {chart}: {seconds:.2f}초 (프로세스 {pid})")
+        results[chart] = (filename, seconds, peak_rss)
+    return results
+
+
+def main(argv=None):
+    """메인 실행 함수"""
+    print("🚀 중경1공장 표준 리포트 차트 일괄 생성")
+    print("=" * 80)
+
+    parser = argparse.ArgumentParser(description='리포트 차트 일괄 생성')
+    parser.add_argument('--charts', nargs='*', default=None, help=f'생성할 차트 (기본: 전체) {list(REPORT_CHARTS)}')
+    parser.add_argument('--top-n', type=int, default=5, help='상위 품질 개수')
+    parser.add_argument('--workers', type=int, default=1, help='차트 생성 프로세스 수 (1 이면 현재 프로세스에서 순차 생성)')
+    parser.add_argument('--no-cache', action='store_true', help='저장된 결과물을 쓰지 않고 모두 다시 그림')
+    parser.add_argument('--preview', action='store_true', help='저해상도 미리보기 단계로 생성 (*_preview.png)')
+    args = parser.parse_args(argv)
+    if args.no_cache:
+        artifact_cache.disable_cache()
+    if args.preview:
+        set_render_tier('preview')
+
+    start = time.perf_counter()
+    try:
+        if args.workers == 1:
+            results = render_report(args.charts, top_n=args.top_n)
+        else:
+            results = render_report_parallel(args.charts, top_n=args.top_n, workers=args.workers or None)
+    except Exception as e:
+        print(f"❌ 리포트 생성 실패: {e}")
+        return
+
+    print(f"\n📊 차트별 생성 결과:")
+    for chart, (filename, seconds, peak_rss) in results.items():
+        mark = '✅' if filename else '❌'
+        print(f"   {mark} {chart}: {seconds:.2f}초, 최대 RSS {format_rss(peak_rss)} → {filename}")
+    print(f"\n✅ 리포트 생성 완료! 전체 {time.perf_counter() - start:.2f}초")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+차트 렌더링 품질 단계 (preview / final)
+
+모든 차트는 dpi=300 + bbox_inches='tight' 로 저장하므로 레이아웃을 고치며 반복해서 그리기에는
+느리다. 실행마다 품질 단계를 골라서
+    - final  : 지금과 같은 최종 결과물 (차트별 dpi, 마커 테두리 포함)
+    - preview: 60 dpi, 마커 테두리 생략, bbox_inches='tight' 생략, 빠른 PNG 압축, 파일명 끝에 _preview
+로 저장한다. bbox_inches='tight' 는 여백을 재려고 figure 를 한 번 더 그리는데, figure 크기가 고정이라
+잘라내는 여백만 다를 뿐 축과 글자의 배치는 같으므로 preview 에서는 이 단계를 건너뛴다.
+figure 크기(인치), 글자 크기(pt), 마커 크기(pt)는 그대로 두므로 두 단계의 레이아웃은 같고
+preview 는 바깥 여백이 조금 더 남고 해상도가 낮을 뿐이다. preview 파일은 최종 결과물을 덮어쓰지 않는다.
+
+선택 방법:
+    COIL_RENDER_TIER=preview uv run ys2_stress_stripplot.py
+    uv run render_report.py --preview
+    uv run chart_spec.py --preview
+"""
+
+import os
+from pathlib import Path
+
+# 품질 단계를 정하는 환경변수
+RENDER_TIER_ENV = 'COIL_RENDER_TIER'
+
+# 품질 단계별 설정 (dpi 가 None 이면 차트가 지정한 dpi 사용, tight_bbox 가 False 면 bbox_inches 무시)
+TIERS = {
+    'final': {'dpi': None, 'marker_edges': True, 'tight_bbox': True, 'compress_level': None, 'suffix': ''},
+    'preview': {'dpi': 60, 'marker_edges': False, 'tight_bbox': False, 'compress_level': 1, 'suffix': '_preview'},
+}
+
+_tier = os.environ.get(RENDER_TIER_ENV, 'final')
+if _tier not in TIERS:
+    _tier = 'final'
+
+
+def set_render_tier(name):
+    """이번 실행의 품질 단계 설정"""
+    global _tier
+    if name not in TIERS:
+        raise ValueError(f"알 수 없는 품질 단계: {name} (가능: {list(TIERS)})")
+    _tier = name
+
+
+def current_tier():
+    """현재 품질 단계 이름"""
+    return _tier
+
+
+def is_preview():
+    """미리보기 단계 여부"""
+    return _tier == 'preview'
+
+
+def tier_output(filename):
+    """품질 단계에 맞는 출력 파일명 (preview 는 확장자 앞에 _preview)"""
+    suffix = TIERS[_tier]['suffix']
+    if not suffix:
+        return filename
+    path = Path(filename)
+    return str(path.with_name(f"{path.stem}{suffix}{path.suffix}"))
+
+
+def marker_edges(linewidth=0.5, edgecolor='black'):
+    """
+    마커 테두리 인자 (preview 는 테두리 두께 0, 마커 크기는 그대로)
+    edgecolor='none' 으로 끄면 Agg 가 마커를 점마다 따로 그리므로 색은 두고 두께만 0 으로 한다.
+    """
+    if TIERS[_tier]['marker_edges']:
+        return {'linewidth': linewidth, 'edgecolor': edgecolor}
+    return {'linewidth': 0, 'edgecolor': edgecolor}
+
+
+def savefig_kwargs(**kwargs):
+    """품질 단계에 맞게 savefig 인자 조정 (dpi, bbox_inches, PNG 압축 수준)"""
+    tier = TIERS[_tier]
+    if tier['dpi'] is not None:
+        kwargs['dpi'] = tier['dpi']
+    if not tier['tight_bbox']:
+        kwargs.pop('bbox_inches', None)
+    if tier['compress_level'] is not None:
+        kwargs.setdefault('pil_kwargs', {})['compress_level'] = tier['compress_level']
+    return kwargs
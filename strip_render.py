@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대용량 품질별 strip 렌더러 (밀도 구간화)
+
+sns.stripplot 은 점마다 마커를 하나씩 그리므로 공장/연도를 합친 수십만 건의 파이프 시험
+데이터에서는 저장 시간이 점 개수에 비례해 늘어난다. 점이 많을 때는 품질별 값을 NumPy 로
+y 구간에 나눠 세고, 구간마다
+    - 가로 폭: 그 구간의 개수에 비례 (swarm 처럼 밀집한 곳이 넓게 퍼짐)
+    - 불투명도: 같은 칸에 겹친 점 수만큼 반투명 마커를 겹친 것과 같은 값 (1 - (1-alpha)^n)
+인 RGBA 이미지를 만들어 품질마다 imshow 한 번으로 그린다. 이미지 크기는 구간 수로 고정되므로
+렌더링 시간은 점 개수와 거의 무관하다. 평균선, 기준선, 글자는 기존처럼 벡터로 그린다.
+
+점이 적을 때(기본 20,000개 이하)는 점을 하나씩 그린다. sns.stripplot 은 호출마다 데이터를
+다시 묶고 팔레트와 범주형 축을 새로 만들므로, 미리 나눈 품질별 배열에 결정적(seed 고정)
+jitter 를 벡터로 더해 모든 품질을 scatter 한 번으로 그린다. 모양(색, 크기, 테두리, 흔들림 폭,
+축)은 stripplot 과 같고, 점 위치가 실행마다 같으므로 결과물 캐시와 비교도 안정적이다.
+품질별 평균선은 LineCollection 하나로 그린다 (draw_mean_lines).
+
+사용법:
+    uv run strip_render.py                            # 10k~1M 점 렌더링 시간 비교
+    uv run strip_render.py --sizes 10000 100000 --repeat 3
+    uv run strip_render.py --methods seaborn points
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from group_stats import group_stats
+
+# 이 개수를 넘으면 밀도 구간화로 그림 (method='auto')
+DENSITY_MIN_POINTS = 20_000
+
+# 밀도 이미지 해상도: y 구간 수, 품질 하나의 가로 칸 수 (홀수, 가운데 칸 기준 좌우 대칭)
+DENSITY_Y_BINS = 240
+DENSITY_X_CELLS = 41
+
+# 값이 하나뿐인 구간도 보이도록 하는 최소 가로 칸 수 (홀수)
+DENSITY_MIN_CELLS = 5
+
+# sns.stripplot(jitter=True) 의 좌우 흔들림 폭 (품질 간격 1 기준 ±0.1)
+STRIP_HALF_WIDTH = 0.1
+
+# 점 jitter 난수 seed (같은 데이터면 항상 같은 위치)
+JITTER_SEED = 0
+
+# strip 그리기 방식
+STRIP_METHODS = ('auto', 'points', 'density', 'seaborn')
+
+
+def group_arrays(data, quality_col, value_col, order):
+    """
+    order 순서의 품질별 값 배열 (group_stats 로 품질 컬럼을 한 번 factorize 하여 분리)
+    Returns:
+        [np.ndarray] (order 와 같은 순서, NaN 제외)
+    """
+    return group_stats(data, quality_col, value_col, order).arrays()
+
+
+def density_image(values, y_edges, color, alpha=0.7, x_cells=DENSITY_X_CELLS, min_cells=DENSITY_MIN_CELLS):
+    """
+    품질 하나의 값 배열을 (y 구간 × 가로 칸) RGBA 이미지로 변환
+    Args:
+        values: 값 배열
+        y_edges: y 구간 경계 (전체 품질 공통)
+        color: RGB 색상
+        alpha: 점 하나의 불투명도 (겹칠수록 진해짐)
+    """
+    counts, _ = np.histogram(values, bins=y_edges)
+    half = (x_cells - 1) // 2
+    peak = counts.max() if len(counts) and counts.max() > 0 else 1
+
+    # 구간별 좌우 칸 수 (개수에 비례, 값이 있으면 최소 min_cells 칸)
+    spread = np.rint(half * counts / peak).astype(int)
+    spread = np.where(counts > 0, np.maximum(spread, (min_cells - 1) // 2), -1)
+    occupied = np.where(counts > 0, 2 * spread + 1, 1)
+    # 칸마다 점이 최소 하나는 있는 것으로 보아 외딴 값도 마커 하나만큼 진하게 표시
+    per_cell = np.where(counts > 0, np.maximum(counts / occupied, 1.0), 0.0)
+    opacity = 1.0 - (1.0 - alpha) ** per_cell
+
+    offsets = np.abs(np.arange(x_cells) - half)
+    mask = offsets[None, :] <= spread[:, None]
+
+    image = np.zeros((len(counts), x_cells, 4))
+    image[..., :3] = color[:3]
+    image[..., 3] = opacity[:, None] * mask
+    return image
+
+
+def draw_density_strip(ax, groups, labels, color=None, alpha=0.7, half_width=STRIP_HALF_WIDTH,
+                       y_bins=DENSITY_Y_BINS, x_cells=DENSITY_X_CELLS):
+    """
+    품질별 값 배열을 밀도 이미지로 그리고 축을 stripplot 과 같은 범주형으로 설정
+    Args:
+        ax: matplotlib Axes
+        groups: 품질별 값 배열 목록 (group_arrays 결과)
+        labels: x 축 품질 이름 (groups 와 같은 순서)
+        color: 점 색상 (None 이면 색상 순환의 첫 색)
+    """
+    import matplotlib.colors as mcolors
+    import matplotlib.pyplot as plt
+
+    if color is None:
+        color = plt.rcParams['axes.prop_cycle'].by_key()['color'][0]
+    rgb = mcolors.to_rgb(color)
+
+    non_empty = [values for values in groups if len(values)]
+    low = min(values.min() for values in non_empty) if non_empty else 0.0
+    high = max(values.max() for values in non_empty) if non_empty else 1.0
+    if high == low:
+        low, high = low - 0.5, high + 0.5
+    y_edges = np.linspace(low, high, y_bins + 1)
+
+    for i, values in enumerate(groups):
+        if len(values) == 0:
+            continue
+        ax.imshow(density_image(values, y_edges, rgb, alpha, x_cells), origin='lower', aspect='auto',
+                  interpolation='nearest', extent=(i - half_width, i + half_width, low, high), zorder=3)
+
+    margin = (high - low) * plt.rcParams['axes.ymargin']
+    _categorical_axis(ax, labels)
+    ax.set_ylim(low - margin, high + margin)
+    return ax
+
+
+def _categorical_axis(ax, labels):
+    """stripplot 과 같은 범주형 x 축 (품질 이름 눈금, 양끝 0.5 여백, x 격자 없음)"""
+    ax.set_xticks(range(len(labels)), [str(label) for label in labels])
+    ax.set_xlim(-0.5, len(labels) - 0.5)
+    ax.xaxis.grid(False)
+
+
+def jitter_offsets(n_points, half_width=STRIP_HALF_WIDTH, seed=JITTER_SEED):
+    """결정적 좌우 흔들림 (-half_width ~ +half_width 균등 분포)"""
+    return np.random.default_rng(seed).uniform(-half_width, half_width, n_points)
+
+
+def draw_point_strip(ax, groups, labels, color=None, size=8, alpha=0.7, linewidth=0.5, edgecolor='black',
+                     half_width=STRIP_HALF_WIDTH, seed=JITTER_SEED):
+    """
+    품질별 값 배열을 scatter 한 번으로 그림 (sns.stripplot 과 같은 모양)
+    Args:
+        ax: matplotlib Axes
+        groups: 품질별 값 배열 목록 (group_arrays 결과)
+        labels: x 축 품질 이름 (groups 와 같은 순서)
+        color: 점 색상 (None 이면 색상 순환의 첫 색)
+        size: 마커 지름 (pt, stripplot 의 size)
+    """
+    import matplotlib.pyplot as plt
+
+    if color is None:
+        color = plt.rcParams['axes.prop_cycle'].by_key()['color'][0]
+    sizes = np.array([len(values) for values in groups])
+    positions = np.repeat(np.arange(len(groups)), sizes)
+    x = positions + jitter_offsets(len(positions), half_width, seed)
+    y = np.concatenate(groups) if len(groups) else np.empty(0)
+
+    ax.scatter(x, y, s=size ** 2, color=color, alpha=alpha, linewidth=linewidth, edgecolor=edgecolor, zorder=3)
+    _categorical_axis(ax, labels)
+    return ax
+
+
+def draw_mean_lines(ax, means, half_width=0.4, color='red', linestyle='--', linewidth=2, alpha=0.8):
+    """
+    품질별 평균 가로선을 LineCollection 하나로 그림
+    Args:
+        ax: matplotlib Axes
+        means: 품질 순서대로의 평균값 (NaN 은 건너뜀)
+        half_width: 선 반폭 (품질 간격 1 기준)
+    """
+    from matplotlib.collections import LineCollection
+
+    means = np.asarray(means, dtype='float64')
+    positions = np.flatnonzero(~np.isnan(means))
+    segments = np.stack([
+        np.column_stack([positions - half_width, means[positions]]),
+        np.column_stack([positions + half_width, means[positions]]),
+    ], axis=1)
+    lines = LineCollection(segments, colors=color, linestyles=linestyle, linewidths=linewidth, alpha=alpha)
+    ax.add_collection(lines, autolim=False)
+    return lines
+
+
+def draw_strip(ax, data, quality_col, value_col, order, method='auto', size=8, alpha=0.7, stats=None, **kwargs):
+    """
+    품질별 strip 그리기 (점 개수에 따라 점 또는 밀도 구간화)
+    Args:
+        ax: matplotlib Axes
+        data: 상위 품질로 걸러진 데이터
+        quality_col: x 축 품질 컬럼
+        value_col: y 축 값 컬럼
+        order: x 축 품질 순서
+        method: 'auto' (DENSITY_MIN_POINTS 초과 시 density, 아니면 points), 'points', 'density',
+                'seaborn' (sns.stripplot, 비교용)
+        stats: 미리 계산한 GroupStats (order 순서, 있으면 품질별로 다시 나누지 않음)
+        size, alpha, kwargs: 점 그리기 인자 (linewidth, edgecolor, density 에서는 alpha 만 사용)
+    Returns:
+        ax
+    """
+    if method not in STRIP_METHODS:
+        raise ValueError(f"알 수 없는 strip 방식: {method} (가능: {', '.join(STRIP_METHODS)})")
+    if method == 'auto':
+        method = 'density' if len(data) > DENSITY_MIN_POINTS else 'points'
+
+    if method == 'seaborn':
+        import seaborn as sns
+        return sns.stripplot(data=data, x=quality_col, y=value_col, order=order, ax=ax,
+                             size=size, alpha=alpha, jitter=True, **kwargs)
+
+    groups = stats.arrays() if stats is not None else group_arrays(data, quality_col, value_col, order)
+    if method == 'density':
+        draw_density_strip(ax, groups, list(order), alpha=alpha)
+    else:
+        draw_point_strip(ax, groups, list(order), size=size, alpha=alpha, **kwargs)
+    ax.set_xlabel(quality_col)
+    ax.set_ylabel(value_col)
+    return ax
+
+
+def synthetic_grades(n_points, n_grades=5, seed=0):
+    """벤치마크용 품질별 정규분포 데이터"""
+    rng = np.random.default_rng(seed)
+    grades = np.array([f"GRADE-{i + 1}" for i in range(n_grades)])
+    codes = rng.integers(0, n_grades, n_points)
+    return pd.DataFrame({'p_spec': grades[codes], 'value': rng.normal(420 + 15 * codes, 25)}), list(grades)
+
+
+def _benchmark_draw(ax, data, order, method):
+    """벤치마크 한 번: 점 + 품질별 평균선 (seaborn 은 기존 스크립트처럼 품질별 필터링 + hlines)"""
+    if method == 'seaborn':
+        draw_strip(ax, data, 'p_spec', 'value', order, method=method, linewidth=0.5, edgecolor='black')
+        for i, grade in enumerate(order):
+            mean_value = data[data['p_spec'] == grade]['value'].mean()
+            ax.hlines(y=mean_value, xmin=i - 0.4, xmax=i + 0.4, colors='red', linestyles='--', linewidth=2, alpha=0.8)
+        return
+
+    groups = group_arrays(data, 'p_spec', 'value', order)
+    if method == 'density':
+        draw_density_strip(ax, groups, order)
+    else:
+        draw_point_strip(ax, groups, order)
+    draw_mean_lines(ax, [values.mean() if len(values) else np.nan for values in groups])
+
+
+def benchmark(sizes, methods, repeat=1, dpi=100):
+    """
+    방식별 (점 + 평균선 그리기 + PNG 저장) 시간 측정
+    Returns:
+        {(방식, 점 개수): (그리기 최소 시간, 저장 포함 최소 시간)} (초)
+    """
+    import io
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # 첫 호출의 import/폰트 준비 시간은 제외
+    warmup, warmup_order = synthetic_grades(100)
+    for method in methods:
+        fig, ax = plt.subplots()
+        _benchmark_draw(ax, warmup, warmup_order, method)
+        fig.savefig(io.BytesIO(), format='png')
+        plt.close(fig)
+
+    results = {}
+    for n_points in sizes:
+        data, order = synthetic_grades(n_points)
+        for method in methods:
+            draw_timings, timings = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fig, ax = plt.subplots(figsize=(14, 8))
+                _benchmark_draw(ax, data, order, method)
+                draw_timings.append(time.perf_counter() - start)
+                fig.savefig(io.BytesIO(), format='png', dpi=dpi, bbox_inches='tight')
+                plt.close(fig)
+                timings.append(time.perf_counter() - start)
+            results[(method, n_points)] = (min(draw_timings), min(timings))
+            print(f"   {method:>8} {n_points:>9,}점: 그리기 {min(draw_timings):.3f}초, 저장 포함 {min(timings):.2f}초")
+    return results
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='strip 렌더링 방식별 시간 비교')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help='점 개수')
+    parser.add_argument('--methods', nargs='+', default=['seaborn', 'points', 'density'],
+                        choices=STRIP_METHODS[1:], help='비교할 방식')
+    parser.add_argument('--repeat', type=int, default=1, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--dpi', type=int, default=100, help='저장 해상도')
+    args = parser.parse_args()
+
+    print(f"🚀 strip 렌더링 벤치마크 (dpi={args.dpi}, 반복 {args.repeat}회)")
+    print("=" * 60)
+    results = benchmark(args.sizes, args.methods, args.repeat, args.dpi)
+
+    if 'seaborn' in args.methods and len(args.methods) > 1:
+        print(f"\n📊 seaborn 대비 속도:")
+        for n_points in args.sizes:
+            base_draw, base_total = results[('seaborn', n_points)]
+            speedups = []
+            for method in args.methods:
+                if method != 'seaborn':
+                    draw, total = results[(method, n_points)]
+                    speedups.append(f"{method} 그리기 {base_draw / draw:.0f}배 / 저장 포함 {base_total / total:.1f}배")
+            print(f"   {n_points:>9,}점: {', '.join(speedups)}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""테스트 공용 fixture: 실제 export 와 같은 컬럼 구성의 작은 코일 데이터"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_coil_frame(n_rows=240, seed=0):
+    """원본 export(read_excel 결과)와 같은 dtype 의 합성 코일 데이터"""
+    rng = np.random.default_rng(seed)
+    grades = np.array(['API 5L X52', 'API 5L X60', 'KS D3562', 'ASTM A53'])
+    create_date = pd.Timestamp('2025-01-06') + pd.to_timedelta(rng.integers(0, 120, n_rows), unit='D')
+    ys2_stress = rng.normal(450, 30, n_rows).round(3)
+    ys2_stress[::17] = 0
+    return pd.DataFrame({
+        'm_heat_no': [f"SP{value:05d}" for value in rng.integers(0, 99999, n_rows)],
+        'ms_date': pd.Series(create_date - pd.Timedelta(days=30)).dt.strftime('%Y%m%d').astype('int64'),
+        'pcm': rng.uniform(0.1, 0.2, n_rows).round(4),
+        'ceq': rng.uniform(0.2, 0.4, n_rows).round(4),
+        'hardness': rng.normal(150, 10, n_rows).round(1),
+        'factory_desc': rng.choice(['중경1공장', '중경2공장'], n_rows),
+        'wc_desc': rng.choice(['1호기', '2호기'], n_rows),
+        'batch_no': [f"SHZ{value:07d}" for value in rng.integers(0, 9999999, n_rows)],
+        'p_spec': rng.choice(grades, n_rows),
+        'p_thick_mm': rng.choice([6.35, 7.1, 9.5], n_rows),
+        'i_coil_no': rng.integers(100000, 999999, n_rows),
+        'pipe_no': np.arange(n_rows) + 1,
+        'sp_no_dt': [f"PHZ{value:05d}L" for value in range(n_rows)],
+        'sp_vec': rng.choice(['Stripe 모재 L방향', 'Stripe 용접'], n_rows),
+        'i_ys': rng.integers(360, 520, n_rows),
+        'i_ts': rng.integers(450, 650, n_rows),
+        'ys2_stress': ys2_stress,
+        'ts_stress': rng.normal(540, 35, n_rows).round(3),
+        'elongation': rng.normal(32.2265, 3, n_rows).round(4),
+        'create_date': create_date,
+    })
+
+
+@pytest.fixture
+def coil_frame():
+    return make_coil_frame()
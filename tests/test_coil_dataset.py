@@ -0,0 +1,50 @@
+"""xlsx 옆 Parquet 결과 우선 로드"""
+
+import os
+
+import pytest
+
+import coil_dataset
+from coil_dataset import fast_format_path, load_dataset
+from coil_export import stream_to_excel, write_parquet
+from coil_schema import apply_schema
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / '.coil_cache'
+    monkeypatch.setattr(coil_dataset, 'CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+def _make_newer(path, than):
+    stat = os.stat(than)
+    os.utime(path, (stat.st_atime + 10, stat.st_mtime + 10))
+
+
+def test_exported_excel_does_not_shadow_its_parquet(coil_frame, tmp_path, cache_dir):
+    parquet_path = write_parquet(apply_schema(coil_frame), tmp_path / 'data.parquet')
+    xlsx_path = stream_to_excel(apply_schema(coil_frame), tmp_path / 'data.xlsx', source=parquet_path)
+    _make_newer(xlsx_path, parquet_path)
+
+    assert fast_format_path(xlsx_path) == parquet_path
+    assert len(load_dataset(xlsx_path, verbose=False)) == len(coil_frame)
+
+
+def test_edited_excel_is_read_instead_of_parquet(coil_frame, tmp_path, cache_dir):
+    parquet_path = write_parquet(apply_schema(coil_frame), tmp_path / 'data.parquet')
+    xlsx_path = stream_to_excel(apply_schema(coil_frame), tmp_path / 'data.xlsx', source=parquet_path)
+    stream_to_excel(apply_schema(coil_frame.iloc[:10]), xlsx_path)
+    _make_newer(xlsx_path, parquet_path)
+
+    assert fast_format_path(xlsx_path) is None
+    assert len(load_dataset(xlsx_path, verbose=False)) == 10
+
+
+def test_rewritten_parquet_invalidates_export_record(coil_frame, tmp_path, cache_dir):
+    parquet_path = write_parquet(apply_schema(coil_frame), tmp_path / 'data.parquet')
+    xlsx_path = stream_to_excel(apply_schema(coil_frame), tmp_path / 'data.xlsx', source=parquet_path)
+    write_parquet(apply_schema(coil_frame.iloc[:10]), parquet_path)
+    _make_newer(xlsx_path, parquet_path)
+
+    assert fast_format_path(xlsx_path) is None
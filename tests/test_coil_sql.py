@@ -0,0 +1,31 @@
+"""DuckDB 뷰 스키마"""
+
+from coil_ingest import ingest_frame
+from coil_schema import apply_schema
+from coil_sql import connect
+from coil_store import ROW_KEY_COLUMN, read_dataset
+
+
+def _view_columns(con, view):
+    return [row[0] for row in con.execute(f"DESCRIBE {view}").fetchall()]
+
+
+def test_views_expose_stored_columns_plus_month(coil_frame, tmp_path):
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+    con = connect(store_dir=tmp_path)
+
+    expected = list(read_dataset('raw', tmp_path).columns) + ['month']
+    for view in ['raw', 'zero_filtered', 'spec_filtered']:
+        columns = _view_columns(con, view)
+        assert sorted(columns) == sorted(expected), view
+        assert ROW_KEY_COLUMN not in columns
+
+
+def test_month_matches_create_date(coil_frame, tmp_path):
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+    con = connect(store_dir=tmp_path)
+    mismatched = con.execute(
+        "SELECT count(*) FROM raw WHERE month <> strftime(create_date, '%Y-%m')"
+    ).fetchone()[0]
+    assert mismatched == 0
+    assert con.execute("SELECT count(*) FROM raw").fetchone()[0] == len(coil_frame)
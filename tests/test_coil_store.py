@@ -0,0 +1,81 @@
+"""저장소 행 키와 증분 수집 중복 제거"""
+
+import pandas as pd
+
+import coil_store
+from coil_ingest import ingest_frame
+from coil_schema import apply_schema
+from coil_store import part_files, partition_values, read_dataset, row_keys, stored_keys
+
+
+def _with_other_dtypes(data):
+    """같은 값을 다른 dtype/컬럼 구성으로 (스키마 압축 전후, 컬럼 추가/삭제)"""
+    changed = data.copy()
+    changed['i_ys'] = changed['i_ys'].astype('float64')
+    changed['ys2_stress'] = changed['ys2_stress'].astype('float32')
+    changed['i_coil_no'] = changed['i_coil_no'].astype(str)
+    changed['p_spec'] = changed['p_spec'].astype('category')
+    changed['vendor_desc'] = 'POSCO'
+    return changed.drop(columns=['hardness'])
+
+
+def test_row_keys_ignore_dtypes_and_unrelated_columns(coil_frame):
+    expected = row_keys(coil_frame)
+    assert expected.is_unique
+    pd.testing.assert_series_equal(row_keys(apply_schema(coil_frame)), expected)
+    pd.testing.assert_series_equal(row_keys(_with_other_dtypes(coil_frame)), expected)
+
+
+def test_row_keys_distinguish_retests(coil_frame):
+    retest = coil_frame.iloc[[0, 0]].copy()
+    retest['ys2_stress'] = [407.362, 434.99]
+    assert row_keys(retest).nunique() == 2
+
+    # 다른 시편(sp_vec)은 순번과 관계없이 다른 키
+    specimen = retest.assign(sp_vec=['Stripe 모재 L방향', 'Stripe 용접'])
+    assert row_keys(specimen).nunique() == 2 and not set(row_keys(specimen)) & {row_keys(retest).iloc[1]}
+
+
+def test_ingest_skips_corrected_measurements(coil_frame, tmp_path):
+    data = pd.concat([coil_frame, coil_frame.iloc[[5]]], ignore_index=True)
+    data.loc[len(coil_frame), 'ys2_stress'] = 501.25
+    ingest_frame(apply_schema(data), tmp_path)
+
+    # 시험값이 정정된 재 export: 재시험 행 포함 같은 키 → 추가하지 않음 (처음 값 유지)
+    corrected = data.copy()
+    corrected.loc[[5, len(coil_frame)], 'ys2_stress'] += 3.5
+    corrected['i_ys'] += 1
+    assert len(ingest_frame(apply_schema(corrected), tmp_path)) == 0
+
+    stored = read_dataset('raw', tmp_path)
+    assert len(stored) == len(data)
+    assert sorted(stored['ys2_stress'].astype('float64').round(2)) == sorted(
+        apply_schema(data)['ys2_stress'].astype('float64').round(2))
+
+
+def test_ingest_skips_rows_after_dtype_change(coil_frame, tmp_path):
+    first = ingest_frame(apply_schema(coil_frame), tmp_path)
+    assert len(first) == len(coil_frame)
+
+    again = ingest_frame(apply_schema(_with_other_dtypes(coil_frame)), tmp_path)
+    assert len(again) == 0
+    assert len(read_dataset('raw', tmp_path)) == len(coil_frame)
+
+
+def test_ingest_adds_only_new_rows(coil_frame, tmp_path):
+    ingest_frame(apply_schema(coil_frame.iloc[:150]), tmp_path)
+    delta = ingest_frame(apply_schema(coil_frame), tmp_path)
+    assert len(delta) == len(coil_frame) - 150
+
+
+def test_stored_keys_reads_only_touched_partitions(coil_frame, tmp_path, monkeypatch):
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+    delta = apply_schema(coil_frame[coil_frame['create_date'] < '2025-02-01'])
+
+    opened = []
+    original = coil_store.pd.read_parquet
+    monkeypatch.setattr(coil_store.pd, 'read_parquet', lambda path, **kw: opened.append(path) or original(path, **kw))
+    keys = stored_keys('raw', tmp_path, partitions=partition_values(delta))
+
+    assert set(row_keys(delta)) <= keys
+    assert 0 < len(opened) < len(part_files('raw', tmp_path))
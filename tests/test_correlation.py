@@ -0,0 +1,80 @@
+"""상관계수 행렬을 DataFrame.corr 와 비교, 상위 쌍, 결과 캐시"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import correlation
+from correlation import cached_correlation, correlation_matrix, top_pairs
+
+COLUMNS = ['pcm', 'ceq', 'hardness', 'i_ys', 'ys2_stress', 'i_ts', 'ts_stress', 'p_thick_mm']
+
+
+@pytest.fixture
+def corr_frame(coil_frame):
+    """컬럼마다 다른 결측 패턴, 같은 패턴의 컬럼 묶음, 동순위 값이 섞인 데이터"""
+    data = coil_frame[['p_spec'] + COLUMNS].copy()
+    data['ys2_stress'] = data['i_ys'] * 0.9 + np.random.default_rng(2).normal(0, 10, len(data))
+    data['i_ys'] = data['i_ys'].astype('float64')
+    data.loc[data.index[::7], 'pcm'] = np.nan
+    data.loc[data.index[::7], 'ceq'] = np.nan
+    data.loc[data.index[3::5], 'hardness'] = np.nan
+    data.loc[data.index[:40], 'ts_stress'] = np.nan
+    data.loc[data.index[1::9], ['i_ys', 'ys2_stress']] = np.nan
+    return data
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+def test_correlation_matrix_matches_pandas(corr_frame, method):
+    r, count = correlation_matrix(corr_frame, COLUMNS, method=method)
+    expected = corr_frame[COLUMNS].corr(method=method)
+    pd.testing.assert_frame_equal(r, expected, rtol=1e-9, atol=1e-12)
+
+    present = corr_frame[COLUMNS].notna().astype('int64')
+    pd.testing.assert_frame_equal(count, present.T @ present, check_dtype=False)
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+def test_correlation_matrix_min_periods(corr_frame, method):
+    r, count = correlation_matrix(corr_frame, COLUMNS, method=method, min_periods=200)
+    expected = corr_frame[COLUMNS].corr(method=method, min_periods=200)
+    pd.testing.assert_frame_equal(r, expected, rtol=1e-9, atol=1e-12)
+    assert r.isna().to_numpy()[count.to_numpy() < 200].all()
+
+
+def test_top_pairs_order_and_min_count(corr_frame):
+    r, count = correlation_matrix(corr_frame, COLUMNS)
+    pairs = top_pairs(r, count, k=None, min_count=0)
+
+    assert len(pairs) == len(COLUMNS) * (len(COLUMNS) - 1) // 2
+    assert (np.diff(pairs['r'].abs().to_numpy()) <= 0).all()
+    assert set(pairs.iloc[0][['a', 'b']]) == {'i_ys', 'ys2_stress'}
+    for row in pairs.itertuples():
+        assert row.r == r.loc[row.a, row.b] and row.n == count.loc[row.a, row.b]
+
+    # n 이 min_count 미만인 쌍은 제외
+    cutoff = int(np.median(pairs['n']))
+    kept = top_pairs(r, count, k=None, min_count=cutoff)
+    pd.testing.assert_frame_equal(kept, pairs[pairs['n'] >= cutoff].reset_index(drop=True))
+    assert 0 < len(kept) < len(pairs)
+    pd.testing.assert_frame_equal(top_pairs(r, count, k=3, min_count=cutoff), kept.head(3))
+
+
+def test_cached_correlation_hits_cache(corr_frame, tmp_path, monkeypatch):
+    monkeypatch.setattr(correlation, 'CORRELATION_CACHE_DIR', tmp_path)
+    first = cached_correlation(corr_frame, COLUMNS, method='spearman', by='p_spec')
+    assert len(list(tmp_path.glob('*.parquet'))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError('캐시가 있으면 다시 계산하지 않아야 함')
+
+    monkeypatch.setattr(correlation, 'correlation_matrix', fail)
+    second = cached_correlation(corr_frame, COLUMNS, method='spearman', by='p_spec')
+    assert list(second) == list(first) == sorted(corr_frame['p_spec'].unique())
+    for group, (r, count) in first.items():
+        pd.testing.assert_frame_equal(second[group][0], r)
+        pd.testing.assert_frame_equal(second[group][1], count)
+
+    # 데이터가 바뀌면 캐시 키도 바뀜
+    with pytest.raises(AssertionError, match='캐시'):
+        cached_correlation(corr_frame.assign(pcm=corr_frame['pcm'] * 2), COLUMNS, method='spearman', by='p_spec')
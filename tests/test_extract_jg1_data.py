@@ -0,0 +1,22 @@
+"""공장별 일괄 추출: 모든 공장 파티션이 중경1공장 출력/저장소와 같은 스키마"""
+
+import pandas as pd
+
+from coil_schema import apply_schema
+from extract_jg1_data import extract_all_factories, find_factory_column
+
+
+def test_factory_partitions_use_store_schema(coil_frame, tmp_path):
+    source = tmp_path / 'export.xlsx'
+    coil_frame.to_excel(source, index=False)
+
+    saved = extract_all_factories(str(source), tmp_path / 'factories')
+    factory_col = find_factory_column(list(coil_frame.columns))
+    assert sorted(saved) == sorted(coil_frame[factory_col].unique())
+
+    for factory, path in saved.items():
+        partition = pd.read_parquet(path)
+        expected = apply_schema(coil_frame[coil_frame[factory_col] == factory].reset_index(drop=True))
+        assert len(partition) == len(expected)
+        for col in expected.columns:
+            assert partition[col].dtype.name == expected[col].dtype.name, (factory, col)
@@ -0,0 +1,80 @@
+"""그룹별 OLS 결과를 scipy.stats.linregress 와 비교"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from group_regression import POOLED_LABEL, group_regression
+
+
+@pytest.fixture
+def regression_frame(coil_frame):
+    """x 결측값과 행이 둘뿐인 품질이 섞인 데이터"""
+    data = coil_frame.copy()
+    data['ys2_stress'] = 120 + 0.75 * data['i_ys'] + np.random.default_rng(1).normal(0, 15, len(data))
+    data['i_ys'] = data['i_ys'].astype('float64')
+    data.loc[data.index[::13], 'i_ys'] = np.nan
+    pair = data.iloc[:2].assign(p_spec='KS D3583', i_ys=[400.0, 420.0], ys2_stress=[430.0, 445.0])
+    return pd.concat([data, pair], ignore_index=True)
+
+
+def _linregress(data):
+    valid = data[['i_ys', 'ys2_stress']].dropna()
+    return stats.linregress(valid['i_ys'], valid['ys2_stress'])
+
+
+def test_group_regression_matches_linregress(regression_frame):
+    fit = group_regression(regression_frame, 'i_ys', 'ys2_stress', by='p_spec')
+
+    assert fit.labels == sorted(regression_frame['p_spec'].unique())
+    for label, group in regression_frame.groupby('p_spec'):
+        i = fit.index(label)
+        expected = _linregress(group)
+        assert fit.n[i] == group[['i_ys', 'ys2_stress']].dropna().shape[0]
+        assert fit.slope[i] == pytest.approx(expected.slope, rel=1e-10)
+        assert fit.intercept[i] == pytest.approx(expected.intercept, rel=1e-10)
+        assert fit.r[i] == pytest.approx(expected.rvalue, rel=1e-10)
+        if fit.n[i] > 2:
+            assert fit.p_value[i] == pytest.approx(expected.pvalue, rel=1e-8)
+            assert fit.slope_stderr[i] == pytest.approx(expected.stderr, rel=1e-8)
+            assert fit.intercept_stderr[i] == pytest.approx(expected.intercept_stderr, rel=1e-8)
+
+    # 행이 둘뿐이면 직선은 정해지지만 잔차 자유도가 없다
+    pair = fit.index('KS D3583')
+    assert fit.slope[pair] == pytest.approx(0.75)
+    assert np.isnan(fit.p_value[pair]) and np.isnan(fit.residual_std[pair])
+
+
+def test_pooled_regression_and_order(regression_frame):
+    pooled = group_regression(regression_frame, 'i_ys', 'ys2_stress')
+    expected = _linregress(regression_frame)
+    assert pooled.labels == [POOLED_LABEL]
+    assert pooled.slope[0] == pytest.approx(expected.slope, rel=1e-10)
+    assert pooled.p_value[0] == pytest.approx(expected.pvalue, rel=1e-8, abs=1e-300)
+
+    order = ['API 5L X60', 'EN 10219']
+    fit = group_regression(regression_frame, 'i_ys', 'ys2_stress', by='p_spec', order=order)
+    assert fit.labels == order
+    assert fit.n[1] == 0 and np.isnan(fit.slope[1])
+    assert list(fit.table().index) == ['API 5L X60']
+
+
+def test_intervals_match_textbook_formula(regression_frame):
+    fit = group_regression(regression_frame, 'i_ys', 'ys2_stress', by='p_spec')
+    label = 'API 5L X52'
+    i = fit.index(label)
+    x = np.array([380.0, fit.x_mean[i], 500.0])
+
+    t_crit = stats.t.ppf(0.975, fit.n[i] - 2)
+    leverage = 1 / fit.n[i] + (x - fit.x_mean[i]) ** 2 / fit.sxx[i]
+    fitted = fit.intercept[i] + fit.slope[i] * x
+    low, high = fit.confidence_interval(x, label)
+    np.testing.assert_allclose(high - fitted, t_crit * fit.residual_std[i] * np.sqrt(leverage), rtol=1e-10)
+    np.testing.assert_allclose(fitted - low, high - fitted, rtol=1e-10)
+    low, high = fit.prediction_interval(x, label)
+    np.testing.assert_allclose(high - fitted, t_crit * fit.residual_std[i] * np.sqrt(1 + leverage), rtol=1e-10)
+
+    # 모든 그룹을 한 번에 구해도 같은 값
+    all_low, all_high = fit.prediction_interval(x)
+    np.testing.assert_allclose(all_high[i], high, rtol=1e-12)
@@ -0,0 +1,57 @@
+"""GroupStats 결과를 pandas groupby 와 비교"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from group_stats import group_stats
+
+
+@pytest.fixture
+def stats_frame(coil_frame):
+    """NaN 값과 행이 하나뿐인 품질이 섞인 데이터"""
+    data = coil_frame.copy()
+    data.loc[data.index[::11], 'ys2_stress'] = np.nan
+    single = data.iloc[[0]].assign(p_spec='KS D3583', ys2_stress=401.5)
+    return pd.concat([data, single], ignore_index=True)
+
+
+def test_group_stats_match_pandas(stats_frame):
+    stats = group_stats(stats_frame, 'p_spec', 'ys2_stress')
+    expected = stats_frame.groupby('p_spec')['ys2_stress'].agg(['count', 'mean', 'std', 'min', 'max', 'median'])
+
+    assert stats.labels == list(expected.index)
+    np.testing.assert_array_equal(stats.count, expected['count'])
+    for name in ['mean', 'std', 'min', 'max', 'median']:
+        np.testing.assert_allclose(stats.stat(name), expected[name], rtol=1e-12, equal_nan=True)
+    for q in [0.1, 0.25, 0.75, 0.9]:
+        quantile = stats_frame.groupby('p_spec')['ys2_stress'].quantile(q)
+        np.testing.assert_allclose(stats.quantile(q), quantile, rtol=1e-12)
+
+
+def test_group_stats_order_keeps_empty_and_drops_other_grades(stats_frame):
+    order = ['API 5L X60', 'EN 10219', 'API 5L X52']
+    stats = group_stats(stats_frame, 'p_spec', 'ys2_stress', order=order)
+
+    assert stats.labels == order
+    assert stats.count[1] == 0
+    assert np.isnan(stats.mean[1]) and np.isnan(stats.median[1])
+    for label in ['API 5L X60', 'API 5L X52']:
+        values = stats_frame.loc[stats_frame['p_spec'] == label, 'ys2_stress'].dropna()
+        np.testing.assert_array_equal(stats.values(label), values.to_numpy())
+    assert stats.total == stats_frame.loc[stats_frame['p_spec'].isin(order), 'ys2_stress'].notna().sum()
+
+
+def test_group_stats_overall_and_table(stats_frame):
+    stats = group_stats(stats_frame, 'p_spec', 'ys2_stress')
+    values = stats_frame['ys2_stress'].dropna()
+
+    assert stats.overall('count') == len(values)
+    for name in ['mean', 'std', 'min', 'max', 'median']:
+        assert stats.overall(name) == pytest.approx(getattr(values, name)(), rel=1e-12)
+    assert stats.overall(0.25) == pytest.approx(values.quantile(0.25), rel=1e-12)
+
+    table = stats.table(['count', 'mean', 0.25], decimals=2)
+    assert list(table.columns) == ['count', 'mean', '25%']
+    assert table['count'].dtype == int
+    pd.testing.assert_series_equal(table['mean'], stats.series('mean').round(2), check_names=False)
@@ -0,0 +1,57 @@
+"""CLI 시작 비용: stats 명령은 그래프/Excel/저장소 모듈을 import 하지 않고 1초 안에 끝난다"""
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from coil_export import write_parquet
+from coil_schema import apply_schema
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# stats 가 불러오면 안 되는 모듈 (main.HEAVY_MODULES 중 pandas 제외)
+PLOTTING_MODULES = ['matplotlib', 'seaborn', 'scipy', 'plotly']
+
+# stats 가 불러오면 안 되는 수집/Excel 모듈
+INGEST_MODULES = ['openpyxl', 'coil_ingest', 'coil_export', 'online_stats', 'coil_store']
+
+# stats 실행 시간 상한 (main.py --timing 값, 인터프리터 시작 제외)
+STARTUP_BUDGET_SECONDS = 1.0
+
+_RUN_MAIN = """
+import json, runpy, sys
+sys.argv = ['main.py'] + sys.argv[1:]
+runpy.run_path('main.py', run_name='__main__')
+print(json.dumps(sorted(name for name in {modules!r} if name in sys.modules)))
+"""
+
+
+def _run_main(*args):
+    result = subprocess.run(
+        [sys.executable, '-c', _RUN_MAIN.format(modules=PLOTTING_MODULES + INGEST_MODULES), *args],
+        cwd=PROJECT_DIR, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    *output, loaded = result.stdout.strip().splitlines()
+    return '\n'.join(output), json.loads(loaded)
+
+
+@pytest.fixture
+def data_file(coil_frame, tmp_path):
+    return str(write_parquet(apply_schema(coil_frame), tmp_path / 'data.parquet'))
+
+
+@pytest.mark.parametrize('what', ['grades', 'metrics'])
+def test_stats_starts_without_heavy_modules(data_file, what):
+    output, loaded = _run_main('--timing', 'stats', what, '--file', data_file)
+    assert '실행 실패' not in output
+    assert loaded == []
+    assert 'matplotlib' not in output.split('로드된 무거운 모듈:')[-1]
+
+    elapsed = float(re.search(r'stats: ([0-9.]+)초', output).group(1))
+    assert elapsed < STARTUP_BUDGET_SECONDS, output
+
@@ -0,0 +1,143 @@
+"""누적 통계 병합을 pandas 와 비교, 중단된 수집의 복구, 누적 통계 기반 분석 출력"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import coil_ingest
+import coil_store
+import online_stats
+from coil_ingest import ingest_frame
+from coil_schema import apply_schema
+from coil_store import read_dataset, read_table
+from filter_jg1_data import analyze_store, drop_zero_rows
+from online_stats import (
+    BATCHES_TABLE, MOMENTS_TABLE, SKETCH_RELATIVE_ACCURACY, accumulate, applied_batches, combine_moments,
+    combine_sketches, sketch_quantiles, summary,
+)
+from tests.conftest import make_coil_frame
+
+
+def _expected(data, scope_col, column):
+    """pandas groupby 로 계산한 기준값"""
+    values = data[column].astype('float64')
+    return values.groupby(data[scope_col], observed=True).agg(['count', 'mean', 'std', 'min', 'max'])
+
+
+def test_combined_moments_match_pandas(coil_frame):
+    chunks = [coil_frame.iloc[:50], coil_frame.iloc[50:51], coil_frame.iloc[51:180], coil_frame.iloc[180:]]
+    parts = [accumulate(chunk) for chunk in chunks]
+    moments = combine_moments([part[0] for part in parts])
+
+    grade = moments[(moments['scope'] == 'grade') & (moments['column'] == 'ys2_stress')].set_index('key')
+    expected = _expected(coil_frame, 'p_spec', 'ys2_stress')
+    np.testing.assert_array_equal(grade.loc[expected.index, 'count'], expected['count'])
+    np.testing.assert_allclose(grade.loc[expected.index, 'mean'], expected['mean'], rtol=1e-12)
+    np.testing.assert_allclose(np.sqrt(grade.loc[expected.index, 'm2'] / (expected['count'] - 1)), expected['std'],
+                               rtol=1e-10)
+    np.testing.assert_array_equal(grade.loc[expected.index, 'min'], expected['min'])
+    np.testing.assert_array_equal(grade.loc[expected.index, 'max'], expected['max'])
+
+    whole, _ = accumulate(coil_frame)
+    pd.testing.assert_frame_equal(
+        moments.sort_values(['scope', 'key', 'column']).reset_index(drop=True)[['scope', 'key', 'column', 'count']],
+        whole.sort_values(['scope', 'key', 'column']).reset_index(drop=True)[['scope', 'key', 'column', 'count']],
+    )
+
+
+def test_combined_sketch_quantiles_within_accuracy():
+    data = make_coil_frame(n_rows=3000, seed=3)
+    chunks = np.array_split(np.arange(len(data)), 7)
+    sketch = combine_sketches([accumulate(data.iloc[index])[1] for index in chunks])
+    sketch = sketch[sketch['scope'] == 'grade']
+
+    estimates = sketch_quantiles(sketch, [0.25, 0.5, 0.75])
+    for q, name in [(0.25, '25%'), (0.5, '50%'), (0.75, '75%')]:
+        for column in ['ys2_stress', 'ts_stress', 'i_ys']:
+            expected = data.groupby('p_spec')[column].quantile(q, interpolation='lower')
+            upper = data.groupby('p_spec')[column].quantile(q, interpolation='higher')
+            estimate = estimates[name].xs(column, level='column').loc[expected.index]
+            low = np.minimum(expected, upper) * (1 - SKETCH_RELATIVE_ACCURACY) - 1e-9
+            high = np.maximum(expected, upper) * (1 + SKETCH_RELATIVE_ACCURACY) + 1e-9
+            assert ((estimate >= low) & (estimate <= high)).all(), (column, name)
+
+
+def test_ingest_stats_match_filtered_rows(coil_frame, tmp_path):
+    ingest_frame(apply_schema(coil_frame.iloc[:120]), tmp_path)
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+
+    table = summary('grade', tmp_path, columns=['ys2_stress'])
+    expected = _expected(drop_zero_rows(apply_schema(coil_frame)), 'p_spec', 'ys2_stress')
+    result = table.xs('ys2_stress', level='column').loc[expected.index]
+    np.testing.assert_array_equal(result['count'], expected['count'])
+    np.testing.assert_allclose(result['mean'], expected['mean'], rtol=1e-12)
+    np.testing.assert_allclose(result['std'], expected['std'], rtol=1e-10)
+
+
+def test_update_stats_skips_applied_batch(coil_frame, tmp_path):
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+    before = read_table(MOMENTS_TABLE, tmp_path)
+    delta = drop_zero_rows(read_dataset('filtered', tmp_path))
+    for batch_id in applied_batches(tmp_path):
+        coil_ingest.update_stats(delta, tmp_path, batch_id=batch_id)
+    pd.testing.assert_frame_equal(read_table(MOMENTS_TABLE, tmp_path), before)
+
+
+def test_interrupted_ingest_is_recovered(coil_frame, tmp_path, monkeypatch):
+    first, second, third = coil_frame.iloc[:80], coil_frame.iloc[80:160], coil_frame.iloc[160:]
+    ingest_frame(apply_schema(first), tmp_path)
+
+    # filtered 추가 도중 중단 (raw 만 저장됨)
+    real_append = coil_ingest.append_part
+
+    def append_raw_only(data, name, *args, **kwargs):
+        if name == 'filtered':
+            raise RuntimeError('중단')
+        return real_append(data, name, *args, **kwargs)
+
+    monkeypatch.setattr(coil_ingest, 'append_part', append_raw_only)
+    with pytest.raises(RuntimeError):
+        ingest_frame(apply_schema(second), tmp_path)
+    monkeypatch.undo()
+
+    # 다음 수집이 앞 batch 를 복구한 뒤, filtered 추가와 누적 통계 저장 사이에서 중단
+    def crash(*args, **kwargs):
+        raise RuntimeError('중단')
+
+    monkeypatch.setattr(coil_ingest, 'update_stats', crash)
+    with pytest.raises(RuntimeError):
+        ingest_frame(apply_schema(third), tmp_path)
+    monkeypatch.undo()
+
+    # 다음 수집(새 행 없음)이 남은 batch 를 복구
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+    expected = drop_zero_rows(apply_schema(coil_frame))
+    assert len(read_dataset('filtered', tmp_path)) == len(expected)
+
+    table = summary('all', tmp_path).loc['all']
+    expected_stats = expected['ys2_stress'].astype('float64').agg(['count', 'mean', 'std'])
+    assert table.loc['ys2_stress', 'count'] == expected_stats['count']
+    assert table.loc['ys2_stress', 'mean'] == pytest.approx(expected_stats['mean'], rel=1e-12)
+    assert table.loc['ys2_stress', 'std'] == pytest.approx(expected_stats['std'], rel=1e-10)
+    assert applied_batches(tmp_path) == set(read_table(BATCHES_TABLE, tmp_path)['batch_id'])
+    assert len(applied_batches(tmp_path)) == 3
+
+
+def test_analyze_store_reads_only_aggregates(coil_frame, tmp_path, monkeypatch, capsys):
+    assert analyze_store(tmp_path) is False
+    ingest_frame(apply_schema(coil_frame), tmp_path)
+    capsys.readouterr()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('part 파일을 읽으면 안 됨')
+
+    monkeypatch.setattr(online_stats, 'read_dataset', fail)
+    monkeypatch.setattr(coil_store, 'read_dataset', fail)
+    assert analyze_store(tmp_path) is True
+
+    output = capsys.readouterr().out
+    expected = drop_zero_rows(apply_schema(coil_frame))
+    assert f"총 레코드 수: {len(expected):,}개" in output
+    assert f"평균: {expected['ys2_stress'].astype('float64').mean():.3f}" in output
+    top_grade, top_count = next(iter(expected['p_spec'].value_counts().items()))
+    assert f"- {top_grade}: {top_count:,}개" in output
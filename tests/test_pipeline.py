@@ -0,0 +1,110 @@
+"""파이프라인 단계 지문과 상태: 참조하는 보조 함수를 고치면 다시 실행, 데이터 입력이 없으면 건너뜀"""
+
+import shutil
+import textwrap
+
+import pytest
+
+import pipeline
+from pipeline import Stage, missing_data_inputs, referenced_sources, stage_fingerprint, stage_status
+
+CHART_MODULE = '''
+from helpers import scale
+import helpers
+
+LIMIT = 530
+
+def analyze(data):
+    return data[data < LIMIT]
+
+def create_chart(data):
+    return scale(analyze(data)) + helpers.offset()
+
+def unrelated():
+    return 1
+'''
+
+HELPERS_MODULE = '''
+import numpy as np
+
+def scale(values):
+    return values * 2
+
+def offset():
+    return 0
+'''
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'PROJECT_DIR', tmp_path)
+    shutil.copy(pipeline.__file__, tmp_path / 'pipeline.py')
+    (tmp_path / 'chart.py').write_text(textwrap.dedent(CHART_MODULE), encoding='utf-8')
+    (tmp_path / 'helpers.py').write_text(textwrap.dedent(HELPERS_MODULE), encoding='utf-8')
+    (tmp_path / 'input.parquet').write_bytes(b'data')
+    return tmp_path
+
+
+def _edit(path, old, new):
+    source = path.read_text(encoding='utf-8')
+    assert old in source
+    path.write_text(source.replace(old, new), encoding='utf-8')
+
+
+def _fingerprint(project):
+    stage = Stage('chart', 'chart', 'create_chart', inputs=[str(project / 'input.parquet')],
+                  outputs=[], run=pipeline._run_chart)
+    return stage_fingerprint(stage)
+
+
+def test_referenced_sources_follow_calls_across_modules(project):
+    assert list(referenced_sources('chart', 'create_chart')) == [
+        'chart.LIMIT', 'chart.analyze', 'chart.create_chart', 'helpers.offset', 'helpers.scale',
+    ]
+
+
+@pytest.mark.parametrize('path, old, new', [
+    ('chart.py', 'return data[data < LIMIT]', 'return data[data <= LIMIT]'),
+    ('chart.py', 'LIMIT = 530', 'LIMIT = 540'),
+    ('helpers.py', 'return values * 2', 'return values * 3'),
+    ('helpers.py', 'return 0', 'return 1'),
+])
+def test_editing_a_referenced_helper_changes_fingerprint(project, path, old, new):
+    before = _fingerprint(project)
+    _edit(project / path, old, new)
+    assert _fingerprint(project) != before
+
+
+def test_editing_an_unrelated_function_keeps_fingerprint(project):
+    before = _fingerprint(project)
+    _edit(project / 'chart.py', 'return 1', 'return 2')
+    assert _fingerprint(project) == before
+
+
+def test_editing_input_changes_fingerprint(project):
+    before = _fingerprint(project)
+    (project / 'input.parquet').write_bytes(b'changed')
+    assert _fingerprint(project) != before
+
+
+def test_stage_skipped_when_a_data_input_is_missing(project):
+    data = str(project / 'input.parquet')
+    missing = str(project / 'ys2_minus_iys.parquet')
+    renderer = str(project / 'chart.py')
+    stage = Stage('chart', 'chart', 'create_chart', inputs=[missing, renderer], outputs=[], run=pipeline._run_chart)
+    assert stage_status(stage, {}) == ('입력 없음', None)
+    assert missing_data_inputs(stage) == [missing]
+
+    stage.inputs = [data, missing, renderer]
+    assert stage_status(stage, {})[0] == '입력 없음'
+
+    stage.inputs = [data, renderer]
+    assert stage_status(stage, {})[0] == '오래됨'
+
+
+def test_other_format_of_same_data_counts_as_present(project):
+    stage = Stage('filter', 'chart', 'create_chart', inputs=[str(project / 'input.xlsx'), str(project / 'input.parquet')],
+                  outputs=[], run=pipeline._run_chart)
+    assert missing_data_inputs(stage) == []
+    (project / 'input.parquet').unlink()
+    assert missing_data_inputs(stage) == stage.inputs
@@ -0,0 +1,42 @@
+"""작업 프로세스 공유 데이터: memory-map 테이블에서 차트별 컬럼만 변환"""
+
+import pandas as pd
+import pytest
+
+from coil_schema import apply_schema
+from render_report import (
+    CHART_FRAMES, REPORT_CHARTS, chart_columns, chart_shared, prepare_shared, read_shared_table,
+    report_columns, write_shared_frames,
+)
+
+
+@pytest.fixture
+def shared_tables(coil_frame, tmp_path):
+    charts = list(REPORT_CHARTS)
+    data = apply_schema(coil_frame)[report_columns(charts)]
+    shared = prepare_shared(data, charts)
+    frame_files, values = write_shared_frames(shared, tmp_path)
+    tables = {name: read_shared_table(path) for name, path in frame_files.items()}
+    return shared, tables, values
+
+
+@pytest.mark.parametrize('chart', list(REPORT_CHARTS))
+def test_chart_shared_converts_only_chart_columns(shared_tables, chart):
+    shared, tables, values = shared_tables
+    name = CHART_FRAMES.get(chart, 'data')
+    expected = shared[name].reset_index(drop=True)
+
+    result = chart_shared(chart, tables, values)
+
+    columns = chart_columns(chart, expected.columns)
+    assert list(result[name].columns) == columns
+    pd.testing.assert_frame_equal(result[name], expected[columns], check_categorical=False)
+    pd.testing.assert_series_equal(result['top_qualities'], shared['top_qualities'])
+
+
+def test_tables_stay_memory_mapped(shared_tables):
+    _, tables, _ = shared_tables
+    chart_shared('ys2_stress_stripplot', tables, {})
+    # 변환 후에도 테이블은 그대로 사용 가능 (self_destruct 는 투영된 사본에만 적용)
+    assert tables['data'].num_rows > 0
+    assert tables['data'].column('ys2_stress').null_count == 0
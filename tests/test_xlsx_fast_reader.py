@@ -0,0 +1,64 @@
+"""고속 xlsx 리더: stream_to_excel 왕복 및 날짜 서식 셀"""
+
+import pandas as pd
+import pytest
+
+import xlsx_fast_reader
+from coil_dataset import normalize_object_columns
+from coil_export import stream_to_excel
+from coil_schema import apply_schema
+from xlsx_fast_reader import _is_date_format, read_inline_xlsx
+
+
+def _assert_same(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_categorical=False)
+
+
+@pytest.fixture
+def exported(coil_frame, tmp_path):
+    expected = apply_schema(coil_frame)
+    return expected, stream_to_excel(expected, tmp_path / 'export.xlsx')
+
+
+def test_round_trip_preserves_values_and_dates(exported):
+    expected, path = exported
+    actual = read_inline_xlsx(path)
+
+    _assert_same(actual, expected)
+    for col in ['ms_date', 'create_date']:
+        assert pd.api.types.is_datetime64_any_dtype(actual[col])
+        assert actual[col].notna().all()
+
+
+def test_round_trip_with_projection(exported):
+    expected, path = exported
+    columns = ['p_spec', 'create_date', 'ys2_stress']
+    _assert_same(read_inline_xlsx(path, columns), expected[columns])
+
+
+def test_iterparse_fallback_reads_dates(exported, monkeypatch):
+    expected, path = exported
+
+    def unsupported(*args, **kwargs):
+        raise xlsx_fast_reader._UnsupportedLayout()
+
+    monkeypatch.setattr(xlsx_fast_reader, '_read_cells_regex', unsupported)
+    _assert_same(read_inline_xlsx(path), expected)
+
+
+def test_matches_pandas_read_excel(exported):
+    _, path = exported
+    expected = apply_schema(normalize_object_columns(pd.read_excel(path)))
+    _assert_same(read_inline_xlsx(path), expected)
+
+
+@pytest.mark.parametrize('format_code, is_date', [
+    ('yyyy-mm-dd h:mm:ss', True),
+    ('[$-412]yyyy"년" m"월" d"일"', True),
+    ('0.00', False),
+    ('#,##0"mm"', False),
+    ('"d"0.0', False),
+    ('General', False),
+])
+def test_is_date_format(format_code, is_date):
+    assert _is_date_format(format_code) is is_date
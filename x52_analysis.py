@@ -4,38 +4,38 @@
 중경1공장 X52 계열 세아제강 제품 규격 내 품질별 항복강도 분포 분석
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
-# 한글 폰트 설정
-import matplotlib.font_manager as fm
-import matplotlib
-font_path = "C:/Windows/Fonts/malgun.ttf"
-font_prop = fm.FontProperties(fname=font_path)
-matplotlib.rcParams['font.family'] = font_prop.get_name()
-matplotlib.rcParams['axes.unicode_minus'] = False
+from coil_dataset import load_dataset
+from coil_schema import drop_unused_categories
+from group_stats import group_stats
+from headless import configure_headless, finish_figure
+from korean_font import setup_korean_font
 
-# 시각화 스타일 설정
+# 시각화 스타일 설정 (style.use 가 폰트 설정을 초기화하므로 폰트보다 먼저)
 plt.style.use('default')
 sns.set_palette("husl")
 
+# 한글 폰트 설정
+setup_korean_font()
+
 def load_and_analyze_data():
     """중경1공장 데이터 로드 및 기본 분석"""
     print("📊 중경1공장 데이터 로드 중...")
     
     # 필터링된 데이터 로드
     try:
-        jg1_data = pd.read_excel('./첫시도/중경1공장_데이터_필터링.xlsx')
+        jg1_data = load_dataset('./첫시도/중경1공장_데이터_필터링.xlsx')
         print(f"✅ 필터링된 데이터 로드 성공: {jg1_data.shape}")
     except FileNotFoundError:
         # 원본 데이터에서 중경1공장 데이터 추출
         print("필터링된 데이터가 없어 원본 데이터에서 추출합니다...")
-        data = pd.read_excel('./첫시도/joined_coil_jiwoong.xlsx')
-        jg1_data = data[data['wc_desc'] == '중경1공장 20" 조관'].copy()
+        data = load_dataset('./첫시도/joined_coil_jiwoong.xlsx')
+        jg1_data = drop_unused_categories(data[data['wc_desc'] == '중경1공장 20" 조관'].copy())
         print(f"✅ 원본에서 중경1공장 데이터 추출: {jg1_data.shape}")
     
     return jg1_data
@@ -67,7 +67,7 @@ def filter_x52_data(data):
     
     # X52 계열 데이터 필터링
     x52_mask = data[quality_col].str.contains('X52', case=False, na=False)
-    x52_data = data[x52_mask].copy()
+    x52_data = drop_unused_categories(data[x52_mask].copy())
     
     print(f"\n✅ X52 계열 데이터 필터링 완료:")
     print(f"   전체 데이터: {len(data):,}개")
@@ -133,6 +133,8 @@ def apply_seah_steel_specs(data, quality_col):
         spec_data['ys_ts_ratio'] = spec_data[ys_col] / spec_data[ts_col]
         spec_data = spec_data[spec_data['ys_ts_ratio'] <= x52_specs['max_ys_ts_ratio']]
     
+    spec_data = drop_unused_categories(spec_data)
+    
     print(f"\n✅ 세아제강 규격 적용 완료:")
     print(f"   필터링 전: {original_count:,}개")
     print(f"   규격 내: {len(spec_data):,}개 ({len(spec_data)/original_count*100:.1f}%)")
@@ -161,29 +163,29 @@ def create_scatterplot(data, quality_col, ys_col):
     plt.figure(figsize=(14, 8))
     
     # 품질별로 다른 색상과 마커 사용
-    qualities = data[quality_col].unique()
+    qualities = list(data[quality_col].dropna().unique())
     colors = plt.cm.Set1(np.linspace(0, 1, len(qualities)))
     markers = ['o', 's', '^', 'D', 'v', '<', '>', 'p', '*', 'h']
     
-    for i, quality in enumerate(qualities):
-        quality_data = data[data[quality_col] == quality]
-        
+    # 품질별 값과 통계 한 번 계산 (산점도, 평균선, 통계 출력에서 함께 사용)
+    stats = group_stats(data, quality_col, ys_col, order=qualities)
+    
+    for i, (quality, quality_values) in enumerate(zip(stats.labels, stats.arrays())):
         # 산점도 그리기
         plt.scatter(
-            range(len(quality_data)), 
-            quality_data[ys_col],
+            range(len(quality_values)), 
+            quality_values,
             c=[colors[i]], 
             marker=markers[i % len(markers)],
             s=60, 
             alpha=0.7, 
-            label=f'{quality} (n={len(quality_data)})',
+            label=f'{quality} (n={len(quality_values)})',
             edgecolors='black',
             linewidth=0.5
         )
         
         # 품질별 평균선 추가
-        mean_ys = quality_data[ys_col].mean()
-        plt.axhline(y=mean_ys, color=colors[i], linestyle='--', alpha=0.8, linewidth=1.5)
+        plt.axhline(y=stats.mean[i], color=colors[i], linestyle='--', alpha=0.8, linewidth=1.5)
     
     # X52 최소 규격선 추가
     plt.axhline(y=359, color='red', linestyle='-', linewidth=2, alpha=0.8, label='X52 최소 규격 (359 MPa)')
@@ -213,15 +215,15 @@ def create_scatterplot(data, quality_col, ys_col):
     plt.savefig(filename, dpi=300, bbox_inches='tight')
     print(f"💾 그래프를 '{filename}'로 저장했습니다.")
     
-    plt.show()
+    finish_figure()
     
     # 통계 정보 출력
     print(f"\n📊 품질별 항복강도 통계:")
-    stats = data.groupby(quality_col)[ys_col].agg(['count', 'mean', 'std', 'min', 'max']).round(1)
-    print(stats)
+    print(stats.table(['count', 'mean', 'std', 'min', 'max'], decimals=1))
 
 def main():
     """메인 실행 함수"""
+    configure_headless()
     print("🚀 중경1공장 X52 계열 세아제강 제품 분석 시작")
     print("=" * 80)
     
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인라인 문자열 xlsx export 전용 고속 리더
+
+공장 export 는 모든 문자열 셀을 인라인 문자열(<is><t>…</t></is>)로 담은
+단일 sheet1.xml 로 되어 있다. openpyxl 의 셀 객체 모델을 거치지 않고
+압축 해제된 시트 XML 을 <row> 묶음 단위로 순차 토큰화하여 컬럼별 값 목록을 모은 뒤,
+NumPy 배열로 한 번에 변환하고 coil_schema 타입을 적용한다.
+
+날짜는 Excel 에서 날짜 서식(styles.xml 의 기본 날짜 서식 번호 또는 날짜 형식 문자열)이 지정된
+숫자 셀이므로, 셀의 스타일 번호로 날짜 셀을 판별하여 일련번호를 날짜로 변환한다
+(coil_export.stream_to_excel 로 저장한 파일도 pd.read_excel 과 같이 날짜로 읽힌다).
+
+토큰화 패턴에 맞지 않는 셀(수식, 서식 있는 텍스트 등)이 있으면 같은 결과를 내는
+iterparse 경로로 다시 읽는다.
+
+사용법 (벤치마크):
+    uv run xlsx_fast_reader.py [xlsx 파일 ...]
+"""
+
+import codecs
+import re
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from html import unescape
+
+import numpy as np
+import pandas as pd
+
+from coil_schema import apply_schema, normalize_column_names
+
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_ROW_TAG = f'{_NS}row'
+_CELL_TAG = f'{_NS}c'
+_VALUE_TAG = f'{_NS}v'
+_INLINE_TAG = f'{_NS}is'
+_TEXT_TAG = f'{_NS}t'
+_SST_ITEM_TAG = f'{_NS}si'
+_NUM_FMT_TAG = f'{_NS}numFmt'
+_CELL_XFS_TAG = f'{_NS}cellXfs'
+_XF_TAG = f'{_NS}xf'
+_WORKBOOK_PR_TAG = f'{_NS}workbookPr'
+
+# Excel 기본 날짜/시간 서식 번호 (동아시아 로캘 서식 27~36, 50~58 포함)
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | set(range(45, 48)) | set(range(50, 59))
+
+# 서식 문자열에서 날짜 판별 전에 지울 부분: "..." 문자열, \x 이스케이프, [..] 색/조건/로캘
+_FORMAT_LITERALS = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+
+# 날짜 일련번호 기준일 (1900 체계는 윤년 버그 때문에 1899-12-30, 1904 체계는 1904-01-01)
+_EXCEL_EPOCH = '1899-12-30'
+_EXCEL_EPOCH_1904 = '1904-01-01'
+
+_CELL_REF = re.compile(r'([A-Z]+)')
+
+# pd.read_excel 이 기본으로 결측 처리하는 문자열
+_NA_STRINGS = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# export 셀 형식: <c r="A2" [s=".."] [t=".."]/> | <c ...><v>..</v></c> | <c ...><is><t>..</t></is></c>
+_CELL_PATTERN = re.compile(
+    r'<c r="([A-Z]+)(\d+)"(?: s="(\d+)")?(?: t="(\w+)")?(?: s="(\d+)")? ?'
+    r'(?:/>|>(?:<v>([^<]*)</v>|<v ?/>|<is><t(?: [^>]*)?>([^<]*)</t></is>|<is><t ?/></is>)?</c>)'
+)
+
+
+class _UnsupportedLayout(Exception):
+    """토큰화 패턴으로 처리할 수 없는 셀 형식"""
+
+
+def _column_index(cell_ref):
+    """셀 참조(예: 'AQ12')의 0부터 시작하는 컬럼 번호"""
+    letters = _CELL_REF.match(cell_ref).group(1)
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def _first_sheet_name(archive):
+    """workbook 의 첫 번째 워크시트 XML 경로"""
+    sheets = sorted(
+        name for name in archive.namelist()
+        if name.startswith('xl/worksheets/sheet') and name.endswith('.xml')
+    )
+    if not sheets:
+        raise ValueError("워크시트 XML 을 찾을 수 없습니다.")
+    return sheets[0]
+
+
+def _read_shared_strings(archive):
+    """공유 문자열 테이블 (인라인 문자열만 쓰는 export 는 빈 목록)"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag == _SST_ITEM_TAG:
+                strings.append(''.join(t.text or '' for t in elem.iter(_TEXT_TAG)))
+                elem.clear()
+    return strings
+
+
+def _is_date_format(format_code):
+    """사용자 정의 서식 문자열이 날짜/시간 서식인지 확인 (첫 번째 구역 기준)"""
+    section = _FORMAT_LITERALS.sub('', format_code.split(';')[0])
+    return re.search(r'[ymdhs]', section, re.IGNORECASE) is not None
+
+
+def _read_date_styles(archive):
+    """
+    스타일(cellXfs) 번호별 날짜 서식 여부 배열
+    styles.xml 이 없으면 빈 배열 (모든 셀을 숫자로 취급)
+    """
+    if 'xl/styles.xml' not in archive.namelist():
+        return np.zeros(0, dtype=bool)
+    root = ET.fromstring(archive.read('xl/styles.xml'))
+    custom = {
+        int(fmt.get('numFmtId')): _is_date_format(fmt.get('formatCode', ''))
+        for fmt in root.iter(_NUM_FMT_TAG)
+    }
+    cell_xfs = root.find(_CELL_XFS_TAG)
+    if cell_xfs is None:
+        return np.zeros(0, dtype=bool)
+    flags = []
+    for xf in cell_xfs.iter(_XF_TAG):
+        fmt_id = int(xf.get('numFmtId', 0))
+        flags.append(custom.get(fmt_id, fmt_id in _BUILTIN_DATE_FORMATS))
+    return np.array(flags, dtype=bool)
+
+
+def _read_epoch(archive):
+    """workbook 의 날짜 일련번호 기준일 (date1904 설정 반영)"""
+    if 'xl/workbook.xml' not in archive.namelist():
+        return _EXCEL_EPOCH
+    workbook_pr = ET.fromstring(archive.read('xl/workbook.xml')).find(_WORKBOOK_PR_TAG)
+    if workbook_pr is not None and workbook_pr.get('date1904', '0').lower() in ('1', 'true'):
+        return _EXCEL_EPOCH_1904
+    return _EXCEL_EPOCH
+
+
+def _style_is_date(styles, date_styles):
+    """스타일 번호 배열 → 날짜 서식 여부 배열 (범위 밖 번호는 숫자로 취급)"""
+    styles = np.asarray(styles, dtype=np.int64)
+    in_range = styles < len(date_styles)
+    is_date = np.zeros(len(styles), dtype=bool)
+    is_date[in_range] = date_styles[styles[in_range]]
+    return is_date
+
+
+def _cell_value(cell, shared_strings):
+    """(iterparse 경로) 셀 값과 숫자 셀 여부 (문자열, is_numeric)"""
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        inline = cell.find(_INLINE_TAG)
+        if inline is None:
+            return None, False
+        return ''.join(t.text or '' for t in inline.iter(_TEXT_TAG)), False
+
+    value = cell.find(_VALUE_TAG)
+    if value is None or value.text is None:
+        return None, False
+    if cell_type == 's':
+        return shared_strings[int(value.text)], False
+    if cell_type in ('n', 'b'):
+        return value.text, True
+    if cell_type == 'e':
+        return None, False
+    return value.text, False
+
+
+def _read_cells_iterparse(sheet, shared_strings, date_styles):
+    """iterparse 로 시트의 값 있는 셀 목록 (컬럼 번호, 행 번호, 값, 숫자 여부, 날짜 여부) 배열 반환"""
+    columns, rows, values, flags, styles = [], [], [], [], []
+    row_number = 0
+    for _, elem in ET.iterparse(sheet, events=('end',)):
+        if elem.tag != _ROW_TAG:
+            continue
+        row_number = int(elem.get('r', row_number + 1))
+        for cell in elem.iter(_CELL_TAG):
+            value, is_numeric = _cell_value(cell, shared_strings)
+            if value is not None:
+                columns.append(_column_index(cell.get('r')))
+                rows.append(row_number)
+                values.append(value)
+                flags.append(is_numeric)
+                styles.append(int(cell.get('s', 0)))
+        elem.clear()
+
+    flags = np.array(flags, dtype=bool)
+    return (
+        np.array(columns, dtype=np.int64),
+        np.array(rows, dtype=np.int64),
+        np.array(values, dtype=object),
+        flags,
+        flags & _style_is_date(styles, date_styles),
+    )
+
+
+def _iter_row_blocks(sheet, block_size=1 << 20):
+    """압축 해제된 시트 XML 을 완결된 <row> 묶음 단위 문자열로 순차 반환"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    while True:
+        chunk = sheet.read(block_size)
+        buffer += decoder.decode(chunk, final=not chunk)
+        cut = buffer.rfind('</row>')
+        if cut >= 0:
+            cut += len('</row>')
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+        if not chunk:
+            break
+
+
+def _tokenize_block(block, shared_strings, date_styles, row_offset):
+    """
+    <row> 묶음 하나의 셀을 정규식으로 토큰화하여 배열로 변환
+    행 번호는 등장 순서 코드(row_offset 부터)로 바꾼다. <row> 가 묶음 경계를 넘지 않으므로
+    묶음마다 코드를 이어 붙이면 시트 전체의 행 순서가 된다.
+    """
+    matches = _CELL_PATTERN.findall(block)
+    if len(matches) != block.count('<c '):
+        raise _UnsupportedLayout()
+    if not matches:
+        return None, row_offset
+
+    letters, rows, styles, types, styles_after, values, texts = (
+        np.array(field, dtype=object) for field in zip(*matches)
+    )
+    row_codes, row_labels = pd.factorize(rows)
+    type_codes, type_labels = pd.factorize(types)
+    type_labels = list(type_labels)
+
+    def has_type(*names):
+        codes = [type_labels.index(name) for name in names if name in type_labels]
+        return np.isin(type_codes, codes)
+
+    is_inline = has_type('inlineStr')
+    is_shared = has_type('s')
+    is_numeric = has_type('', 'n', 'b')
+    values[is_inline] = texts[is_inline]
+
+    if is_shared.any():
+        values[is_shared] = [shared_strings[int(v)] for v in values[is_shared]]
+    if '&' in block:
+        needs_unescape = ~is_numeric & ~is_shared
+        values[needs_unescape] = [unescape(v) if '&' in v else v for v in values[needs_unescape]]
+
+    letter_codes, letter_labels = pd.factorize(letters)
+    columns = np.array([_column_index(ref) for ref in letter_labels], dtype=np.int64)[letter_codes]
+
+    # s 속성은 t 앞뒤 어느 쪽에도 올 수 있음, 스타일 번호는 고유값에만 날짜 여부를 조회
+    style_codes, style_labels = pd.factorize(np.where(styles == '', styles_after, styles))
+    style_numbers = [int(label) if label else 0 for label in style_labels]
+    is_date = is_numeric & _style_is_date(style_numbers, date_styles)[style_codes]
+
+    present = ~has_type('e') & (values != '')
+    cells = (columns[present], row_codes[present] + row_offset, values[present], is_numeric[present], is_date[present])
+    return cells, row_offset + len(row_labels)
+
+
+def _read_cells_regex(sheet, shared_strings, date_styles):
+    """
+    셀 태그를 정규식으로 토큰화하여 값 있는 셀 목록 배열 반환 (iterparse 경로와 같은 형식)
+    셀마다 Element 객체나 Python 분기를 거치지 않고 <row> 묶음 단위로 배열 연산한다.
+    """
+    parts = []
+    row_offset = 0
+    for block in _iter_row_blocks(sheet):
+        cells, row_offset = _tokenize_block(block, shared_strings, date_styles, row_offset)
+        if cells is not None:
+            parts.append(cells)
+    if not parts:
+        return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=object), np.empty(0, dtype=bool), np.empty(0, dtype=bool))
+    return tuple(np.concatenate(field) for field in zip(*parts))
+
+
+def _to_array(n_rows, positions, values, is_numeric, is_date, epoch):
+    """컬럼 셀 목록 → 날짜 서식 컬럼은 datetime 배열, 숫자 컬럼은 float/int 배열, 그 외는 object 배열"""
+    if len(values) and is_numeric.all():
+        numbers = np.full(n_rows, np.nan)
+        numbers[positions] = values.astype(np.float64)
+        if is_date.all():
+            # 일련번호(일) → 날짜, 부동소수 오차는 밀리초 단위로 반올림
+            return pd.to_datetime(numbers, unit='D', origin=epoch).round('ms').to_numpy()
+        if len(values) == n_rows and np.array_equal(numbers, np.round(numbers)):
+            return numbers.astype(np.int64)
+        return numbers
+
+    array = np.full(n_rows, None, dtype=object)
+    array[positions] = values
+    return array
+
+
+def _assemble(cells, columns=None, epoch=_EXCEL_EPOCH):
+    """셀 목록 배열 → DataFrame (첫 행이 헤더, 값이 없는 행은 pd.read_excel 과 같이 건너뜀)"""
+    column, row, values, is_numeric, is_date = cells
+
+    # pd.read_excel 기본 결측 문자열('', 'NA', 'N/A' 등)은 빈 셀로 처리
+    present = ~pd.Series(values).isin(_NA_STRINGS).to_numpy() | is_numeric
+    column, row, values, is_numeric, is_date = (
+        column[present], row[present], values[present], is_numeric[present], is_date[present]
+    )
+    if len(row) == 0:
+        return pd.DataFrame(columns=columns)
+
+    is_header = row == row.min()
+    header_cells = dict(zip(column[is_header].tolist(), values[is_header].tolist()))
+    width = max(column.max(), max(header_cells)) + 1
+    header = [str(header_cells[i]).strip() if i in header_cells else f'Unnamed: {i}' for i in range(width)]
+
+    if columns is not None:
+        missing = [col for col in columns if col not in header]
+        if missing:
+            raise ValueError(f"존재하지 않는 컬럼: {missing}")
+
+    column, row, values, is_numeric, is_date = (
+        column[~is_header], row[~is_header], values[~is_header], is_numeric[~is_header], is_date[~is_header]
+    )
+    data_rows = np.unique(row)
+    positions = np.searchsorted(data_rows, row)
+    n_rows = len(data_rows)
+
+    # 컬럼 번호 순으로 한 번 정렬한 뒤 컬럼별 구간으로 나눔
+    order = np.argsort(column, kind='stable')
+    column, positions, values, is_numeric, is_date = (
+        column[order], positions[order], values[order], is_numeric[order], is_date[order]
+    )
+    bounds = np.searchsorted(column, np.arange(width + 1))
+
+    wanted = None if columns is None else set(columns)
+    arrays = {}
+    for i, name in enumerate(header):
+        if wanted is not None and name not in wanted:
+            continue
+        lo, hi = bounds[i], bounds[i + 1]
+        arrays[name] = _to_array(n_rows, positions[lo:hi], values[lo:hi], is_numeric[lo:hi], is_date[lo:hi], epoch)
+
+    data = pd.DataFrame(arrays, index=pd.RangeIndex(n_rows))
+    if columns is not None:
+        data = data[list(columns)]
+    return data
+
+
+def read_inline_xlsx(file_path, columns=None):
+    """
+    인라인 문자열 xlsx 를 DataFrame 으로 읽기 (pd.read_excel 대체)
+    Args:
+        file_path: xlsx 파일 경로
+        columns: 읽을 컬럼 목록 (None 이면 전체)
+    Returns:
+        coil_schema 가 적용된 DataFrame
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        shared_strings = _read_shared_strings(archive)
+        date_styles = _read_date_styles(archive)
+        epoch = _read_epoch(archive)
+        sheet_name = _first_sheet_name(archive)
+        try:
+            with archive.open(sheet_name) as sheet:
+                cells = _read_cells_regex(sheet, shared_strings, date_styles)
+        except _UnsupportedLayout:
+            with archive.open(sheet_name) as sheet:
+                cells = _read_cells_iterparse(sheet, shared_strings, date_styles)
+
+    return apply_schema(normalize_column_names(_assemble(cells, columns, epoch)))
+
+
+def benchmark(file_path, repeat=3):
+    """pd.read_excel 과 read_inline_xlsx 의 로드 시간 비교"""
+    print(f"\n⏱️ 벤치마크: {file_path}")
+
+    def best_time(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    pandas_time, expected = best_time(lambda: pd.read_excel(file_path))
+    fast_time, actual = best_time(lambda: read_inline_xlsx(file_path))
+
+    print(f"   pd.read_excel      : {pandas_time:.3f}초 {expected.shape}")
+    print(f"   read_inline_xlsx   : {fast_time:.3f}초 {actual.shape}")
+    print(f"   속도 향상          : {pandas_time / max(fast_time, 1e-9):.1f}배")
+
+    # 같은 스키마를 적용한 결과와 값 비교
+    from coil_dataset import normalize_object_columns
+    expected = apply_schema(normalize_object_columns(normalize_column_names(expected)))
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_categorical=False)
+        print("   ✅ pd.read_excel 결과와 일치")
+    except AssertionError as e:
+        print(f"   ⚠️ 결과 차이: {e}")
+    return pandas_time, fast_time
+
+
+def main():
+    """메인 실행 함수"""
+    files = sys.argv[1:] or ['중경1공장_데이터.xlsx', '중경1공장_데이터_필터링완료.xlsx']
+    for file_path in files:
+        try:
+            benchmark(file_path)
+        except Exception as e:
+            print(f"❌ {file_path} 벤치마크 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,104 +4,25 @@
 중경1공장 YS2_STRESS vs I_YS 관계 분석 차트
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import warnings
-import matplotlib.font_manager as fm
-import platform
-import os
-from scipy import stats
 
-warnings.filterwarnings('ignore')
+from artifact_cache import save_figure
+from coil_columns import required_columns
+from coil_dataset import load_dataset
+from group_regression import POOLED_LABEL, group_regression
+from headless import configure_headless, finish_figure
+from korean_font import setup_korean_font
+from render_tier import marker_edges
 
-def clear_matplotlib_cache():
-    """matplotlib 캐시 완전 초기화"""
-    try:
-        import matplotlib
-        matplotlib.rcdefaults()  # 기본 설정으로 리셋
-        
-        # 폰트 캐시 삭제
-        cache_dir = matplotlib.get_cachedir()
-        if os.path.exists(cache_dir):
-            import shutil
-            try:
-                shutil.rmtree(cache_dir)
-                print("🗑️ matplotlib 캐시 디렉토리 삭제 완료")
-            except:
-                pass
-        
-        # 폰트 매니저 재구축
-        try:
-            fm._rebuild()
-            print("🔄 matplotlib 폰트 매니저 재구축 완료")
-        except:
-            print("⚠️ 폰트 매니저 재구축 스킵")
-        
-    except Exception as e:
-        print(f"⚠️ 캐시 초기화 중 오류: {e}")
-
-def setup_korean_font_robust():
-    """강력한 한글 폰트 설정"""
-    
-    print("🔧 한글 폰트 설정 시작...")
-    
-    # 1. 캐시 초기화
-    clear_matplotlib_cache()
-    
-    # 2. 시스템별 폰트 경로 설정
-    if platform.system() == "Windows":
-        font_candidates = [
-            ("Malgun Gothic", "C:/Windows/Fonts/malgun.ttf"),
-            ("NanumGothic", "C:/Windows/Fonts/NanumGothic.otf"),
-            ("Gulim", "C:/Windows/Fonts/gulim.ttc"),
-            ("Batang", "C:/Windows/Fonts/batang.ttc"),
-            ("HCR Dotum", "C:/Windows/Fonts/HANDotum.ttf")
-        ]
-    else:
-        font_candidates = [
-            ("NanumGothic", "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"),
-            ("DejaVu Sans", None)
-        ]
-    
-    # 3. 폰트 설정 시도
-    font_success = False
-    
-    for font_name, font_path in font_candidates:
-        try:
-            if font_path and os.path.exists(font_path):
-                # 직접 파일 경로로 폰트 등록
-                font_prop = fm.FontProperties(fname=font_path)
-                plt.rcParams['font.family'] = font_prop.get_name()
-                print(f"✅ 폰트 파일로 설정 성공: {font_name} ({font_path})")
-                font_success = True
-                break
-            else:
-                # 시스템 폰트명으로 설정
-                plt.rcParams['font.family'] = font_name
-                print(f"✅ 시스템 폰트로 설정 성공: {font_name}")
-                font_success = True
-                break
-                
-        except Exception as e:
-            print(f"❌ {font_name} 설정 실패: {e}")
-            continue
-    
-    # 4. 기본 설정
-    plt.rcParams['axes.unicode_minus'] = False
-    plt.rcParams['font.size'] = 10
-    
-    if not font_success:
-        print("⚠️ 모든 한글 폰트 설정 실패. 기본 폰트 사용")
-    
-    return font_success
+warnings.filterwarnings('ignore')
 
 def load_data():
     """데이터 로드"""
     print("\n📂 데이터 로드 중...")
     try:
-        data = pd.read_excel('중경1공장_데이터_필터링완료.xlsx')
+        data = load_dataset('중경1공장_데이터_필터링완료.xlsx', columns=required_columns('ys2_stress_vs_i_ys_plot'))
         print(f"✅ 데이터 로드 성공: {data.shape}")
         return data
     except Exception as e:
@@ -124,30 +45,27 @@ def analyze_ys2_vs_iys_correlation(data):
     # 유효한 데이터만 선택
     valid_data = data[[ys2_col, iys_col]].dropna()
     
-    # 상관계수 계산
-    correlation = valid_data[ys2_col].corr(valid_data[iys_col])
-    
-    # 선형 회귀 분석
-    slope, intercept, r_value, p_value, std_err = stats.linregress(
-        valid_data[iys_col], valid_data[ys2_col]
-    )
+    # 전체 데이터 선형 회귀 분석 (group_regression, 그룹 하나)
+    fit = group_regression(valid_data, iys_col, ys2_col)
+    i = fit.index(POOLED_LABEL)
     
-    print(f"   📈 상관계수 (Pearson): {correlation:.4f}")
-    print(f"   📈 결정계수 (R²): {r_value**2:.4f}")
-    print(f"   📈 회귀식: YS2_STRESS = {slope:.3f} × I_YS + {intercept:.3f}")
-    print(f"   📈 p-value: {p_value:.6f}")
-    print(f"   📈 표준오차: {std_err:.4f}")
+    print(f"   📈 상관계수 (Pearson): {fit.r[i]:.4f}")
+    print(f"   📈 결정계수 (R²): {fit.r_squared[i]:.4f}")
+    print(f"   📈 회귀식: YS2_STRESS = {fit.slope[i]:.3f} × I_YS + {fit.intercept[i]:.3f}")
+    print(f"   📈 p-value: {fit.p_value[i]:.6f}")
+    print(f"   📈 표준오차: {fit.slope_stderr[i]:.4f}")
     
     return {
-        'correlation': correlation,
-        'r_squared': r_value**2,
-        'slope': slope,
-        'intercept': intercept,
-        'p_value': p_value,
+        'correlation': fit.r[i],
+        'r_squared': fit.r_squared[i],
+        'slope': fit.slope[i],
+        'intercept': fit.intercept[i],
+        'p_value': fit.p_value[i],
+        'fit': fit,
         'valid_data': valid_data
     }
 
-def create_ys2_vs_iys_plot(data):
+def create_ys2_vs_iys_plot(data, top_qualities=None):
     """YS2_STRESS vs I_YS 관계 차트 생성"""
     
     if data is None or len(data) == 0:
@@ -166,8 +84,9 @@ def create_ys2_vs_iys_plot(data):
     if correlation_info is None:
         return None
     
-    # 상위 5개 품질 선정
-    top_qualities = data[quality_col].value_counts().head(5)
+    # 상위 5개 품질 선정 (일괄 렌더링 시에는 미리 계산한 값 사용)
+    if top_qualities is None:
+        top_qualities = data[quality_col].value_counts().head(5)
     filtered_data = data[data[quality_col].isin(top_qualities.index)].copy()
     
     # 그래프 생성
@@ -177,9 +96,10 @@ def create_ys2_vs_iys_plot(data):
     colors = plt.cm.Set1(np.linspace(0, 1, len(top_qualities)))
     markers = ['o', 's', '^', 'D', 'v']
     
-    # 각 품질별 산점도
+    # 각 품질별 산점도 (groupby 로 한 번에 나눔)
+    quality_groups = dict(list(filtered_data.groupby(quality_col, observed=True)))
     for i, (quality, count) in enumerate(top_qualities.items()):
-        quality_data = filtered_data[filtered_data[quality_col] == quality]
+        quality_data = quality_groups.get(quality, filtered_data.iloc[:0])
         
         plt.scatter(
             quality_data[iys_col],
@@ -189,8 +109,7 @@ def create_ys2_vs_iys_plot(data):
             s=60,
             alpha=0.7,
             label=f'{quality} (n={count})',
-            edgecolors='black',
-            linewidth=0.5
+            **marker_edges(linewidth=0.5, edgecolor='black')
         )
     
     # 전체 데이터에 대한 회귀선 추가
@@ -201,14 +120,11 @@ def create_ys2_vs_iys_plot(data):
     plt.plot(x_range, y_pred, 'r-', linewidth=2, alpha=0.8, 
              label=f'회귀선 (R² = {correlation_info["r_squared"]:.3f})')
     
-    # 신뢰구간 추가 (선택사항)
-    # 95% 신뢰구간 계산
-    residuals = valid_data[ys2_col] - (correlation_info['slope'] * valid_data[iys_col] + correlation_info['intercept'])
-    mse = np.mean(residuals**2)
-    std_error = np.sqrt(mse)
+    # 95% 예측구간 (새 코일 한 개의 YS2_STRESS 가 들어갈 범위, x 가 평균에서 멀수록 넓어짐)
+    lower, upper = correlation_info['fit'].prediction_interval(x_range, POOLED_LABEL)
     
-    plt.fill_between(x_range, y_pred - 1.96*std_error, y_pred + 1.96*std_error, 
-                     alpha=0.2, color='red', label='95% 신뢰구간')
+    plt.fill_between(x_range, lower, upper, 
+                     alpha=0.2, color='red', label='95% 예측구간')
     
     # 제목 및 레이블
     plt.title(
@@ -263,28 +179,28 @@ def create_ys2_vs_iys_plot(data):
     
     # 저장
     filename = '중경1공장_YS2_STRESS_vs_I_YS_관계분석.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
+    filename = save_figure(filename, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"💾 그래프 저장 완료: {filename}")
     
-    plt.show()
+    finish_figure()
     
-    # 품질별 상관관계 분석
+    # 품질별 상관관계 분석 (모든 품질의 회귀를 한 번에 계산)
     print(f"\n📊 품질별 YS2_STRESS vs I_YS 상관관계:")
-    for quality in top_qualities.index:
-        quality_data = filtered_data[filtered_data[quality_col] == quality]
-        if len(quality_data) >= 3:  # 최소 3개 이상의 데이터가 있을 때만
-            corr = quality_data[ys2_col].corr(quality_data[iys_col])
-            print(f"   {quality}: 상관계수 = {corr:.4f} (n={len(quality_data)})")
+    quality_fit = group_regression(filtered_data, iys_col, ys2_col, by=quality_col, order=top_qualities.index)
+    for quality, row in quality_fit.table(min_n=3).iterrows():  # 최소 3개 이상의 데이터가 있을 때만
+        print(f"   {quality}: 상관계수 = {row['r']:.4f}, 기울기 = {row['slope']:.3f}, "
+              f"p-value = {row['p_value']:.4f} (n={int(row['n'])})")
     
     return filename
 
 def main():
     """메인 실행 함수"""
+    configure_headless()
     print("🚀 중경1공장 YS2_STRESS vs I_YS 관계 분석")
     print("=" * 80)
     
     # 1. 한글 폰트 설정
-    font_success = setup_korean_font_robust()
+    setup_korean_font(font_size=10)
     
     # 2. 데이터 로드
     data = load_data()
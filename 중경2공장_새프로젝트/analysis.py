@@ -11,11 +11,18 @@ import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
+import sys
 import warnings
 
+# 프로젝트 루트의 공용 로더 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from coil_dataset import load_dataset
+from correlation import cached_correlation, top_pairs
+from headless import configure_headless, finish_figure
+from korean_font import setup_korean_font
+
 # 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+setup_korean_font()
 warnings.filterwarnings('ignore')
 
 class JungKyung2FactoryAnalyzer:
@@ -40,7 +47,7 @@ class JungKyung2FactoryAnalyzer:
         """
         try:
             if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
-                self.data = pd.read_excel(file_path)
+                self.data = load_dataset(file_path)
             elif file_path.endswith('.csv'):
                 self.data = pd.read_csv(file_path, encoding='utf-8')
             else:
@@ -102,7 +109,7 @@ class JungKyung2FactoryAnalyzer:
         if target_cols:
             numeric_cols = [col for col in target_cols if col in numeric_cols]
             
-        quality_stats = self.data.groupby(quality_col)[numeric_cols].agg(['mean', 'std', 'min', 'max'])
+        quality_stats = self.data.groupby(quality_col, observed=True)[numeric_cols].agg(['mean', 'std', 'min', 'max'])
         print("\n품질별 통계:")
         print(quality_stats)
         
@@ -144,40 +151,61 @@ class JungKyung2FactoryAnalyzer:
             filename = f"{plot_type}_{x_col}_{y_col}_{hue_col}.png"
         filepath = self.output_dir / filename
         plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.show()
+        finish_figure()
         
         print(f"그래프 저장됨: {filepath}")
         
-    def correlation_analysis(self, target_cols=None):
-        """상관관계 분석"""
+    def correlation_analysis(self, target_cols=None, method='pearson', by=None, top_k=20, plot_all=False):
+        """
+        상관관계 분석 (결측값은 쌍별로 제외, 같은 데이터면 캐시된 결과 사용)
+        Args:
+            target_cols: 분석할 대상 컬럼들 (None 이면 숫자형 컬럼 전체)
+            method: 'pearson' 또는 'spearman'
+            by: 그룹 컬럼 (예: 공장, 품질 / None 이면 전체)
+            top_k: 출력할 |r| 상위 쌍 개수 (히트맵도 이 쌍에 나오는 컬럼만 표시)
+            plot_all: True 면 전체 컬럼 히트맵
+        Returns:
+            상관계수 행렬 (by 를 지정하면 {그룹: 상관계수 행렬})
+        """
         if self.data is None:
             print("데이터가 로드되지 않았습니다.")
             return
             
-        numeric_data = self.data.select_dtypes(include=[np.number])
-        if target_cols:
-            numeric_data = numeric_data[target_cols]
-            
-        # 상관계수 계산
-        corr_matrix = numeric_data.corr()
-        
-        # 히트맵 생성
-        plt.figure(figsize=(12, 10))
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
-                   square=True, fmt='.3f', cbar_kws={'shrink': 0.8})
-        plt.title('상관관계 히트맵', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        # 상관계수 계산 (행렬 연산 한 번, 결과는 데이터 해시로 캐시)
+        matrices = cached_correlation(self.data, columns=target_cols, method=method, by=by)
         
-        # 저장
-        filepath = self.output_dir / "correlation_heatmap.png"
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        print(f"상관관계 히트맵 저장됨: {filepath}")
-        return corr_matrix
+        results = {}
+        for group, (corr_matrix, pair_counts) in matrices.items():
+            pairs = top_pairs(corr_matrix, pair_counts, k=top_k)
+            print(f"\n[{group}] 상관계수 상위 {len(pairs)}개 쌍 ({method}):")
+            print(pairs.to_string(float_format='{:.3f}'.format))
+            
+            # 히트맵 생성 (상위 쌍에 나오는 컬럼만)
+            columns = list(corr_matrix.columns) if plot_all else list(dict.fromkeys(pairs[['a', 'b']].to_numpy().ravel()))
+            if len(columns) >= 2:
+                plt.figure(figsize=(12, 10))
+                sns.heatmap(corr_matrix.loc[columns, columns], annot=len(columns) <= 25, cmap='coolwarm', center=0,
+                           square=True, fmt='.3f', cbar_kws={'shrink': 0.8})
+                title = '상관관계 히트맵' if by is None else f'상관관계 히트맵 ({group})'
+                plt.title(title, fontsize=16, fontweight='bold')
+                plt.tight_layout()
+                
+                # 저장
+                filename = "correlation_heatmap.png" if by is None else f"correlation_heatmap_{group}.png"
+                filepath = self.output_dir / filename
+                plt.savefig(filepath, dpi=300, bbox_inches='tight')
+                finish_figure()
+                
+                print(f"상관관계 히트맵 저장됨: {filepath}")
+            results[group] = corr_matrix
+            
+        if by is None:
+            return next(iter(results.values()), None)
+        return results
 
 def main():
     """메인 실행 함수"""
+    configure_headless()
     print("중경2공장 새 프로젝트 분석 시작")
     print("=" * 60)
     